@@ -0,0 +1,29 @@
+# Generated by Django 3.0.5 on 2020-04-21 09:14
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0039_auto_20200221_0257"),
+        # The trigram index requires the pg_trgm extension
+        ("product", "0037_auto_20171124_0847"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="search_document",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"],
+                name="user_search_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
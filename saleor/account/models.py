@@ -8,7 +8,8 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.contrib.postgres.fields import JSONField
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models, transaction
 from django.db.models import Q, Value
 from django.forms.models import model_to_dict
 from django.utils import timezone
@@ -20,7 +21,9 @@ from versatileimagefield.fields import VersatileImageField
 from ..core.models import ModelWithMetadata
 from ..core.permissions import AccountPermissions, BasePermissionEnum
 from ..core.utils.json_serializer import CustomJsonEncoder
+from ..webhook.cache import invalidate_webhooks_cache
 from . import CustomerEvents
+from .search import USER_SEARCH_DOCUMENT_FIELDS, prepare_user_search_document_value
 from .validators import validate_possible_number
 
 
@@ -150,6 +153,7 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
         Address, related_name="+", null=True, blank=True, on_delete=models.SET_NULL
     )
     avatar = VersatileImageField(upload_to="user-avatars", blank=True, null=True)
+    search_document = models.TextField(blank=True, default="")
 
     USERNAME_FIELD = "email"
 
@@ -160,6 +164,36 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
             (AccountPermissions.MANAGE_USERS.codename, "Manage customers."),
             (AccountPermissions.MANAGE_STAFF.codename, "Manage staff."),
         )
+        indexes = [
+            GinIndex(
+                fields=["search_document"],
+                name="user_search_gin",
+                opclasses=["gin_trgm_ops"],
+            )
+        ]
+
+    def save(
+        self, force_insert=False, force_update=False, using=None, update_fields=None
+    ):
+        from ..order.tasks import update_user_orders_search_document_task
+
+        # Keep the search document in sync with the fields it is built from
+        update_orders = False
+        if update_fields is None or USER_SEARCH_DOCUMENT_FIELDS.intersection(
+            update_fields
+        ):
+            search_document = prepare_user_search_document_value(self)
+            # Orders copy the user's data into their own search documents
+            update_orders = bool(self.pk) and search_document != self.search_document
+            self.search_document = search_document
+            if update_fields is not None:
+                update_fields = set(update_fields) | {"search_document"}
+        result = super().save(force_insert, force_update, using, update_fields)
+        if update_orders:
+            transaction.on_commit(
+                lambda: update_user_orders_search_document_task.delay(self.pk)
+            )
+        return result
 
     def get_full_name(self):
         if self.first_name or self.last_name:
@@ -210,6 +244,15 @@ class ServiceAccount(ModelWithMetadata):
             setattr(self, perm_cache_name, {f"{ct}.{name}" for ct, name in perms})
         return getattr(self, perm_cache_name)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_webhooks_cache()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_webhooks_cache()
+        return result
+
     def has_perms(self, perm_list):
         """Return True if the service has each of the specified permissions."""
         if not self.is_active:
@@ -0,0 +1,52 @@
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from .models import Address, User
+
+# Fields of the user that are a part of its search document; saving any of them
+# refreshes the document
+USER_SEARCH_DOCUMENT_FIELDS = {
+    "email",
+    "first_name",
+    "last_name",
+    "default_shipping_address",
+}
+
+
+def join_search_document_values(values: Iterable[Optional[str]]) -> str:
+    return " ".join(value for value in values if value).lower()
+
+
+def prepare_address_search_document_value(address: Optional["Address"]) -> str:
+    """Return the searchable representation of an address."""
+    if address is None:
+        return ""
+    country = address.country
+    return join_search_document_values(
+        [
+            address.first_name,
+            address.last_name,
+            address.company_name,
+            address.city,
+            address.postal_code,
+            country.code,
+            country.name,
+        ]
+    )
+
+
+def prepare_user_search_document_value(user: "User") -> str:
+    """Return the search document of the user.
+
+    The document holds the lowercase email and names of the user along with
+    the data of the default shipping address.
+    """
+    values: List[str] = [user.email, user.first_name, user.last_name]
+    values.append(prepare_address_search_document_value(user.default_shipping_address))
+    return join_search_document_values(values)
+
+
+def update_user_search_document(user: "User"):
+    user.search_document = prepare_user_search_document_value(user)
+    user.save(update_fields=["search_document"])
@@ -43,6 +43,21 @@ def base_checkout_total(
     return max(total, zero_taxed_money(currency))
 
 
+def base_checkout_lines_totals(
+    lines: List["CheckoutLine"], discounts: Optional[Iterable[DiscountInfo]] = None
+) -> List[TaxedMoney]:
+    """Return the total prices of the lines, with their variants priced at once."""
+    from ..discount.utils import calculate_variants_prices
+
+    prices = calculate_variants_prices([line.variant for line in lines], discounts)
+    totals = []
+    for line in lines:
+        amount = line.quantity * prices[line.variant_id]
+        price = quantize_price(amount, amount.currency)
+        totals.append(TaxedMoney(net=price, gross=price))
+    return totals
+
+
 def base_checkout_line_total(
     line: "CheckoutLine", discounts: Optional[Iterable[DiscountInfo]] = None
 ) -> TaxedMoney:
@@ -1,13 +1,87 @@
-from typing import TYPE_CHECKING, Iterable, Optional
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
 from ..discount import DiscountInfo
 from ..extensions.manager import get_extensions_manager
 
 if TYPE_CHECKING:
     from prices import TaxedMoney
+    from ..account.models import Address
     from .models import Checkout, CheckoutLine
 
 
+@dataclass
+class CheckoutPrices:
+    """Prices of a checkout calculated for a given state of the checkout.
+
+    Kept on the checkout instance, so the line totals, subtotal, shipping price and
+    total are calculated once as long as the checkout doesn't change.
+    """
+
+    key: Tuple
+    discounts: Optional[Iterable[DiscountInfo]]
+    lines: List["CheckoutLine"]
+    lines_totals: Optional[Dict[Tuple, "TaxedMoney"]] = None
+    subtotal: Optional["TaxedMoney"] = None
+    shipping_price: Optional["TaxedMoney"] = None
+    total: Optional["TaxedMoney"] = None
+
+
+def _get_line_key(line: "CheckoutLine") -> Tuple:
+    return (line.pk, line.variant_id, line.quantity)
+
+
+def _get_address_key(address: Optional["Address"]) -> Optional[Tuple]:
+    if address is None:
+        return None
+    return tuple(sorted(address.as_data().items()))
+
+
+def _get_checkout_prices_key(checkout: "Checkout", lines: List["CheckoutLine"]):
+    """Return values of everything the checkout prices depend on."""
+    return (
+        tuple(_get_line_key(line) for line in lines),
+        checkout.currency,
+        checkout.country.code,
+        checkout.discount_amount,
+        checkout.voucher_code,
+        checkout.shipping_method_id,
+        _get_address_key(checkout.shipping_address),
+        _get_address_key(checkout.billing_address),
+    )
+
+
+def _get_checkout_prices(
+    checkout: "Checkout", discounts: Optional[Iterable[DiscountInfo]]
+) -> CheckoutPrices:
+    lines = list(checkout)
+    key = _get_checkout_prices_key(checkout, lines)
+    prices: Optional[CheckoutPrices] = getattr(checkout, "_prices", None)
+    if prices is not None and prices.key == key:
+        same_discounts = prices.discounts is discounts or (
+            not prices.discounts and not discounts
+        )
+        if same_discounts:
+            return prices
+
+    prices = CheckoutPrices(key=key, discounts=discounts, lines=lines)
+    checkout._prices = prices  # type: ignore
+    return prices
+
+
+def _get_lines_totals(
+    checkout: "Checkout", prices: CheckoutPrices
+) -> Dict[Tuple, "TaxedMoney"]:
+    if prices.lines_totals is None:
+        lines_totals = get_extensions_manager().calculate_checkout_lines_totals(
+            checkout, prices.lines, prices.discounts or []
+        )
+        prices.lines_totals = dict(
+            zip([_get_line_key(line) for line in prices.lines], lines_totals)
+        )
+    return prices.lines_totals
+
+
 def checkout_shipping_price(
     checkout: "Checkout", discounts: Optional[Iterable[DiscountInfo]] = None
 ) -> "TaxedMoney":
@@ -15,9 +89,12 @@ def checkout_shipping_price(
 
     It takes in account all extensions.
     """
-    return get_extensions_manager().calculate_checkout_shipping(
-        checkout, discounts or []
-    )
+    prices = _get_checkout_prices(checkout, discounts)
+    if prices.shipping_price is None:
+        prices.shipping_price = get_extensions_manager().calculate_checkout_shipping(
+            checkout, discounts or []
+        )
+    return prices.shipping_price
 
 
 def checkout_subtotal(
@@ -27,9 +104,13 @@ def checkout_subtotal(
 
     It takes in account all extensions.
     """
-    return get_extensions_manager().calculate_checkout_subtotal(
-        checkout, discounts or []
-    )
+    prices = _get_checkout_prices(checkout, discounts)
+    if prices.subtotal is None:
+        lines_totals = list(_get_lines_totals(checkout, prices).values())
+        prices.subtotal = get_extensions_manager().calculate_checkout_subtotal(
+            checkout, discounts or [], lines_totals=lines_totals
+        )
+    return prices.subtotal
 
 
 def checkout_total(
@@ -42,7 +123,15 @@ def checkout_total(
 
     It takes in account all extensions.
     """
-    return get_extensions_manager().calculate_checkout_total(checkout, discounts or [])
+    prices = _get_checkout_prices(checkout, discounts)
+    if prices.total is None:
+        prices.total = get_extensions_manager().calculate_checkout_total(
+            checkout,
+            discounts or [],
+            subtotal=checkout_subtotal(checkout, discounts),
+            shipping_price=checkout_shipping_price(checkout, discounts),
+        )
+    return prices.total
 
 
 def checkout_line_total(
@@ -50,6 +139,13 @@ def checkout_line_total(
 ) -> "TaxedMoney":
     """Return the total price of provided line, taxes included.
 
-    It takes in account all extensions.
+    Totals of all the lines of the checkout are calculated at once. It takes in
+    account all extensions.
     """
-    return get_extensions_manager().calculate_checkout_line_total(line, discounts or [])
+    prices = _get_checkout_prices(line.checkout, discounts)
+    total = _get_lines_totals(line.checkout, prices).get(_get_line_key(line))
+    if total is None:
+        total = get_extensions_manager().calculate_checkout_line_total(
+            line, discounts or []
+        )
+    return total
@@ -41,7 +41,7 @@ from ..order.emails import send_order_confirmation, send_staff_order_confirmatio
 from ..order.models import Order, OrderLine
 from ..shipping.models import ShippingMethod
 from ..warehouse.availability import check_stock_quantity
-from ..warehouse.management import allocate_stock
+from ..warehouse.management import allocate_stocks
 from . import AddressType
 from .models import Checkout, CheckoutLine
 
@@ -735,13 +735,19 @@ def create_order(
     order_lines = order_data.pop("lines")
 
     order = Order.objects.create(**order_data, checkout_token=checkout.token)
-    order.lines.set(order_lines, bulk=False)
+    for line in order_lines:  # type: OrderLine
+        line.order = order
+    OrderLine.objects.bulk_create(order_lines)
 
     # allocate stocks from the lines
-    for line in order_lines:  # type: OrderLine
-        variant = line.variant
-        if variant and variant.track_inventory:
-            allocate_stock(variant, checkout.get_country(), line.quantity)
+    allocate_stocks(
+        [
+            (line.variant, line.quantity)
+            for line in order_lines
+            if line.variant and line.variant.track_inventory
+        ],
+        checkout.get_country(),
+    )
 
     # Add gift cards to the order
     for gift_card in checkout.gift_cards.select_for_update():
@@ -1,29 +1,129 @@
 import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from django.core.management.base import BaseCommand
-from versatileimagefield.image_warmer import VersatileImageFieldWarmer
+from django.db import connections
+from django.db.models import Q
 
-from ....product.models import ProductImage
+from ....product.models import Category, Collection, ProductImage
+from ...thumbnails import (
+    ThumbnailWarmingResult,
+    add_thumbnail_urls_to_manifest,
+    warm_thumbnails,
+)
 
 logger = logging.getLogger(__name__)
 
+# Models with images, the fields storing them and their rendition key sets
+IMAGE_SETS = [
+    ("Products", ProductImage, "image", "products"),
+    ("Categories", Category, "background_image", "background_images"),
+    ("Collections", Collection, "background_image", "background_images"),
+]
+
 
 class Command(BaseCommand):
     help = "Generate thumbnails for all images"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            default=False,
+            help="Only create thumbnails that don't exist yet.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of worker processes. Defaults to the number of CPUs.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Number of images processed by a worker at once.",
+        )
+
     def handle(self, *args, **options):
-        self.warm_products()
-
-    def warm_products(self):
-        self.stdout.write("Products thumbnails generation:")
-        warmer = VersatileImageFieldWarmer(
-            instance_or_queryset=ProductImage.objects.all(),
-            rendition_key_set="products",
-            image_attr="image",
-            verbose=True,
+        workers = options["workers"] or os.cpu_count() or 1
+        for name, model, image_attr, rendition_key_set in IMAGE_SETS:
+            self.warm_images(
+                name,
+                model,
+                image_attr,
+                rendition_key_set,
+                incremental=options["incremental"],
+                workers=workers,
+                batch_size=options["batch_size"],
+            )
+
+    def warm_images(
+        self,
+        name,
+        model,
+        image_attr,
+        rendition_key_set,
+        incremental,
+        workers,
+        batch_size,
+    ):
+        self.stdout.write(f"{name} thumbnails generation:")
+        pks = list(
+            model.objects.exclude(
+                Q(**{f"{image_attr}__isnull": True}) | Q(**{image_attr: ""})
+            )
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        batches = [pks[i : i + batch_size] for i in range(0, len(pks), batch_size)]
+        total = ThumbnailWarmingResult()
+        started = time.monotonic()
+        results = self.warm_batches(
+            model, batches, image_attr, rendition_key_set, incremental, workers
         )
-        num_created, failed_to_create = warmer.warm()
-        self.log_failed_images(failed_to_create)
+        for result in results:
+            add_thumbnail_urls_to_manifest(result.urls)
+            total.images += result.images
+            total.created += result.created
+            total.failed.extend(result.failed)
+            elapsed = time.monotonic() - started
+            images_per_second = total.images / elapsed if elapsed else 0.0
+            self.stdout.write(
+                f"  {total.images}/{len(pks)} images, "
+                f"{total.created} thumbnails created, "
+                f"{images_per_second:.1f} images/s"
+            )
+        self.log_failed_images(total.failed)
+
+    def warm_batches(
+        self, model, batches, image_attr, rendition_key_set, incremental, workers
+    ):
+        if workers == 1:
+            for batch in batches:
+                yield warm_thumbnails(
+                    model, batch, image_attr, rendition_key_set, incremental
+                )
+            return
+
+        # Forked workers can't share the database connections of the parent process
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    warm_thumbnails,
+                    model,
+                    batch,
+                    image_attr,
+                    rendition_key_set,
+                    incremental,
+                )
+                for batch in batches
+            ]
+            for future in as_completed(futures):
+                yield future.result()
 
     def log_failed_images(self, failed_to_create):
         if failed_to_create:
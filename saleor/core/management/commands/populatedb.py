@@ -6,6 +6,8 @@ from django.core.management.base import BaseCommand
 from django.db import connection
 
 from ....account.utils import create_superuser
+from ....product.models import Product
+from ....product.search import update_products_search_vector_by_ids
 from ...utils.random_data import (
     add_address_to_admin,
     create_gift_card,
@@ -93,6 +95,10 @@ class Command(BaseCommand):
         self.stdout.write("Created warehouses")
         create_products_by_schema(self.placeholders_dir, create_images)
         self.stdout.write("Created products")
+        update_products_search_vector_by_ids(
+            Product.objects.values_list("pk", flat=True)
+        )
+        self.stdout.write("Updated products search vectors")
         for msg in create_product_sales(5):
             self.stdout.write(msg)
         for msg in create_vouchers():
@@ -7,13 +7,14 @@ from django.contrib.sites.models import Site
 from django.core.exceptions import MiddlewareNotUsed
 from django.http import JsonResponse
 from django.template.response import TemplateResponse
-from django.utils import timezone
 from django.utils.functional import SimpleLazyObject
 from django.utils.translation import get_language
 from django_countries.fields import Country
+from graphql.error import GraphQLError
 
-from ..discount.utils import fetch_discounts
+from ..discount.utils import fetch_cached_active_discounts
 from ..extensions.manager import get_extensions_manager
+from ..graphql.query_cache import resolve_persisted_query
 from ..graphql.views import API_PATH, GraphQLView
 from . import analytics
 from .exceptions import ReadOnlyException
@@ -48,7 +49,7 @@ def discounts(get_response):
     """Assign active discounts to `request.discounts`."""
 
     def _discounts_middleware(request):
-        request.discounts = SimpleLazyObject(lambda: fetch_discounts(timezone.now()))
+        request.discounts = SimpleLazyObject(fetch_cached_active_discounts)
         return get_response(request)
 
     return _discounts_middleware
@@ -193,6 +194,10 @@ class ReadOnlyMiddleware:
             body = [body]
         for data in body:
             query, _, _ = GraphQLView.get_graphql_params(request, data)
+            try:
+                query = resolve_persisted_query(data, query, save=False)
+            except GraphQLError:
+                return False
             document, _ = GraphQLView().parse_query(query)
             if not document:
                 return False
@@ -0,0 +1,84 @@
+"""Tags invalidating the cached responses of the storefront API.
+
+Every cached response is tagged with the kinds of objects it contains. Each tag
+has a version stamp stored in the Django cache and included in the cache keys of
+the responses, so bumping the stamp with `invalidate_response_cache` makes all
+responses containing such objects stale at once.
+"""
+from typing import Dict, Iterable, Optional, Type
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+
+RESPONSE_CACHE_TAG_VERSION_KEY = "response_cache.tag.{}"
+
+
+class ResponseCacheTag:
+    PRODUCT = "product"
+    PRODUCT_TYPE = "product_type"
+    ATTRIBUTE = "attribute"
+    CATEGORY = "category"
+    COLLECTION = "collection"
+    MENU = "menu"
+    PAGE = "page"
+    SALE = "sale"
+    SHOP = "shop"
+
+
+def is_response_cache_enabled() -> bool:
+    return settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT > 0
+
+
+def get_tag_versions(tags: Iterable[str]) -> Dict[str, str]:
+    keys = {RESPONSE_CACHE_TAG_VERSION_KEY.format(tag): tag for tag in tags}
+    versions = cache.get_many(keys.keys())
+    for key in keys.keys() - versions.keys():
+        cache.add(key, uuid4().hex, timeout=None)
+        versions[key] = cache.get(key)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def _bump_tag_versions(tags: Iterable[str]):
+    cache.set_many(
+        {RESPONSE_CACHE_TAG_VERSION_KEY.format(tag): uuid4().hex for tag in tags},
+        timeout=None,
+    )
+
+
+def invalidate_response_cache(*tags: str):
+    """Make the cached responses containing objects of the given kinds stale.
+
+    Versions are bumped once the transaction is committed, otherwise a concurrent
+    request could cache a response built from the data before the change.
+    """
+    if not is_response_cache_enabled():
+        return
+    transaction.on_commit(lambda: _bump_tag_versions(tags))
+
+
+def invalidate_response_cache_for_model(model: Type[Model]):
+    tag: Optional[str] = getattr(model, "response_cache_tag", None)
+    if tag:
+        invalidate_response_cache(tag)
+
+
+class ResponseCacheInvalidationMixin:
+    """Invalidate the cached responses when an object is saved or deleted.
+
+    Models have to define `response_cache_tag`. Changes made through querysets
+    have to be followed by a call to `invalidate_response_cache_for_model`.
+    """
+
+    response_cache_tag: str
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)  # type: ignore
+        invalidate_response_cache(self.response_cache_tag)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)  # type: ignore
+        invalidate_response_cache(self.response_cache_tag)
+        return result
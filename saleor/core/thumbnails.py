@@ -0,0 +1,140 @@
+"""Manifest of the thumbnail URLs.
+
+Resolving a thumbnail URL with VersatileImageField may check if the thumbnail
+exists in the storage, which for remote storages like S3 or GCS means a request
+to the bucket for every image. URLs of the thumbnails are recorded in the
+manifest kept in the cache, filled by the thumbnail warmer and by the first
+lookups, so later lookups are a single cache hit.
+"""
+import hashlib
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple, Type
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+from versatileimagefield.image_warmer import VersatileImageFieldWarmer
+from versatileimagefield.utils import get_rendition_key_set
+
+THUMBNAIL_MANIFEST_KEY = "thumbnail_manifest:{}"
+
+
+def get_thumbnail_manifest_key(image_name: str, size_key: str) -> str:
+    # Image names may be longer than the cache keys are allowed to be
+    image_hash = hashlib.sha256(f"{image_name}:{size_key}".encode("utf-8"))
+    return THUMBNAIL_MANIFEST_KEY.format(image_hash.hexdigest())
+
+
+def get_thumbnail_url_from_manifest(image_name: str, size_key: str) -> Optional[str]:
+    return cache.get(get_thumbnail_manifest_key(image_name, size_key))
+
+
+def add_thumbnail_url_to_manifest(image_name: str, size_key: str, url: str):
+    cache.set(
+        get_thumbnail_manifest_key(image_name, size_key),
+        url,
+        timeout=settings.THUMBNAIL_MANIFEST_TIMEOUT,
+    )
+
+
+def add_thumbnail_urls_to_manifest(urls: Iterable[Tuple[str, str, str]]):
+    """Record URLs given as tuples of the image name, size key and URL."""
+    cache.set_many(
+        {
+            get_thumbnail_manifest_key(image_name, size_key): url
+            for image_name, size_key, url in urls
+        },
+        timeout=settings.THUMBNAIL_MANIFEST_TIMEOUT,
+    )
+
+
+def get_thumbnail_url(image_file, method: str, size: str) -> str:
+    """Return the URL of the image thumbnail, using the manifest if possible."""
+    size_key = f"{method}__{size}"
+    url = get_thumbnail_url_from_manifest(image_file.name, size_key)
+    if url is None:
+        url = getattr(image_file, method)[size].url
+        add_thumbnail_url_to_manifest(image_file.name, size_key, url)
+    return url
+
+
+class ThumbnailWarmer(VersatileImageFieldWarmer):
+    """Create thumbnails and record their URLs in the manifest."""
+
+    @staticmethod
+    def _prewarm_versatileimagefield(size_key, versatileimagefieldfile):
+        prewarm = VersatileImageFieldWarmer._prewarm_versatileimagefield
+        success, url_or_filepath = prewarm(size_key, versatileimagefieldfile)
+        if success:
+            add_thumbnail_url_to_manifest(
+                versatileimagefieldfile.name, size_key, url_or_filepath
+            )
+        return success, url_or_filepath
+
+
+@dataclass
+class ThumbnailWarmingResult:
+    images: int = 0
+    created: int = 0
+    failed: List[str] = field(default_factory=list)
+    # Image name, size key and URL of the thumbnails to record in the manifest
+    urls: List[Tuple[str, str, str]] = field(default_factory=list)
+
+
+def get_missing_size_keys(
+    image_file, size_keys: Iterable[str], result: ThumbnailWarmingResult
+) -> List[str]:
+    """Return the size keys of the thumbnails of the image that don't exist yet.
+
+    URLs of the thumbnails found in the storage are added to the result, so once
+    they are recorded in the manifest they are not looked up in the storage again.
+    """
+    # Make sure the sized images only compute their paths
+    image_file.create_on_demand = False
+    missing_size_keys = []
+    for size_key in size_keys:
+        if get_thumbnail_url_from_manifest(image_file.name, size_key) is not None:
+            continue
+        method, size = size_key.split("__")
+        sized_image = getattr(image_file, method)[size]
+        if image_file.storage.exists(sized_image.name):
+            result.urls.append((image_file.name, size_key, sized_image.url))
+        else:
+            missing_size_keys.append(size_key)
+    return missing_size_keys
+
+
+def warm_thumbnails(
+    model: Type[Model],
+    pks: List,
+    image_attr: str,
+    rendition_key_set: str,
+    incremental: bool = False,
+) -> ThumbnailWarmingResult:
+    """Create thumbnails of images of the given instances.
+
+    In incremental mode only the thumbnails missing in the storage are created.
+    URLs of the thumbnails are returned instead of being recorded in the manifest,
+    as the function runs in worker processes which may not share the cache with
+    the caller, e.g. when the local memory cache is used.
+    """
+    size_keys = [size_key for _, size_key in get_rendition_key_set(rendition_key_set)]
+    result = ThumbnailWarmingResult()
+    for instance in model.objects.filter(pk__in=pks):  # type: ignore
+        image_file = getattr(instance, image_attr)
+        if not image_file:
+            continue
+        result.images += 1
+        if incremental:
+            missing_size_keys = get_missing_size_keys(image_file, size_keys, result)
+        else:
+            missing_size_keys = size_keys
+        for size_key in missing_size_keys:
+            prewarm = VersatileImageFieldWarmer._prewarm_versatileimagefield
+            success, url_or_filepath = prewarm(size_key, image_file)
+            if success:
+                result.created += 1
+                result.urls.append((image_file.name, size_key, url_or_filepath))
+            else:
+                result.failed.append(url_or_filepath)
+    return result
@@ -14,7 +14,8 @@ from django_countries.fields import Country
 from django_prices_openexchangerates import exchange_currency
 from geolite2 import geolite2
 from prices import MoneyRange
-from versatileimagefield.image_warmer import VersatileImageFieldWarmer
+
+from ..thumbnails import ThumbnailWarmer
 
 georeader = geolite2.reader()
 logger = logging.getLogger(__name__)
@@ -109,7 +110,7 @@ def create_thumbnails(pk, model, size_set, image_attr=None):
     if image_instance.name == "":
         # There is no file, skip processing
         return
-    warmer = VersatileImageFieldWarmer(
+    warmer = ThumbnailWarmer(
         instance_or_queryset=instance, rendition_key_set=size_set, image_attr=image_attr
     )
     logger.info("Creating thumbnails for  %s", pk)
@@ -34,6 +34,7 @@ from ...core.permissions import (
 from ...core.utils import build_absolute_uri
 from ...core.weight import zero_weight
 from ...discount import DiscountValueType, VoucherType
+from ...discount.cache import invalidate_active_discounts_cache
 from ...discount.models import Sale, Voucher
 from ...discount.utils import fetch_discounts
 from ...extensions.manager import get_extensions_manager
@@ -557,6 +558,7 @@ def create_fake_sale():
     )
     for product in Product.objects.all().order_by("?")[:4]:
         sale.products.add(product)
+    invalidate_active_discounts_cache()
     return sale
 
 
@@ -1,24 +1,51 @@
 import csv
 import gzip
-from typing import Iterable
+import json
+import math
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.contrib.syndication.views import add_domain
 from django.core.files.storage import default_storage
+from django.db import connections
+from django.db.models import Max, Min, Prefetch, QuerySet
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.encoding import smart_text
 
 from ..core.taxes import zero_money
 from ..discount import DiscountInfo
-from ..discount.utils import fetch_discounts
-from ..product.models import Attribute, AttributeValue, Category, ProductVariant
-from ..warehouse.availability import is_variant_in_stock
+from ..discount.utils import calculate_discounted_price, fetch_discounts
+from ..product.models import (
+    AssignedProductAttribute,
+    AssignedVariantAttribute,
+    Attribute,
+    Collection,
+    ProductVariant,
+)
+from ..warehouse.availability import get_in_stock_variant_ids, is_variant_in_stock
 
 CATEGORY_SEPARATOR = " > "
 
 FILE_PATH = "google-feed.csv.gz"
 
+# Number of variants fetched from the database at once
+FEED_CHUNK_SIZE = 1000
+
+# Slugs of the attributes used as the item brand, in the order of precedence
+BRAND_ATTRIBUTES = ["brand", "publisher"]
+
+# Number of shards the variants are split into for every worker process; having
+# more shards than workers balances the load and makes the checkpoints finer
+SHARDS_PER_WORKER = 4
+
 ATTRIBUTES = [
     "id",
     "title",
@@ -45,17 +72,53 @@ def get_feed_file_url():
     return default_storage.url(FILE_PATH)
 
 
-def get_feed_items():
+def get_feed_items(attribute_pks: Iterable[int] = ()):
+    """Return variants with the data needed to describe them in the feed.
+
+    Only the values of the attributes with the given primary keys are prefetched.
+    """
+    attribute_pks = list(attribute_pks)
     items = ProductVariant.objects.all()
-    items = items.select_related("product")
+    items = items.select_related("product", "product__category")
     items = items.prefetch_related(
         "images",
-        "product__category",
         "product__images",
-        "product__product_type__product_attributes",
-        "product__product_type__variant_attributes",
+        Prefetch("product__collections", queryset=Collection.objects.only("pk")),
+        Prefetch(
+            "attributes",
+            queryset=AssignedVariantAttribute.objects.filter(
+                assignment__attribute_id__in=attribute_pks
+            )
+            .select_related("assignment")
+            .prefetch_related("values"),
+        ),
+        Prefetch(
+            "product__attributes",
+            queryset=AssignedProductAttribute.objects.filter(
+                assignment__attribute_id__in=attribute_pks
+            )
+            .select_related("assignment")
+            .prefetch_related("values"),
+        ),
     )
-    return items
+    return items.order_by("pk")
+
+
+def iterate_feed_items(
+    items: QuerySet, chunk_size: int = FEED_CHUNK_SIZE
+) -> Iterator[List[ProductVariant]]:
+    """Yield the items in chunks, paginated by their primary keys.
+
+    Only a single chunk is kept in memory and fetching a chunk costs the same
+    regardless of its position in the feed.
+    """
+    last_pk = 0
+    while True:
+        chunk = list(items.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1].pk
 
 
 def item_id(item: ProductVariant):
@@ -88,32 +151,32 @@ def item_condition(item: ProductVariant):
     return "new"
 
 
-def item_brand(item: ProductVariant, attributes_dict, attribute_values_dict):
+def _get_attribute_value_name(assigned_attributes, attribute_pk) -> Optional[str]:
+    for assigned_attribute in assigned_attributes.all():
+        if assigned_attribute.assignment.attribute_id == attribute_pk:
+            values = assigned_attribute.values.all()
+            if values:
+                return smart_text(values[0])
+    return None
+
+
+def item_brand(item: ProductVariant, attributes_dict: Dict[str, int]):
     """Return an item brand.
 
     This field is required.
     Read more:
     https://support.google.com/merchants/answer/6324351?hl=en&ref_topic=6324338
     """
-    brand = None
-    brand_attribute_pk = attributes_dict.get("brand")
-    publisher_attribute_pk = attributes_dict.get("publisher")
-
-    if brand_attribute_pk:
-        brand = item.attributes.get(str(brand_attribute_pk))
-        if brand is None:
-            brand = item.product.attributes.get(str(brand_attribute_pk))
-
-    if brand is None and publisher_attribute_pk is not None:
-        brand = item.attributes.get(str(publisher_attribute_pk))
+    for slug in BRAND_ATTRIBUTES:
+        attribute_pk = attributes_dict.get(slug)
+        if attribute_pk is None:
+            continue
+        brand = _get_attribute_value_name(item.attributes, attribute_pk)
         if brand is None:
-            brand = item.product.attributes.get(str(publisher_attribute_pk))
-
-    if brand:
-        brand_name = attribute_values_dict.get(brand)
-        if brand_name is not None:
-            return brand_name
-    return brand
+            brand = _get_attribute_value_name(item.product.attributes, attribute_pk)
+        if brand is not None:
+            return brand
+    return None
 
 
 def item_tax(item: ProductVariant, discounts: Iterable[DiscountInfo]):
@@ -139,8 +202,14 @@ def item_image_link(item: ProductVariant, current_site):
     return None
 
 
-def item_availability(item: ProductVariant):
-    if is_variant_in_stock(item, settings.DEFAULT_COUNTRY):
+def item_availability(
+    item: ProductVariant, in_stock_variant_ids: Optional[Set[int]] = None
+):
+    if in_stock_variant_ids is None:
+        in_stock = is_variant_in_stock(item, settings.DEFAULT_COUNTRY)
+    else:
+        in_stock = item.pk in in_stock_variant_ids
+    if in_stock:
         return "in stock"
     return "out of stock"
 
@@ -170,18 +239,25 @@ def item_price(item: ProductVariant):
 
 
 def item_sale_price(item: ProductVariant, discounts: Iterable[DiscountInfo]):
-    sale_price = item.get_price(discounts=discounts)
+    collection_ids = None
+    if discounts:
+        # Use the prefetched collections instead of querying them for every item
+        collection_ids = {
+            collection.pk for collection in item.product.collections.all()
+        }
+    sale_price = calculate_discounted_price(
+        item.product, item.base_price, discounts, collection_ids
+    )
     return "%s %s" % (sale_price.amount, sale_price.currency)
 
 
 def item_attributes(
     item: ProductVariant,
-    categories,
     category_paths,
     current_site,
     discounts: Iterable[DiscountInfo],
-    attributes_dict,
-    attribute_values_dict,
+    attributes_dict: Dict[str, int],
+    in_stock_variant_ids: Optional[Set[int]] = None,
 ):
     product_data = {
         "id": item_id(item),
@@ -190,7 +266,7 @@ def item_attributes(
         "condition": item_condition(item),
         "mpn": item_mpn(item),
         "item_group_id": item_group_id(item),
-        "availability": item_availability(item),
+        "availability": item_availability(item, in_stock_variant_ids),
         "google_product_category": item_google_product_category(item, category_paths),
     }
 
@@ -208,36 +284,62 @@ def item_attributes(
     if tax:
         product_data["tax"] = tax
 
-    brand = item_brand(item, attributes_dict, attribute_values_dict)
+    brand = item_brand(item, attributes_dict)
     if brand:
         product_data["brand"] = brand
 
     return product_data
 
 
-def write_feed(file_obj):
-    """Write feed contents info provided file object."""
+def write_feed(
+    file_obj,
+    chunk_size: int = FEED_CHUNK_SIZE,
+    start_pk: Optional[int] = None,
+    stop_pk: Optional[int] = None,
+    header: bool = True,
+) -> int:
+    """Write feed contents info provided file object.
+
+    Items are fetched and written in chunks, so the memory usage doesn't grow with
+    the number of variants. Data that would be otherwise queried for every item,
+    like stock availability, is fetched once per chunk.
+
+    Only the variants with primary keys in the range from `start_pk` (inclusive)
+    to `stop_pk` (exclusive) are written if the range is given. Return the number
+    of written items.
+    """
     writer = csv.DictWriter(file_obj, ATTRIBUTES, dialect=csv.excel_tab)
-    writer.writeheader()
-    categories = Category.objects.all()
+    if header:
+        writer.writeheader()
     discounts = fetch_discounts(timezone.now())
-    attributes_dict = {a.slug: a.pk for a in Attribute.objects.all()}
-    attribute_values_dict = {
-        smart_text(a.pk): smart_text(a) for a in AttributeValue.objects.all()
+    attributes_dict = {
+        a.slug: a.pk for a in Attribute.objects.filter(slug__in=BRAND_ATTRIBUTES)
     }
-    category_paths = {}
+    category_paths: Dict[int, str] = {}
     current_site = Site.objects.get_current()
-    for item in get_feed_items():
-        item_data = item_attributes(
-            item,
-            categories,
-            category_paths,
-            current_site,
-            discounts,
-            attributes_dict,
-            attribute_values_dict,
+    items = get_feed_items(attributes_dict.values())
+    if start_pk is not None:
+        items = items.filter(pk__gte=start_pk)
+    if stop_pk is not None:
+        items = items.filter(pk__lt=stop_pk)
+    rows = 0
+    for chunk in iterate_feed_items(items, chunk_size):
+        in_stock_variant_ids = get_in_stock_variant_ids(
+            chunk, settings.DEFAULT_COUNTRY
         )
-        writer.writerow(item_data)
+        writer.writerows(
+            item_attributes(
+                item,
+                category_paths,
+                current_site,
+                discounts,
+                attributes_dict,
+                in_stock_variant_ids,
+            )
+            for item in chunk
+        )
+        rows += len(chunk)
+    return rows
 
 
 def update_feed(file_path=FILE_PATH):
@@ -249,3 +351,180 @@ def update_feed(file_path=FILE_PATH):
         output = gzip.open(output_file, "wt")
         write_feed(output)
         output.close()
+
+
+@dataclass
+class FeedPart:
+    index: int
+    rows: int
+    seconds: float
+    resumed: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def get_feed_part_path(file_path: str, index: int) -> str:
+    return f"{file_path}.part-{index:04d}"
+
+
+def get_feed_checkpoint_path(file_path: str) -> str:
+    return f"{file_path}.checkpoint.json"
+
+
+def get_feed_shards(shards_count: int) -> List[Tuple[int, Optional[int]]]:
+    """Split the range of variant primary keys into ranges of equal length.
+
+    The last range is open-ended, so variants created after the shards are
+    computed, e.g. while an interrupted export waits to be resumed, are included.
+    """
+    bounds = ProductVariant.objects.aggregate(start=Min("pk"), stop=Max("pk"))
+    if bounds["start"] is None:
+        return []
+    start, stop = bounds["start"], bounds["stop"] + 1
+    step = max(1, math.ceil((stop - start) / shards_count))
+    shards: List[Tuple[int, Optional[int]]] = [
+        (shard_start, shard_start + step) for shard_start in range(start, stop, step)
+    ]
+    shards[-1] = (shards[-1][0], None)
+    return shards
+
+
+def load_feed_checkpoint(file_path: str) -> Optional[dict]:
+    checkpoint_path = get_feed_checkpoint_path(file_path)
+    if not default_storage.exists(checkpoint_path):
+        return None
+    with default_storage.open(checkpoint_path, "rb") as checkpoint_file:
+        return json.loads(checkpoint_file.read())
+
+
+def get_feed_checkpoint_max_age() -> timedelta:
+    return timedelta(seconds=settings.FEED_CHECKPOINT_MAX_AGE)
+
+
+def is_feed_checkpoint_stale(checkpoint: dict, max_age: timedelta) -> bool:
+    """Check if the checkpoint was left by an export that won't be resumed.
+
+    The age is measured from the last written part, so long exports can be
+    resumed as long as they were making progress shortly before the crash.
+    """
+    updated = parse_datetime(checkpoint.get("updated") or "")
+    return updated is None or timezone.now() - updated > max_age
+
+
+def save_feed_checkpoint(file_path: str, checkpoint: dict):
+    checkpoint["updated"] = timezone.now().isoformat()
+    with default_storage.open(get_feed_checkpoint_path(file_path), "wb") as f:
+        f.write(json.dumps(checkpoint).encode("utf-8"))
+
+
+def write_feed_part(
+    file_path: str, index: int, start_pk: int, stop_pk: Optional[int], chunk_size: int
+) -> FeedPart:
+    """Write a gzipped part of the feed with the variants of a single shard."""
+    started = time.monotonic()
+    with default_storage.open(get_feed_part_path(file_path, index), "wb") as f:
+        with gzip.open(f, "wt") as output:
+            rows = write_feed(
+                output, chunk_size, start_pk=start_pk, stop_pk=stop_pk, header=False
+            )
+    return FeedPart(index=index, rows=rows, seconds=time.monotonic() - started)
+
+
+def _write_feed_parts(
+    file_path: str,
+    shards: List[Tuple[int, int, Optional[int]]],
+    workers: int,
+    chunk_size: int,
+) -> Iterator[FeedPart]:
+    if workers == 1:
+        for index, start_pk, stop_pk in shards:
+            yield write_feed_part(file_path, index, start_pk, stop_pk, chunk_size)
+        return
+
+    # Forked workers can't share the database connections of the parent process
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                write_feed_part, file_path, index, start_pk, stop_pk, chunk_size
+            )
+            for index, start_pk, stop_pk in shards
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _concatenate_feed_parts(file_path: str, parts_count: int):
+    """Join the parts into the feed file.
+
+    A sequence of gzip streams is a valid gzip stream, so the parts are copied as
+    they are, after a stream with the header.
+    """
+    with default_storage.open(file_path, "wb") as output_file:
+        with gzip.open(output_file, "wt") as output:
+            csv.DictWriter(output, ATTRIBUTES, dialect=csv.excel_tab).writeheader()
+        for index in range(parts_count):
+            part_path = get_feed_part_path(file_path, index)
+            with default_storage.open(part_path, "rb") as part_file:
+                shutil.copyfileobj(part_file, output_file)
+
+
+def update_feed_in_parallel(
+    file_path: str = FILE_PATH,
+    workers: Optional[int] = None,
+    shards_count: Optional[int] = None,
+    chunk_size: int = FEED_CHUNK_SIZE,
+    restart: bool = False,
+    checkpoint_max_age: Optional[timedelta] = None,
+) -> List[FeedPart]:
+    """Save updated feed into provided path, using a pool of worker processes.
+
+    Variants are split into shards by their primary keys and every shard is
+    written to a separate part of the feed. Written parts are recorded in
+    a checkpoint, so after a crash the export resumes from the unfinished parts,
+    unless `restart` is set or no part was written for longer than
+    `checkpoint_max_age`, which defaults to the `FEED_CHECKPOINT_MAX_AGE`
+    setting. Return the parts of the feed.
+    """
+    workers = workers or os.cpu_count() or 1
+    if checkpoint_max_age is None:
+        checkpoint_max_age = get_feed_checkpoint_max_age()
+    checkpoint = load_feed_checkpoint(file_path)
+    if checkpoint is not None and (
+        restart or is_feed_checkpoint_stale(checkpoint, checkpoint_max_age)
+    ):
+        for index in range(len(checkpoint["shards"])):
+            default_storage.delete(get_feed_part_path(file_path, index))
+        checkpoint = None
+    if checkpoint is None:
+        shards = get_feed_shards(shards_count or workers * SHARDS_PER_WORKER)
+        checkpoint = {
+            "created": timezone.now().isoformat(),
+            "shards": shards,
+            "completed": {},
+        }
+        save_feed_checkpoint(file_path, checkpoint)
+
+    completed = checkpoint["completed"]
+    parts = [
+        FeedPart(index=int(index), resumed=True, **part)
+        for index, part in completed.items()
+    ]
+    pending_shards = [
+        (index, start_pk, stop_pk)
+        for index, (start_pk, stop_pk) in enumerate(checkpoint["shards"])
+        if str(index) not in completed
+    ]
+    for part in _write_feed_parts(file_path, pending_shards, workers, chunk_size):
+        completed[str(part.index)] = {"rows": part.rows, "seconds": part.seconds}
+        save_feed_checkpoint(file_path, checkpoint)
+        parts.append(part)
+
+    parts_count = len(checkpoint["shards"])
+    _concatenate_feed_parts(file_path, parts_count)
+    for index in range(parts_count):
+        default_storage.delete(get_feed_part_path(file_path, index))
+    default_storage.delete(get_feed_checkpoint_path(file_path))
+    return sorted(parts, key=lambda part: part.index)
@@ -1,10 +1,68 @@
+from datetime import timedelta
+
 from django.core.management import BaseCommand
 
-from ...google_merchant import update_feed
+from ...google_merchant import FEED_CHUNK_SIZE, update_feed_in_parallel
 
 
 class Command(BaseCommand):
     help = "Update Google merchant feed"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of worker processes. Defaults to the number of CPUs.",
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            default=None,
+            help="Number of shards the variants are split into.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=FEED_CHUNK_SIZE,
+            help="Number of variants fetched from the database at once.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            default=False,
+            help="Ignore the checkpoint of an interrupted export.",
+        )
+        parser.add_argument(
+            "--checkpoint-max-age",
+            type=int,
+            default=None,
+            help=(
+                "Number of seconds since the last written shard after which "
+                "an interrupted export is started over instead of resumed. "
+                "Defaults to the FEED_CHECKPOINT_MAX_AGE setting."
+            ),
+        )
+
     def handle(self, *args, **options):
-        update_feed()
+        checkpoint_max_age = None
+        if options["checkpoint_max_age"] is not None:
+            checkpoint_max_age = timedelta(seconds=options["checkpoint_max_age"])
+        parts = update_feed_in_parallel(
+            workers=options["workers"],
+            shards_count=options["shards"],
+            chunk_size=options["chunk_size"],
+            restart=options["restart"],
+            checkpoint_max_age=checkpoint_max_age,
+        )
+        for part in parts:
+            if part.resumed:
+                status = " (written before resuming)"
+            else:
+                status = ""
+            self.stdout.write(
+                f"Shard {part.index}: {part.rows} rows in {part.seconds:.1f}s, "
+                f"{part.rows_per_second:.0f} rows/s{status}"
+            )
+        total_rows = sum(part.rows for part in parts)
+        self.stdout.write(f"Feed updated with {total_rows} rows.")
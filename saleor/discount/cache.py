@@ -0,0 +1,37 @@
+"""Shared cache of the active discounts.
+
+Fetching the active sales takes a few queries and is needed by most of the
+storefront requests, while sales change rarely. The discounts are cached along
+with the time the set of active sales changes next, which is the closest start
+or end date of a sale, and with the version stamp bumped whenever sales or their
+products, categories and collections change.
+"""
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+ACTIVE_DISCOUNTS_CACHE_KEY = "active_discounts:{}"
+ACTIVE_DISCOUNTS_VERSION_CACHE_KEY = "active_discounts_version"
+
+
+def get_active_discounts_version() -> str:
+    version = cache.get(ACTIVE_DISCOUNTS_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(ACTIVE_DISCOUNTS_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+        version = cache.get(ACTIVE_DISCOUNTS_VERSION_CACHE_KEY)
+    return version
+
+
+def _bump_active_discounts_version():
+    cache.set(ACTIVE_DISCOUNTS_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+
+
+def invalidate_active_discounts_cache():
+    """Make the cached active discounts stale.
+
+    Has to be called after sales or their catalogues are changed. The version is
+    bumped once the current transaction is committed, so the discounts from
+    before the change can't be cached under it.
+    """
+    transaction.on_commit(_bump_active_discounts_version)
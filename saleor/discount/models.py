@@ -11,8 +11,10 @@ from django_prices.templatetags.prices import amount
 from prices import Money, fixed_discount, percentage_discount
 
 from ..core.permissions import DiscountPermissions
+from ..core.response_cache import ResponseCacheInvalidationMixin, ResponseCacheTag
 from ..core.utils.translations import TranslationProxy
 from . import DiscountValueType, VoucherType
+from .cache import invalidate_active_discounts_cache
 
 
 class NotApplicable(ValueError):
@@ -188,7 +190,7 @@ class VoucherTranslation(models.Model):
         unique_together = (("language_code", "voucher"),)
 
 
-class Sale(models.Model):
+class Sale(ResponseCacheInvalidationMixin, models.Model):
     name = models.CharField(max_length=255)
     type = models.CharField(
         max_length=10,
@@ -209,6 +211,8 @@ class Sale(models.Model):
     objects = SaleQueryset.as_manager()
     translated = TranslationProxy()
 
+    response_cache_tag = ResponseCacheTag.SALE
+
     class Meta:
         app_label = "discount"
         permissions = (
@@ -228,6 +232,15 @@ class Sale(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_active_discounts_cache()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_active_discounts_cache()
+        return result
+
     def get_discount(self):
         if self.type == DiscountValueType.FIXED:
             discount_amount = Money(self.value, settings.DEFAULT_CURRENCY)
@@ -2,19 +2,22 @@ import datetime
 from collections import defaultdict
 from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Union
 
-from django.db.models import F
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Min, Q
 from django.utils import timezone
 from prices import Money
 
 from ..checkout import calculations
 from ..core.taxes import zero_money
 from . import DiscountInfo
+from .cache import ACTIVE_DISCOUNTS_CACHE_KEY, get_active_discounts_version
 from .models import NotApplicable, Sale, VoucherCustomer
 
 if TYPE_CHECKING:
     # flake8: noqa
     from .models import Voucher
-    from ..product.models import Product
+    from ..product.models import Product, ProductVariant
     from ..checkout.models import Checkout
     from ..order.models import Order
 
@@ -62,29 +65,141 @@ def get_product_discount_on_sale(
     raise NotApplicable("Discount not applicable for this product")
 
 
+class SaleIndex(list):
+    """List of discounts indexed by the products, categories and collections.
+
+    Looking up the discounts applicable to a product doesn't need to check every
+    sale. The index is built once, so the list must not be modified later.
+    """
+
+    def __init__(self, discounts: Iterable[DiscountInfo] = ()):
+        super().__init__(discounts)
+        self.by_product: Dict[int, List[DiscountInfo]] = defaultdict(list)
+        self.by_category: Dict[int, List[DiscountInfo]] = defaultdict(list)
+        self.by_collection: Dict[int, List[DiscountInfo]] = defaultdict(list)
+        for discount in self:
+            for product_id in discount.product_ids:
+                self.by_product[product_id].append(discount)
+            for category_id in discount.category_ids:
+                self.by_category[category_id].append(discount)
+            for collection_id in discount.collection_ids:
+                self.by_collection[collection_id].append(discount)
+
+    @property
+    def has_collection_discounts(self) -> bool:
+        return bool(self.by_collection)
+
+    def get_discounts(
+        self, product: "Product", collection_ids: Iterable[int]
+    ) -> List[DiscountInfo]:
+        """Return discounts applicable to the product in the given collections."""
+        matching = [
+            *self.by_product.get(product.id, []),
+            *self.by_category.get(product.category_id, []),
+        ]
+        for collection_id in collection_ids:
+            matching.extend(self.by_collection.get(collection_id, []))
+        # A product may be on sale both by itself and by its category or collection
+        unique = {id(discount): discount for discount in matching}
+        return list(unique.values())
+
+
+def get_sale_index(discounts: Optional[Iterable[DiscountInfo]]) -> SaleIndex:
+    if isinstance(discounts, SaleIndex):
+        return discounts
+    return SaleIndex(discounts or [])
+
+
+def get_products_collection_ids(
+    products: Iterable["Product"],
+) -> Dict[int, Set[int]]:
+    """Return IDs of the collections of the products, keyed by product IDs.
+
+    Prefetched collections are used, others are fetched with a single query.
+    """
+    from ..product.models import CollectionProduct
+
+    collection_ids: Dict[int, Set[int]] = defaultdict(set)
+    products_to_fetch = []
+    for product in products:
+        if "collections" in getattr(product, "_prefetched_objects_cache", {}):
+            collection_ids[product.pk] = {
+                collection.pk for collection in product.collections.all()
+            }
+        else:
+            products_to_fetch.append(product.pk)
+    if products_to_fetch:
+        collections = CollectionProduct.objects.filter(
+            product_id__in=products_to_fetch
+        ).values_list("product_id", "collection_id")
+        for product_pk, collection_pk in collections:
+            collection_ids[product_pk].add(collection_pk)
+    return collection_ids
+
+
 def get_product_discounts(
-    product: "Product", discounts: Iterable[DiscountInfo]
+    product: "Product",
+    discounts: Iterable[DiscountInfo],
+    collection_ids: Optional[Set[int]] = None,
 ) -> Money:
-    """Return discount values for all discounts applicable to a product."""
-    product_collections = set(product.collections.all().values_list("pk", flat=True))
-    for discount in discounts or []:
-        try:
-            yield get_product_discount_on_sale(product, product_collections, discount)
-        except NotApplicable:
-            pass
+    """Return discount values for all discounts applicable to a product.
+
+    Collections of the product are fetched unless `collection_ids` is given or
+    no discount applies to collections.
+    """
+    sale_index = get_sale_index(discounts)
+    if collection_ids is None:
+        if sale_index.has_collection_discounts:
+            collection_ids = get_products_collection_ids([product])[product.pk]
+        else:
+            collection_ids = set()
+    for discount in sale_index.get_discounts(product, collection_ids):
+        yield discount.sale.get_discount()
 
 
 def calculate_discounted_price(
-    product: "Product", price: Money, discounts: Optional[Iterable[DiscountInfo]]
+    product: "Product",
+    price: Money,
+    discounts: Optional[Iterable[DiscountInfo]],
+    collection_ids: Optional[Set[int]] = None,
 ) -> Money:
     """Return minimum product's price of all prices with discounts applied."""
     if discounts:
-        discount_prices = list(get_product_discounts(product, discounts))
+        discount_prices = list(
+            get_product_discounts(product, discounts, collection_ids)
+        )
         if discount_prices:
             price = min(discount(price) for discount in discount_prices)
     return price
 
 
+def calculate_variants_prices(
+    variants: Iterable["ProductVariant"],
+    discounts: Optional[Iterable[DiscountInfo]],
+) -> Dict[int, Money]:
+    """Return prices of the variants with discounts applied, keyed by their IDs.
+
+    Collections of all the products are fetched at once, if any discount applies
+    to collections.
+    """
+    variants = list(variants)
+    sale_index = get_sale_index(discounts)
+    if sale_index.has_collection_discounts:
+        products = {variant.product_id: variant.product for variant in variants}
+        collection_ids = get_products_collection_ids(products.values())
+    else:
+        collection_ids = defaultdict(set)
+    return {
+        variant.pk: calculate_discounted_price(
+            variant.product,
+            variant.base_price,
+            sale_index,
+            collection_ids[variant.product_id],
+        )
+        for variant in variants
+    }
+
+
 def validate_voucher_for_checkout(
     voucher: "Voucher",
     checkout: "Checkout",
@@ -162,14 +277,14 @@ def _fetch_products(sale_pks: Iterable[str]) -> Dict[int, Set[int]]:
     return product_map
 
 
-def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
+def fetch_discounts(date: datetime.date) -> SaleIndex:
     sales = list(Sale.objects.active(date))
     pks = {s.pk for s in sales}
     collections = _fetch_collections(pks)
     products = _fetch_products(pks)
     categories = _fetch_categories(pks)
 
-    return [
+    return SaleIndex(
         DiscountInfo(
             sale=sale,
             category_ids=categories[sale.pk],
@@ -177,8 +292,45 @@ def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
             product_ids=products[sale.pk],
         )
         for sale in sales
-    ]
+    )
 
 
-def fetch_active_discounts() -> List[DiscountInfo]:
+def fetch_active_discounts() -> SaleIndex:
     return fetch_discounts(timezone.now())
+
+
+def _get_next_sales_change(date: datetime.datetime) -> Optional[datetime.datetime]:
+    """Return the closest time after the date when a sale starts or ends."""
+    next_dates = Sale.objects.aggregate(
+        next_start=Min("start_date", filter=Q(start_date__gt=date)),
+        next_end=Min("end_date", filter=Q(end_date__gt=date)),
+    )
+    dates = [value for value in next_dates.values() if value is not None]
+    return min(dates) if dates else None
+
+
+def fetch_cached_active_discounts() -> SaleIndex:
+    """Return the active discounts, reusing the ones fetched by other requests.
+
+    Cached discounts are refetched when sales change or when a sale starts or
+    ends, see `saleor.discount.cache`.
+    """
+    timeout = settings.ACTIVE_DISCOUNTS_CACHE_TIMEOUT
+    if not timeout:
+        return fetch_active_discounts()
+
+    now = timezone.now()
+    key = ACTIVE_DISCOUNTS_CACHE_KEY.format(get_active_discounts_version())
+    cached = cache.get(key)
+    if cached is not None:
+        valid_until, discounts = cached
+        if valid_until is None or now < valid_until:
+            return discounts
+
+    discounts = fetch_discounts(now)
+    valid_until = _get_next_sales_change(now)
+    if valid_until is not None:
+        seconds_left = (valid_until - now).total_seconds()
+        timeout = min(timeout, max(int(seconds_left), 1))
+    cache.set(key, (valid_until, discounts), timeout=timeout)
+    return discounts
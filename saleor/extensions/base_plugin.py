@@ -114,6 +114,27 @@ class BasePlugin:
         """
         return NotImplemented
 
+    def calculate_checkout_lines_totals(
+        self,
+        checkout: "Checkout",
+        lines: List["CheckoutLine"],
+        discounts: List["DiscountInfo"],
+        previous_value: List[TaxedMoney],
+    ) -> List[TaxedMoney]:
+        """Calculate totals of all the checkout lines.
+
+        By default totals are calculated line by line with
+        `calculate_checkout_line_total`. Overwrite this method if the plugin can
+        calculate them at once. Return a list of TaxedMoney in the order of lines.
+        """
+        totals = []
+        for line, line_total in zip(lines, previous_value):
+            total = self.calculate_checkout_line_total(
+                line, discounts, previous_value=line_total
+            )
+            totals.append(line_total if total is NotImplemented else total)
+        return totals
+
     def calculate_order_line_unit(
         self, order_line: "OrderLine", previous_value: TaxedMoney
     ) -> TaxedMoney:
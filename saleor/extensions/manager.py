@@ -1,7 +1,11 @@
+import inspect
+import time
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any, List, Iterable, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Iterable, Optional, Tuple, Union
+from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.module_loading import import_string
 from django_countries.fields import Country
 from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
@@ -10,12 +14,13 @@ from ..checkout import base_calculations
 from ..core.payments import PaymentInterface
 from ..core.taxes import TaxType, quantize_price, zero_taxed_money
 from ..discount import DiscountInfo
+from .base_plugin import BasePlugin
 from .models import PluginConfiguration
 
 if TYPE_CHECKING:
     # flake8: noqa
     from django.db.models.query import QuerySet
-    from .base_plugin import BasePlugin, PluginConfigurationType
+    from .base_plugin import PluginConfigurationType
     from ..checkout.models import Checkout, CheckoutLine
     from ..product.models import Product, ProductType
     from ..account.models import Address, User
@@ -28,6 +33,28 @@ if TYPE_CHECKING:
     )
 
 
+def plugin_implements_hook(plugin: "BasePlugin", method_name: str) -> bool:
+    """Check if the plugin overrides the no-op implementation of the hook."""
+    plugin_method = getattr(type(plugin), method_name, None)
+    if plugin_method is None:
+        return False
+    return plugin_method is not getattr(BasePlugin, method_name, None)
+
+
+# Names of all the hooks a plugin can implement.
+PLUGIN_HOOKS = [
+    name
+    for name, value in BasePlugin.__dict__.items()
+    if inspect.isfunction(value) and not name.startswith("_")
+]
+
+# Hooks whose default implementation in `BasePlugin` calls another hook, so they
+# have to be called on plugins implementing only the other one.
+DELEGATED_PLUGIN_HOOKS = {
+    "calculate_checkout_lines_totals": "calculate_checkout_line_total",
+}
+
+
 class ExtensionsManager(PaymentInterface):
     """Base manager for handling plugins logic."""
 
@@ -35,6 +62,7 @@ class ExtensionsManager(PaymentInterface):
 
     def __init__(self, plugins: List[str]):
         self.plugins = []
+        self._plugins_by_hook: Dict[str, List["BasePlugin"]] = {}
         all_configs = self._get_all_plugin_configs()
         for plugin_path in plugins:
             PluginClass = import_string(plugin_path)
@@ -46,13 +74,36 @@ class ExtensionsManager(PaymentInterface):
                 plugin_config = PluginClass.DEFAULT_CONFIGURATION
                 active = PluginClass.get_default_active()
             self.plugins.append(PluginClass(configuration=plugin_config, active=active))
+        for method_name in PLUGIN_HOOKS:
+            self.get_plugins_for_hook(method_name)
+
+    def get_plugins_for_hook(self, method_name: str) -> List["BasePlugin"]:
+        """Return active plugins that provide their own implementation of the hook.
+
+        The lists are computed once per manager, so inactive plugins and plugins
+        inheriting the no-op hook from `BasePlugin` are never called.
+        """
+        plugins = self._plugins_by_hook.get(method_name)
+        if plugins is None:
+            delegated_method_name = DELEGATED_PLUGIN_HOOKS.get(method_name)
+            plugins = [
+                plugin
+                for plugin in self.get_active_plugins()
+                if plugin_implements_hook(plugin, method_name)
+                or (
+                    delegated_method_name is not None
+                    and plugin_implements_hook(plugin, delegated_method_name)
+                )
+            ]
+            self._plugins_by_hook[method_name] = plugins
+        return plugins
 
     def __run_method_on_plugins(
         self, method_name: str, default_value: Any, *args, **kwargs
     ):
         """Try to run a method with the given name on each declared plugin."""
         value = default_value
-        for plugin in self.plugins:
+        for plugin in self.get_plugins_for_hook(method_name):
             value = self.__run_method_on_single_plugin(
                 plugin, method_name, value, *args, **kwargs
             )
@@ -93,12 +144,24 @@ class ExtensionsManager(PaymentInterface):
         self.__run_method_on_plugins("checkout_quantity_changed", None, checkout)
 
     def calculate_checkout_total(
-        self, checkout: "Checkout", discounts: Iterable[DiscountInfo]
+        self,
+        checkout: "Checkout",
+        discounts: Iterable[DiscountInfo],
+        subtotal: Optional[TaxedMoney] = None,
+        shipping_price: Optional[TaxedMoney] = None,
     ) -> TaxedMoney:
+        """Calculate the checkout total.
 
+        Already calculated subtotal and shipping price of the checkout may be given
+        to not calculate them again.
+        """
+        if subtotal is None:
+            subtotal = self.calculate_checkout_subtotal(checkout, discounts)
+        if shipping_price is None:
+            shipping_price = self.calculate_checkout_shipping(checkout, discounts)
         default_value = base_calculations.base_checkout_total(
-            subtotal=self.calculate_checkout_subtotal(checkout, discounts),
-            shipping_price=self.calculate_checkout_shipping(checkout, discounts),
+            subtotal=subtotal,
+            shipping_price=shipping_price,
             discount=checkout.discount,
             currency=checkout.currency,
         )
@@ -107,18 +170,46 @@ class ExtensionsManager(PaymentInterface):
         )
 
     def calculate_checkout_subtotal(
-        self, checkout: "Checkout", discounts: Iterable[DiscountInfo]
+        self,
+        checkout: "Checkout",
+        discounts: Iterable[DiscountInfo],
+        lines_totals: Optional[List[TaxedMoney]] = None,
     ) -> TaxedMoney:
-        line_totals = [
-            self.calculate_checkout_line_total(line, discounts) for line in checkout
-        ]
+        """Calculate the checkout subtotal.
+
+        Already calculated totals of the checkout lines may be given to not
+        calculate them again.
+        """
+        if lines_totals is None:
+            lines_totals = self.calculate_checkout_lines_totals(
+                checkout, list(checkout), discounts
+            )
         default_value = base_calculations.base_checkout_subtotal(
-            line_totals, checkout.currency
+            lines_totals, checkout.currency
         )
         return self.__run_method_on_plugins(
             "calculate_checkout_subtotal", default_value, checkout, discounts
         )
 
+    def calculate_checkout_lines_totals(
+        self,
+        checkout: "Checkout",
+        lines: List["CheckoutLine"],
+        discounts: Iterable[DiscountInfo],
+    ) -> List[TaxedMoney]:
+        """Calculate totals of the checkout lines in a single pass.
+
+        Return the totals in the order of the lines.
+        """
+        default_value = base_calculations.base_checkout_lines_totals(lines, discounts)
+        return self.__run_method_on_plugins(
+            "calculate_checkout_lines_totals",
+            default_value,
+            checkout,
+            lines,
+            discounts,
+        )
+
     def calculate_checkout_shipping(
         self, checkout: "Checkout", discounts: Iterable[DiscountInfo]
     ) -> TaxedMoney:
@@ -384,9 +475,11 @@ class ExtensionsManager(PaymentInterface):
                 plugin_configuration, _ = PluginConfiguration.objects.get_or_create(
                     name=plugin_name, defaults={"configuration": plugin.configuration}
                 )
-                return plugin.save_plugin_configuration(
+                plugin_configuration = plugin.save_plugin_configuration(
                     plugin_configuration, cleaned_data
                 )
+                invalidate_extensions_manager_cache()
+                return plugin_configuration
 
     def get_plugin(self, plugin_name: str) -> Optional["BasePlugin"]:
         for plugin in self.plugins:
@@ -395,12 +488,60 @@ class ExtensionsManager(PaymentInterface):
         return None
 
 
+EXTENSIONS_MANAGER_VERSION_CACHE_KEY = "extensions_manager_version"
+
+# Managers built by this process, keyed by the manager path and the list of
+# plugins. Each entry stores the configuration version it was built for and the
+# monotonic time after which it has to be rebuilt.
+_managers_cache: Dict[Tuple[str, Tuple[str, ...]], Tuple[str, float, Any]] = {}
+
+
+def get_plugin_configurations_version() -> str:
+    """Return the version stamp of the stored plugin configurations.
+
+    The stamp is kept in the shared cache so a configuration change made by any
+    process invalidates the managers built by all of them.
+    """
+    version = cache.get(EXTENSIONS_MANAGER_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(EXTENSIONS_MANAGER_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+        version = cache.get(EXTENSIONS_MANAGER_VERSION_CACHE_KEY)
+    return version
+
+
+def invalidate_extensions_manager_cache():
+    """Force all processes to rebuild their managers on the next use."""
+    cache.set(EXTENSIONS_MANAGER_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+
+
+def clear_extensions_manager_cache():
+    """Drop the managers built by the current process."""
+    _managers_cache.clear()
+
+
 def get_extensions_manager(
     manager_path: str = None, plugins: List[str] = None
 ) -> ExtensionsManager:
+    """Return the extensions manager for the given plugins.
+
+    The manager is built once and reused by the process until any plugin
+    configuration changes or `EXTENSIONS_MANAGER_CACHE_TIMEOUT` passes.
+    """
     if not manager_path:
         manager_path = settings.EXTENSIONS_MANAGER
     if plugins is None:
         plugins = settings.PLUGINS
-    manager = import_string(manager_path)
-    return manager(plugins)
+
+    key = (manager_path, tuple(plugins))
+    version = get_plugin_configurations_version()
+    now = time.monotonic()
+    cached = _managers_cache.get(key)
+    if cached is not None:
+        cached_version, expires_at, cached_manager = cached
+        if cached_version == version and now < expires_at:
+            return cached_manager
+
+    manager = import_string(manager_path)(plugins)
+    expires_at = now + settings.EXTENSIONS_MANAGER_CACHE_TIMEOUT
+    _managers_cache[key] = (version, expires_at, manager)
+    return manager
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import logging
 from dataclasses import dataclass
@@ -26,7 +27,7 @@ META_CODE_KEY = "avatax.code"
 META_DESCRIPTION_KEY = "avatax.description"
 CACHE_TIME = 60 * 60  # 1 hour
 TAX_CODES_CACHE_TIME = 60 * 60 * 24 * 7  # 7 days
-CACHE_KEY = "avatax_request_id_"
+CACHE_KEY = "avatax_request_"
 TAX_CODES_CACHE_KEY = "avatax_tax_codes_cache_key"
 TIMEOUT = 10  # API HTTP Requests Timeout
 
@@ -131,45 +132,25 @@ def _validate_checkout(checkout: "Checkout") -> bool:
     )
 
 
-def _retrieve_from_cache(token):
-    taxes_cache_key = CACHE_KEY + token
-    cached_data = cache.get(taxes_cache_key)
-    return cached_data
+def get_request_digest(data: Dict[str, Any]) -> str:
+    """Return a stable hash of the normalized request data.
 
-
-def checkout_needs_new_fetch(data, checkout_token: str) -> bool:
-    """Check if avatax's checkout response is cached or not.
-
-    We store the response from avatax for checkout object for given time. If object
-    doesn't exist in cache or something has changed, then we fetch data from avatax.
+    Sales orders are estimates which aren't recorded by Avatax, so their code and
+    the customer's email are left out and identical requests made for different
+    checkouts share the response.
     """
+    transaction = dict(data.get("createTransactionModel", {}))
+    if transaction.get("type") == TransactionType.ORDER:
+        transaction.pop("code", None)
+        transaction.pop("email", None)
+    normalized_data = json.dumps(
+        transaction, sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(normalized_data.encode("utf-8")).hexdigest()
 
-    cached_checkout = _retrieve_from_cache(checkout_token)
-
-    if not cached_checkout:
-        return True
-
-    cached_request_data, cached_response = cached_checkout
-    if data != cached_request_data:
-        return True
-    return False
-
-
-def taxes_need_new_fetch(data: Dict[str, Any], taxes_token: str) -> bool:
-    """Check if Avatax's taxes data need to be refetched.
-
-    The response from Avatax is stored in a cache. If an object doesn't exist in cache
-    or something has changed, taxes need to be refetched.
-    """
-    cached_data = _retrieve_from_cache(taxes_token)
-
-    if not cached_data:
-        return True
 
-    cached_request_data, _ = cached_data
-    if data != cached_request_data:
-        return True
-    return False
+def get_request_cache_key(data: Dict[str, Any]) -> str:
+    return CACHE_KEY + get_request_digest(data)
 
 
 def append_line_to_data(
@@ -364,29 +345,25 @@ def _fetch_new_taxes_data(
     )
     response = api_post_request(transaction_url, data, config)
     if response and "error" not in response:
-        cache.set(data_cache_key, (data, response), CACHE_TIME)
+        cache.set(data_cache_key, response, CACHE_TIME)
     else:
         # cache failed response to limit hits to avatax.
-        cache.set(data_cache_key, (data, response), 10)
+        cache.set(data_cache_key, response, 10)
     return response
 
 
 def get_cached_response_or_fetch(
-    data: Dict[str, Dict],
-    token_in_cache: str,
-    config: AvataxConfiguration,
-    force_refresh: bool = False,
+    data: Dict[str, Dict], config: AvataxConfiguration, force_refresh: bool = False
 ):
     """Try to find response in cache.
 
-    Return cached response if requests data are the same. Fetch new data in other cases.
+    Responses are cached under the digest of the request data, so a cached response
+    is returned for the same request. Fetch new data in other cases.
     """
-    data_cache_key = CACHE_KEY + token_in_cache
-    if taxes_need_new_fetch(data, token_in_cache) or force_refresh:
+    data_cache_key = get_request_cache_key(data)
+    response = None if force_refresh else cache.get(data_cache_key)
+    if response is None:
         response = _fetch_new_taxes_data(data, data_cache_key, config)
-    else:
-        _, response = cache.get(data_cache_key)
-
     return response
 
 
@@ -394,7 +371,7 @@ def get_checkout_tax_data(
     checkout: "Checkout", discounts, config: AvataxConfiguration
 ) -> Dict[str, Any]:
     data = generate_request_data_from_checkout(checkout, config, discounts=discounts)
-    return get_cached_response_or_fetch(data, str(checkout.token), config)
+    return get_cached_response_or_fetch(data, config)
 
 
 def get_order_tax_data(
@@ -415,10 +392,7 @@ def get_order_tax_data(
         config=config,
         currency=order.total.currency,
     )
-    response = get_cached_response_or_fetch(
-        data, "order_%s" % order.token, config, force_refresh
-    )
-    return response
+    return get_cached_response_or_fetch(data, config, force_refresh)
 
 
 def generate_tax_codes_dict(response: Dict[str, Any]) -> Dict[str, str]:
@@ -285,6 +285,34 @@ class AvataxPlugin(BasePlugin):
 
         return base_total
 
+    def calculate_checkout_lines_totals(
+        self,
+        checkout: "Checkout",
+        lines: List["CheckoutLine"],
+        discounts: Iterable[DiscountInfo],
+        previous_value: List[TaxedMoney],
+    ) -> List[TaxedMoney]:
+        if all(self._skip_plugin(line_total) for line_total in previous_value):
+            return previous_value
+        if not _validate_checkout(checkout):
+            return previous_value
+
+        taxes_data = get_checkout_tax_data(checkout, discounts, self.config)
+        currency = taxes_data.get("currencyCode")
+        tax_lines = {line.get("itemCode"): line for line in taxes_data.get("lines", [])}
+        totals = []
+        for checkout_line, line_total in zip(lines, previous_value):
+            tax_line = tax_lines.get(checkout_line.variant.sku)
+            if self._skip_plugin(line_total) or tax_line is None:
+                totals.append(line_total)
+                continue
+            tax = Decimal(tax_line.get("tax", 0.0))
+            line_net = Decimal(tax_line["lineAmount"])
+            line_gross = Money(amount=line_net + tax, currency=currency)
+            line_net = Money(amount=line_net, currency=currency)
+            totals.append(TaxedMoney(net=line_net, gross=line_gross))
+        return totals
+
     def _calculate_order_line_unit(self, order_line):
         order = order_line.order
         taxes_data = get_order_tax_data(order, self.config)
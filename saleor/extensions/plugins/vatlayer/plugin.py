@@ -9,6 +9,7 @@ from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 
 from ....checkout import calculations
 from ....core.taxes import TaxType
+from ....discount.utils import calculate_variants_prices
 from ....graphql.core.utils.error_codes import ExtensionsErrorCode
 from ...base_plugin import BasePlugin
 from . import (
@@ -140,6 +141,28 @@ class VatlayerPlugin(BasePlugin):
             * checkout_line.quantity
         )
 
+    def calculate_checkout_lines_totals(
+        self,
+        checkout: "Checkout",
+        lines: List["CheckoutLine"],
+        discounts: List["DiscountInfo"],
+        previous_value: List[TaxedMoney],
+    ) -> List[TaxedMoney]:
+        address = checkout.shipping_address or checkout.billing_address
+        country = address.country if address else None
+        prices = calculate_variants_prices([line.variant for line in lines], discounts)
+        totals = []
+        for line, line_total in zip(lines, previous_value):
+            if self._skip_plugin(line_total):
+                totals.append(line_total)
+                continue
+            price = prices[line.variant_id]
+            totals.append(
+                self.__apply_taxes_to_product(line.variant.product, price, country)
+                * line.quantity
+            )
+        return totals
+
     def calculate_order_line_unit(
         self, order_line: "OrderLine", previous_value: TaxedMoney
     ) -> TaxedMoney:
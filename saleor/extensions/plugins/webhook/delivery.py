@@ -0,0 +1,130 @@
+"""Delivery of webhook payloads over pooled keep-alive connections.
+
+Deliveries of an event are grouped by the host of their target URLs. The groups
+are sent concurrently, with at most `WEBHOOK_MAX_CONCURRENT_DELIVERIES` hosts at
+once, and the payloads of a group are sent one after another over a connection
+kept alive by the session of the host. Sessions are reused by all the events
+delivered by the process, so the TLS handshake is made once per host.
+"""
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from ....site.models import Site
+from . import create_webhook_headers
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_TIMEOUT = 10
+
+_sessions: Dict[Tuple[str, str], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+@dataclass
+class WebhookDelivery:
+    webhook_id: int
+    target_url: str
+    secret_key: Optional[str]
+    event_type: str
+    data: str
+
+
+def get_host_key(target_url: str) -> Tuple[str, str]:
+    url = urlsplit(target_url)
+    return url.scheme, url.netloc
+
+
+def get_session(target_url: str) -> requests.Session:
+    """Return the session keeping the connections to the host of the URL alive."""
+    host_key = get_host_key(target_url)
+    with _sessions_lock:
+        session = _sessions.get(host_key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=settings.WEBHOOK_MAX_CONCURRENT_DELIVERIES,
+            )
+            session.mount(f"{host_key[0]}://", adapter)
+            _sessions[host_key] = session
+    return session
+
+
+def send_webhook_delivery(delivery: WebhookDelivery, domain: Optional[str] = None):
+    """Send the payload to the target URL, signed with the secret key if set.
+
+    Raise `RequestException` when the payload couldn't be delivered.
+    """
+    headers = create_webhook_headers(
+        delivery.event_type, delivery.data, delivery.secret_key, domain=domain
+    )
+    response = get_session(delivery.target_url).post(
+        delivery.target_url,
+        data=delivery.data,
+        headers=headers,
+        timeout=WEBHOOK_TIMEOUT,
+    )
+    response.raise_for_status()
+    logger.debug(
+        f"[Webhook ID:{delivery.webhook_id}] Payload sent to {delivery.target_url} "
+        f"for event {delivery.event_type}"
+    )
+
+
+def _send_host_deliveries(
+    deliveries: List[WebhookDelivery], domain: str
+) -> List[WebhookDelivery]:
+    failed = []
+    for delivery in deliveries:
+        try:
+            send_webhook_delivery(delivery, domain=domain)
+        except RequestException:
+            logger.warning(
+                f"[Webhook ID:{delivery.webhook_id}] Failed to send payload to "
+                f"{delivery.target_url} for event {delivery.event_type}",
+                exc_info=True,
+            )
+            failed.append(delivery)
+    return failed
+
+
+def send_webhook_deliveries(
+    deliveries: Iterable[WebhookDelivery], domain: Optional[str] = None
+) -> List[WebhookDelivery]:
+    """Send the deliveries concurrently, grouped by the host of their targets.
+
+    Return the deliveries that failed.
+    """
+    deliveries_by_host: Dict[Tuple[str, str], List[WebhookDelivery]] = defaultdict(list)
+    for delivery in deliveries:
+        deliveries_by_host[get_host_key(delivery.target_url)].append(delivery)
+    if not deliveries_by_host:
+        return []
+
+    # The domain is fetched upfront, so the sending threads don't use the database
+    if domain is None:
+        domain = Site.objects.get_current().domain
+    if len(deliveries_by_host) == 1:
+        (host_deliveries,) = deliveries_by_host.values()
+        return _send_host_deliveries(host_deliveries, domain)
+
+    max_workers = min(
+        settings.WEBHOOK_MAX_CONCURRENT_DELIVERIES, len(deliveries_by_host)
+    )
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            _send_host_deliveries,
+            deliveries_by_host.values(),
+            [domain] * len(deliveries_by_host),
+        )
+        return [delivery for failed in results for delivery in failed]
@@ -1,54 +1,77 @@
 import logging
 
-import requests
+from django.db import transaction
+from django.db.models import Model
 from requests.exceptions import RequestException
 
 from ....celeryconf import app
-from ....webhook.event_types import WebhookEventType
-from ....webhook.models import Webhook
-from . import create_webhook_headers
+from ....webhook.payloads import generate_event_payload
+from ....webhook.utils import get_webhooks_for_event, is_event_subscribed
+from .delivery import WebhookDelivery, send_webhook_deliveries, send_webhook_delivery
 
 logger = logging.getLogger(__name__)
 
-WEBHOOK_TIMEOUT = 10
+# Number of seconds before the first retry of a failed delivery
+WEBHOOK_RETRY_BACKOFF = 60
+
+
+def trigger_webhooks_for_instance(event_type: str, instance: Model):
+    """Schedule sending the payload of the event to the subscribed webhooks.
+
+    Only the ID of the instance is passed to the worker, which generates the payload
+    once the current transaction is committed.
+    """
+    if not is_event_subscribed(event_type):
+        return
+    object_id = str(instance.pk)
+    transaction.on_commit(
+        lambda: trigger_webhooks_for_object.delay(event_type, object_id)
+    )
+
+
+@app.task
+def trigger_webhooks_for_object(event_type, object_id):
+    """Send the payload of the event for the object to the subscribed webhooks.
+
+    The payload is generated once and shared by all the webhooks.
+    """
+    data = generate_event_payload(event_type, object_id)
+    if data is None:
+        logger.warning(f"Object {object_id} of event {event_type} doesn't exist")
+        return
+    trigger_webhooks_for_event(event_type, data)
 
 
 @app.task
 def trigger_webhooks_for_event(event_type, data):
-    permissions = {}
-    required_permission = WebhookEventType.PERMISSIONS[event_type].value
-    if required_permission:
-        app_label, codename = required_permission.split(".")
-        permissions["service_account__permissions__content_type__app_label"] = app_label
-        permissions["service_account__permissions__codename"] = codename
-
-    webhooks = Webhook.objects.filter(
-        is_active=True,
-        service_account__is_active=True,
-        events__event_type__in=[event_type, WebhookEventType.ANY],
-        **permissions,
-    )
-    webhooks = webhooks.select_related("service_account").prefetch_related(
-        "service_account__permissions__content_type"
-    )
+    deliveries = [
+        WebhookDelivery(
+            webhook.webhook_id, webhook.target_url, webhook.secret_key, event_type, data
+        )
+        for webhook in get_webhooks_for_event(event_type)
+    ]
+    failed_deliveries = send_webhook_deliveries(deliveries)
 
-    for webhook in webhooks:
-        send_webhook_request.delay(
-            webhook.pk, webhook.target_url, webhook.secret_key, event_type, data
+    # Failed deliveries are retried one by one, with an increasing backoff
+    for delivery in failed_deliveries:
+        send_webhook_request.apply_async(
+            (
+                delivery.webhook_id,
+                delivery.target_url,
+                delivery.secret_key,
+                delivery.event_type,
+                delivery.data,
+            ),
+            countdown=WEBHOOK_RETRY_BACKOFF,
         )
 
 
 @app.task(
     autoretry_for=(RequestException,),
-    retry_backoff=60,
+    retry_backoff=WEBHOOK_RETRY_BACKOFF,
     retry_kwargs={"max_retries": 15},
 )
 def send_webhook_request(webhook_id, target_url, secret, event_type, data):
-    headers = create_webhook_headers(event_type, data, secret)
-    response = requests.post(
-        target_url, data=data, headers=headers, timeout=WEBHOOK_TIMEOUT
-    )
-    response.raise_for_status()
-    logger.debug(
-        f"[Webhook ID:{webhook_id}] Payload sent to {target_url} for event {event_type}"
+    send_webhook_delivery(
+        WebhookDelivery(webhook_id, target_url, secret, event_type, data)
     )
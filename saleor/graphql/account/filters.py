@@ -2,6 +2,7 @@ import django_filters
 from django.db.models import Count, Sum
 
 from ...account.models import ServiceAccount, User
+from ...search.backends import picker
 from ..core.filters import EnumFilter, ObjectTypeFilter
 from ..core.types.common import DateRangeInput, IntRangeInput, PriceRangeInput
 from ..utils import filter_by_query_param, filter_range_field
@@ -35,17 +36,9 @@ def filter_status(qs, _, value):
 
 
 def filter_staff_search(qs, _, value):
-    search_fields = (
-        "email",
-        "first_name",
-        "last_name",
-        "default_shipping_address__first_name",
-        "default_shipping_address__last_name",
-        "default_shipping_address__city",
-        "default_shipping_address__country",
-    )
     if value:
-        qs = filter_by_query_param(qs, value, search_fields)
+        search = picker.pick_user_search_backend()
+        qs = search(qs, value)
     return qs
 
 
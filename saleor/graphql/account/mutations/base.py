@@ -11,6 +11,7 @@ from ....account.emails import (
     send_user_password_reset_email_with_url,
 )
 from ....account.error_codes import AccountErrorCode
+from ....account.search import update_user_search_document
 from ....core.permissions import AccountPermissions
 from ....core.utils.url import validate_storefront_url
 from ....order.utils import match_orders_with_new_user
@@ -267,6 +268,10 @@ class BaseAddressUpdate(ModelMutation):
         address = info.context.extensions.change_user_address(
             response.address, None, user
         )
+        if user and user.default_shipping_address_id == address.pk:
+            # The default shipping address is a part of the user's search document
+            user.default_shipping_address = address
+            update_user_search_document(user)
         response.user = user
         response.address = address
         return response
@@ -2,6 +2,7 @@ import graphene
 
 from ....account import models
 from ....core.permissions import AccountPermissions, get_permissions
+from ....webhook.cache import invalidate_webhooks_cache
 from ...core.enums import PermissionEnum
 from ...core.mutations import ModelDeleteMutation, ModelMutation
 from ...core.types.common import AccountError
@@ -131,6 +132,12 @@ class ServiceAccountUpdate(ModelMutation):
             cleaned_input["permissions"] = get_permissions(cleaned_input["permissions"])
         return cleaned_input
 
+    @classmethod
+    def _save_m2m(cls, info, instance, cleaned_data):
+        super()._save_m2m(info, instance, cleaned_data)
+        # Permissions decide which events the webhooks of the account receive
+        invalidate_webhooks_cache()
+
 
 class ServiceAccountDelete(ModelDeleteMutation):
     class Arguments:
@@ -12,11 +12,8 @@ from ...account import models
 from ...core.permissions import AccountPermissions
 from ...payment import gateway
 from ...payment.utils import fetch_customer_id
-from ..utils import (
-    filter_by_query_param,
-    get_user_or_service_account_from_context,
-    sort_queryset,
-)
+from ...search.backends import picker
+from ..utils import get_user_or_service_account_from_context, sort_queryset
 from .sorters import (
     PermissionGroupSortingInput,
     ServiceAccountSortField,
@@ -26,15 +23,12 @@ from .sorters import (
 from .types import AddressValidationData, ChoiceValue
 from .utils import get_allowed_fields_camel_case, get_required_fields_camel_case
 
-USER_SEARCH_FIELDS = (
-    "email",
-    "first_name",
-    "last_name",
-    "default_shipping_address__first_name",
-    "default_shipping_address__last_name",
-    "default_shipping_address__city",
-    "default_shipping_address__country",
-)
+
+def search_users(qs: QuerySet, query: Optional[str]) -> QuerySet:
+    if query:
+        search = picker.pick_user_search_backend()
+        qs = search(qs, query)
+    return qs
 
 
 def sort_users(qs: QuerySet, sort_by: UserSortingInput) -> QuerySet:
@@ -45,9 +39,7 @@ def sort_users(qs: QuerySet, sort_by: UserSortingInput) -> QuerySet:
 
 def resolve_customers(info, query, sort_by=None, **_kwargs):
     qs = models.User.objects.customers()
-    qs = filter_by_query_param(
-        queryset=qs, query=query, search_fields=USER_SEARCH_FIELDS
-    )
+    qs = search_users(qs, query)
     qs = sort_users(qs, sort_by)
     qs = qs.distinct()
     return gql_optimizer.query(qs, info)
@@ -61,9 +53,7 @@ def resolve_permission_groups(info, query, sort_by=None, **_kwargs):
 
 def resolve_staff_users(info, query, sort_by=None, **_kwargs):
     qs = models.User.objects.staff()
-    qs = filter_by_query_param(
-        queryset=qs, query=query, search_fields=USER_SEARCH_FIELDS
-    )
+    qs = search_users(qs, query)
     qs = sort_users(qs, sort_by)
     qs = qs.distinct()
     return gql_optimizer.query(qs, info)
@@ -46,6 +46,14 @@ class CountableConnection(NonNullConnection):
 
     @staticmethod
     def resolve_total_count(root, *_args, **_kwargs):
+        # Connections are paginated without counting the items, count them only
+        # when the total is requested
+        if getattr(root, "length", None) is None:
+            iterable = root.iterable
+            if isinstance(iterable, QuerySet):
+                root.length = iterable.count()
+            else:
+                root.length = len(iterable)
         return root.length
 
 
@@ -0,0 +1,67 @@
+from collections import defaultdict
+from typing import Dict, Generic, Hashable, Iterable, List, TypeVar, Union
+
+from promise import Promise
+from promise.dataloader import DataLoader as BaseLoader
+
+K = TypeVar("K")
+R = TypeVar("R")
+
+
+class DataLoader(BaseLoader, Generic[K, R]):
+    """Request-scoped data loader.
+
+    Loaders are instantiated with the GraphQL context (the current request) and
+    there is exactly one instance of every loader class per request. This means
+    that all resolvers executed within a single request share the loader's batch
+    queue and its cache, so `N` calls to `load` made while resolving a list of
+    nodes result in a single call to `batch_load`.
+
+    Subclasses have to define a unique `context_key` and implement `batch_load`
+    which receives a list of keys and has to return a list of results (or
+    a promise resolving to such list) of the same length and in the same order.
+    """
+
+    context_key: str = None  # type: ignore
+    context = None
+
+    def __new__(cls, context):
+        key = cls.context_key
+        if key is None:
+            raise TypeError("Data loader %r does not define a context key" % (cls,))
+        if not hasattr(context, "dataloaders"):
+            context.dataloaders = {}
+        if key not in context.dataloaders:
+            context.dataloaders[key] = super().__new__(cls)
+        loader = context.dataloaders[key]
+        assert isinstance(loader, cls)
+        return loader
+
+    def __init__(self, context):
+        if self.context != context:
+            self.context = context
+            super().__init__()
+
+    def batch_load_fn(  # pylint: disable=method-hidden
+        self, keys: Iterable[K]
+    ) -> Promise[List[R]]:
+        results = self.batch_load(list(keys))
+        if not isinstance(results, Promise):
+            return Promise.resolve(results)
+        return results
+
+    def batch_load(self, keys: List[K]) -> Union[Promise[List[R]], List[R]]:
+        raise NotImplementedError()
+
+
+def group_by_key(
+    keys: Iterable[Hashable], pairs: Iterable[tuple]
+) -> List[list]:
+    """Group `(key, value)` pairs into lists of values ordered by the given keys.
+
+    Helper for one-to-many loaders; keys that have no values get an empty list.
+    """
+    grouped: Dict[Hashable, list] = defaultdict(list)
+    for key, value in pairs:
+        grouped[key].append(value)
+    return [grouped.get(key, []) for key in keys]
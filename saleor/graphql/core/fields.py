@@ -7,9 +7,11 @@ from django_prices.models import MoneyField, TaxedMoneyField
 from graphene.relay import PageInfo
 from graphene_django.converter import convert_django_field
 from graphene_django.fields import DjangoConnectionField
+from graphene_django.utils import maybe_queryset
 from graphql_relay.connection.arrayconnection import connection_from_list_slice
 from promise import Promise
 
+from .pagination import connection_from_queryset_keyset, connection_from_queryset_slice
 from .types.common import Weight
 from .types.money import Money, TaxedMoney
 
@@ -61,6 +63,35 @@ def convert_field_measurements(*_args):
     return graphene.Field(Weight)
 
 
+def resolve_connection(connection, args, iterable, keyset_pagination=False):
+    """Paginate the iterable without counting it.
+
+    The total count is computed only if `totalCount` is requested,
+    see `CountableConnection.resolve_total_count`.
+    """
+    iterable = maybe_queryset(iterable)
+    if isinstance(iterable, QuerySet):
+        if keyset_pagination:
+            connection = connection_from_queryset_keyset(connection, args, iterable)
+        else:
+            connection = connection_from_queryset_slice(connection, args, iterable)
+    else:
+        _len = len(iterable)
+        connection = connection_from_list_slice(
+            iterable,
+            args,
+            slice_start=0,
+            list_length=_len,
+            list_slice_length=_len,
+            connection_type=connection,
+            edge_type=connection.Edge,
+            pageinfo_type=PageInfo,
+        )
+        connection.length = _len
+    connection.iterable = iterable
+    return connection
+
+
 class PrefetchingConnectionField(BaseDjangoConnectionField):
     @classmethod
     def connection_resolver(
@@ -97,29 +128,22 @@ class PrefetchingConnectionField(BaseDjangoConnectionField):
 
     @classmethod
     def resolve_connection(cls, connection, args, iterable):
-        if isinstance(iterable, QuerySet):
-            _len = iterable.count()
-        else:
-            _len = len(iterable)
-
-        connection = connection_from_list_slice(
-            iterable,
-            args,
-            slice_start=0,
-            list_length=_len,
-            list_slice_length=_len,
-            connection_type=connection,
-            edge_type=connection.Edge,
-            pageinfo_type=PageInfo,
-        )
-        connection.iterable = iterable
-        connection.length = _len
-        return connection
+        return resolve_connection(connection, args, iterable)
 
 
 class FilterInputConnectionField(BaseDjangoConnectionField):
+    """Connection field filtered with a filterset given as an input object.
+
+    Passing `keyset_pagination=True` makes the field support cursors holding the
+    values of the sort keys instead of offsets, so paging deep into large lists
+    doesn't require scanning all the preceding rows. This is meant for big,
+    frequently paginated lists and requires the resolver to return a queryset.
+    Offset cursors are still accepted, see `connection_from_queryset_keyset`.
+    """
+
     def __init__(self, *args, **kwargs):
         self.filter_field_name = kwargs.pop("filter_field_name", "filter")
+        self.keyset_pagination = kwargs.pop("keyset_pagination", False)
         self.filter_input = kwargs.get(self.filter_field_name)
         self.filterset_class = None
         if self.filter_input:
@@ -137,6 +161,7 @@ class FilterInputConnectionField(BaseDjangoConnectionField):
         enforce_first_or_last,
         filterset_class,
         filters_name,
+        keyset_pagination,
         root,
         info,
         **args,
@@ -181,7 +206,12 @@ class FilterInputConnectionField(BaseDjangoConnectionField):
         # but iterable might be promise
         iterable = queryset_resolver(connection, iterable, info, args)
 
-        on_resolve = partial(cls.resolve_connection, connection, args)
+        on_resolve = partial(
+            cls.resolve_connection,
+            connection,
+            args,
+            keyset_pagination=keyset_pagination,
+        )
 
         filter_input = args.get(filters_name)
 
@@ -199,4 +229,9 @@ class FilterInputConnectionField(BaseDjangoConnectionField):
             super().get_resolver(parent_resolver),
             self.filterset_class,
             self.filter_field_name,
+            self.keyset_pagination,
         )
+
+    @classmethod
+    def resolve_connection(cls, connection, args, iterable, keyset_pagination=False):
+        return resolve_connection(connection, args, iterable, keyset_pagination)
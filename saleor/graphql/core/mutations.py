@@ -17,6 +17,7 @@ from graphql_jwt import ObtainJSONWebToken, Verify
 from graphql_jwt.exceptions import JSONWebTokenError, PermissionDenied
 
 from ...account import models
+from ...core.response_cache import invalidate_response_cache_for_model
 from ..account.types import User
 from ..utils import get_nodes
 from .types import Error, Upload
@@ -556,6 +557,7 @@ class BaseBulkMutation(BaseMutation):
         if count:
             qs = instance_model.objects.filter(pk__in=clean_instance_ids)
             cls.bulk_action(queryset=qs, **data)
+            invalidate_response_cache_for_model(instance_model)
         return count, errors
 
     @classmethod
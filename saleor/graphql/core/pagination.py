@@ -0,0 +1,298 @@
+"""Pagination of querysets exposed as Relay connections.
+
+Two strategies are implemented here:
+
+* offset pagination, with cursors storing the position of the node in the list;
+  it is compatible with every queryset but paging deep into a list requires
+  the database to scan all the preceding rows,
+* keyset pagination, with cursors storing the values of the sort keys of the
+  node; the next page is fetched by filtering on those values, so its cost
+  doesn't depend on how deep the page is.
+
+Keyset cursors have their own prefix, so connections supporting keyset
+pagination keep accepting offset cursors and paginate them by offset. First pages
+return keyset cursors only if the `KEYSET_PAGINATION_ENABLED` setting is on.
+
+Neither strategy counts the rows of the queryset, the count is only computed when
+`totalCount` is resolved (see `CountableConnection`).
+"""
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Expression, F, Q, QuerySet
+from django.db.models.expressions import OrderBy
+from graphene.relay import PageInfo
+from graphql.error import GraphQLError
+from graphql_relay.connection.arrayconnection import (
+    connection_from_list_slice,
+    get_offset_with_default,
+)
+from graphql_relay.utils import base64, unbase64
+
+KEYSET_CURSOR_PREFIX = "keyset:"
+KEYSET_CURSOR_ANNOTATION = "_cursor_key_{}"
+
+
+class KeysetCursorEncoder(DjangoJSONEncoder):
+    """Encode datetimes without truncating them to milliseconds.
+
+    Cursor values are compared with the database values, so they have to keep
+    their full precision.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+@dataclass
+class SortKey:
+    """A single expression of the queryset ordering."""
+
+    expression: Expression
+    descending: bool
+    nulls_first: bool
+    nullable: bool = True
+
+    def reversed(self) -> "SortKey":
+        return SortKey(
+            self.expression, not self.descending, not self.nulls_first, self.nullable
+        )
+
+
+def connection_from_queryset_slice(connection_type, args, queryset: QuerySet):
+    """Return an offset paginated connection, fetching only the requested page.
+
+    The queryset is only counted when paginating backward from the end of the
+    list, as the offset of the last page is unknown otherwise.
+    """
+    first = args.get("first")
+    last = args.get("last")
+    before = args.get("before")
+    after = args.get("after")
+
+    if isinstance(last, int) and not before:
+        length = queryset.count()
+        connection = connection_from_list_slice(
+            queryset,
+            args,
+            slice_start=0,
+            list_length=length,
+            list_slice_length=length,
+            connection_type=connection_type,
+            edge_type=connection_type.Edge,
+            pageinfo_type=PageInfo,
+        )
+        connection.length = length
+        return connection
+
+    start = get_offset_with_default(after, -1) + 1
+    stop = get_offset_with_default(before, None) if before else None
+    if isinstance(first, int):
+        # Fetch one extra node to know whether there is a next page
+        stop = min(stop, start + first + 1) if stop is not None else start + first + 1
+    if isinstance(last, int) and stop is not None:
+        start = max(start, stop - last)
+
+    nodes = list(queryset[start:stop]) if stop is None or stop > start else []
+    connection = connection_from_list_slice(
+        nodes,
+        args,
+        slice_start=start,
+        list_length=start + len(nodes),
+        list_slice_length=len(nodes),
+        connection_type=connection_type,
+        edge_type=connection_type.Edge,
+        pageinfo_type=PageInfo,
+    )
+    connection.length = None if stop is not None else start + len(nodes)
+    return connection
+
+
+def _get_ordering(queryset: QuerySet) -> List[Any]:
+    query = queryset.query
+    if query.order_by:
+        return list(query.order_by)
+    if query.default_ordering:
+        return list(query.get_meta().ordering)
+    return []
+
+
+def _is_nullable(queryset: QuerySet, expression: Expression) -> bool:
+    if not isinstance(expression, F):
+        return True
+    if expression.name == "pk":
+        return False
+    try:
+        return queryset.model._meta.get_field(expression.name).null
+    except FieldDoesNotExist:
+        # Annotations and lookups spanning relations
+        return True
+
+
+def get_sort_keys(queryset: QuerySet) -> Optional[List[SortKey]]:
+    """Return the keys the queryset is sorted by, the primary key being the last.
+
+    `None` is returned when the ordering uses a construct that can't be compared
+    with a cursor, like random ordering.
+    """
+    keys = []
+    for field in _get_ordering(queryset):
+        if isinstance(field, str):
+            if field == "?" or "." in field:
+                return None
+            descending = field.startswith("-")
+            expression = F(field.lstrip("-+"))
+            nulls_first = descending
+        elif isinstance(field, OrderBy):
+            expression = field.expression
+            descending = field.descending
+            if field.nulls_first or field.nulls_last:
+                nulls_first = bool(field.nulls_first)
+            else:
+                nulls_first = descending
+        elif isinstance(field, F):
+            expression, descending, nulls_first = field, False, False
+        else:
+            return None
+        nullable = _is_nullable(queryset, expression)
+        keys.append(SortKey(expression, descending, nulls_first, nullable))
+    keys.append(SortKey(F("pk"), False, False, False))
+
+    if not queryset.query.standard_ordering:
+        # The ordering of reversed querysets is flipped when the query is compiled
+        keys = [key.reversed() for key in keys]
+    return keys
+
+
+def encode_keyset_cursor(values: List[Any]) -> str:
+    return base64(KEYSET_CURSOR_PREFIX + json.dumps(values, cls=KeysetCursorEncoder))
+
+
+def is_keyset_cursor(cursor: str) -> bool:
+    try:
+        return unbase64(cursor).startswith(KEYSET_CURSOR_PREFIX)
+    except ValueError:
+        return False
+
+
+def decode_keyset_cursor(cursor: str, keys_count: int) -> List[Any]:
+    try:
+        value = unbase64(cursor)
+        if not value.startswith(KEYSET_CURSOR_PREFIX):
+            raise ValueError()
+        values = json.loads(value[len(KEYSET_CURSOR_PREFIX) :])
+    except ValueError:
+        raise GraphQLError(f"Received cursor {cursor} is invalid.")
+    if not isinstance(values, list) or len(values) != keys_count:
+        raise GraphQLError(
+            f"Received cursor {cursor} doesn't match the requested sorting."
+        )
+    return values
+
+
+def _filter_after(aliases: List[str], keys: List[SortKey], values: List[Any]) -> Q:
+    """Return the lookup matching rows sorted after the one with given key values.
+
+    Rows are compared lexicographically: a row comes after the cursor if its first
+    key comes after the cursor's one, or if the first keys are equal and the rest
+    of the keys come after.
+    """
+    lookup: Optional[Q] = None
+    for alias, key, value in reversed(list(zip(aliases, keys, values))):
+        if value is None:
+            after = Q(**{f"{alias}__isnull": False}) if key.nulls_first else None
+            equal = Q(**{f"{alias}__isnull": True})
+        else:
+            operator = "lt" if key.descending else "gt"
+            after = Q(**{f"{alias}__{operator}": value})
+            if key.nullable and not key.nulls_first:
+                after |= Q(**{f"{alias}__isnull": True})
+            equal = Q(**{alias: value})
+
+        if lookup is not None:
+            equal &= lookup
+            lookup = after | equal if after is not None else equal
+        else:
+            # The last key is the primary key, no two rows are equal on it
+            lookup = after if after is not None else Q(pk__in=[])
+    return lookup
+
+
+def connection_from_queryset_keyset(connection_type, args, queryset: QuerySet):
+    """Return a keyset paginated connection.
+
+    Cursors encode the values of the sort keys of their nodes. Requests sending
+    offset cursors, first pages when keyset pagination isn't enabled and
+    querysets sorted in a way that can't be expressed with keyset cursors fall back
+    to offset pagination.
+    """
+    first = args.get("first")
+    last = args.get("last")
+    before = args.get("before")
+    after = args.get("after")
+
+    cursors = [cursor for cursor in [after, before] if cursor]
+    if cursors:
+        use_keyset = all(is_keyset_cursor(cursor) for cursor in cursors)
+    else:
+        use_keyset = settings.KEYSET_PAGINATION_ENABLED
+    keys = get_sort_keys(queryset) if use_keyset else None
+    if keys is None:
+        return connection_from_queryset_slice(connection_type, args, queryset)
+
+    aliases = [KEYSET_CURSOR_ANNOTATION.format(index) for index in range(len(keys))]
+    qs = queryset.annotate(
+        **{alias: key.expression for alias, key in zip(aliases, keys)}
+    ).order_by(*_get_ordering(queryset), "pk")
+    if after:
+        values = decode_keyset_cursor(after, len(keys))
+        qs = qs.filter(_filter_after(aliases, keys, values))
+    if before:
+        values = decode_keyset_cursor(before, len(keys))
+        reversed_keys = [key.reversed() for key in keys]
+        qs = qs.filter(_filter_after(aliases, reversed_keys, values))
+
+    # Nodes matched by the cursors exist, so there are pages beyond them
+    has_previous_page = bool(after)
+    has_next_page = bool(before)
+    if isinstance(first, int):
+        # Fetch one extra node to know whether there is a next page
+        nodes = list(qs[: first + 1])
+        has_next_page = has_next_page or len(nodes) > first
+        nodes = nodes[:first]
+        if isinstance(last, int) and len(nodes) > last:
+            has_previous_page = True
+            nodes = nodes[len(nodes) - last :]
+    elif isinstance(last, int):
+        nodes = list(qs.reverse()[: last + 1])
+        has_previous_page = has_previous_page or len(nodes) > last
+        nodes = nodes[:last][::-1]
+    else:
+        nodes = list(qs)
+
+    edges = [
+        connection_type.Edge(
+            node=node,
+            cursor=encode_keyset_cursor([getattr(node, alias) for alias in aliases]),
+        )
+        for node in nodes
+    ]
+    connection = connection_type(
+        edges=edges,
+        page_info=PageInfo(
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+            has_previous_page=has_previous_page,
+            has_next_page=has_next_page,
+        ),
+    )
+    connection.length = None
+    return connection
+
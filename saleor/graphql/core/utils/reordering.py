@@ -6,6 +6,8 @@ from django.db import transaction
 from django.db.models import F, QuerySet
 from django.utils.functional import cached_property
 
+from ....core.response_cache import invalidate_response_cache_for_model
+
 __all__ = ["perform_reordering"]
 
 
@@ -172,3 +174,4 @@ def perform_reordering(qs: QuerySet, operations: Dict[int, int], field: str = "m
         raise RuntimeError("Needs to be run inside an atomic transaction")
 
     Reordering(qs, operations, field).run()
+    invalidate_response_cache_for_model(qs.model)
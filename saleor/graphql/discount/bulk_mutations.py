@@ -2,6 +2,7 @@ import graphene
 
 from ...core.permissions import DiscountPermissions
 from ...discount import models
+from ...discount.cache import invalidate_active_discounts_cache
 from ..core.mutations import ModelBulkDeleteMutation
 
 
@@ -16,6 +17,11 @@ class SaleBulkDelete(ModelBulkDeleteMutation):
         model = models.Sale
         permissions = (DiscountPermissions.MANAGE_DISCOUNTS,)
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        queryset.delete()
+        invalidate_active_discounts_cache()
+
 
 class VoucherBulkDelete(ModelBulkDeleteMutation):
     class Arguments:
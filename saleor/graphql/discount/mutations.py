@@ -2,8 +2,10 @@ import graphene
 from django.core.exceptions import ValidationError
 
 from ...core.permissions import DiscountPermissions
+from ...core.response_cache import ResponseCacheTag, invalidate_response_cache
 from ...core.utils.promo_code import generate_promo_code, is_available_promo_code
 from ...discount import models
+from ...discount.cache import invalidate_active_discounts_cache
 from ...discount.error_codes import DiscountErrorCode
 from ...product.tasks import (
     update_products_minimal_variant_prices_of_catalogues_task,
@@ -270,6 +272,8 @@ class SaleUpdateMinimalVariantPriceMixin:
     def success_response(cls, instance):
         # Update the "minimal_variant_prices" of the associated, discounted
         # products (including collections and categories).
+        # Catalogues of the sale are saved after the sale itself
+        invalidate_active_discounts_cache()
         update_products_minimal_variant_prices_of_discount_task.delay(instance.pk)
         return super().success_response(instance)
 
@@ -344,6 +348,8 @@ class SaleAddCatalogues(SaleBaseCatalogueMutation):
             info, data.get("id"), only_type=Sale, field="sale_id"
         )
         cls.add_catalogues_to_node(sale, data.get("input"))
+        invalidate_active_discounts_cache()
+        invalidate_response_cache(ResponseCacheTag.SALE)
         return SaleAddCatalogues(sale=sale)
 
 
@@ -360,4 +366,6 @@ class SaleRemoveCatalogues(SaleBaseCatalogueMutation):
             info, data.get("id"), only_type=Sale, field="sale_id"
         )
         cls.remove_catalogues_from_node(sale, data.get("input"))
+        invalidate_active_discounts_cache()
+        invalidate_response_cache(ResponseCacheTag.SALE)
         return SaleRemoveCatalogues(sale=sale)
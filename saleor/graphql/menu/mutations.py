@@ -120,6 +120,7 @@ class MenuCreate(ModelMutation):
         items = cleaned_data.get("items", [])
         for item in items:
             instance.items.create(**item)
+        update_menu(instance)
 
 
 class MenuUpdate(ModelMutation):
@@ -398,6 +399,7 @@ class MenuItemMove(BaseMutation):
             ordering_qs = sort_querysets[parent_pk]
             perform_reordering(ordering_qs, operations)
 
+        update_menu(menu)
         menu = qs.get(pk=menu.pk)
         return MenuItemMove(menu=menu)
 
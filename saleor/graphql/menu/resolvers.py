@@ -13,9 +13,8 @@ MENU_ITEM_SEARCH_FIELDS = ("name",)
 def resolve_menu(info, menu_id=None, name=None):
     assert menu_id or name, "No ID or name provided."
     if name is not None:
-        qs = models.Menu.objects.filter(name=name)
-        qs = gql_optimizer.query(qs, info)
-        return qs[0] if qs else None
+        # Items are served from the compiled menu content, so they aren't prefetched
+        return models.Menu.objects.filter(name=name).first()
     return graphene.Node.get_node_from_global_id(info, menu_id, Menu)
 
 
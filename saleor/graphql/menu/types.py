@@ -4,8 +4,10 @@ from django.db.models import Prefetch
 from graphene import relay
 
 from ...menu import models
+from ...menu.utils import get_compiled_menu_items
 from ..core.connection import CountableDjangoObjectType
 from ..translations.fields import TranslationField
+from ..translations.resolvers import resolve_translation
 from ..translations.types import MenuItemTranslation
 
 
@@ -34,6 +36,9 @@ class Menu(CountableDjangoObjectType):
     def resolve_items(root: models.Menu, _info, **_kwargs):
         if hasattr(root, "prefetched_items"):
             return root.prefetched_items  # type: ignore
+        compiled_items = get_compiled_menu_items(root)
+        if compiled_items is not None:
+            return compiled_items
         return root.items.filter(level=0)
 
 
@@ -42,7 +47,10 @@ class MenuItem(CountableDjangoObjectType):
         graphene.List(lambda: MenuItem), model_field="children"
     )
     url = graphene.String(description="URL to the menu item.")
-    translation = TranslationField(MenuItemTranslation, type_name="menu item")
+    # Resolved by `resolve_translation`, serving translations of compiled menus
+    translation = TranslationField(
+        MenuItemTranslation, type_name="menu item", resolver=None
+    )
 
     class Meta:
         description = (
@@ -64,8 +72,16 @@ class MenuItem(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_children(root: models.MenuItem, _info, **_kwargs):
+        if hasattr(root, "compiled_children"):
+            return root.compiled_children  # type: ignore
         return root.children.all()
 
+    @staticmethod
+    def resolve_translation(root: models.MenuItem, info, language_code):
+        if hasattr(root, "compiled_translations"):
+            return root.compiled_translations.get(language_code)  # type: ignore
+        return resolve_translation(root, info, language_code)
+
 
 class MenuItemMoveInput(graphene.InputObjectType):
     item_id = graphene.ID(description="The menu item ID to move.", required=True)
@@ -5,16 +5,17 @@ from ...order import OrderStatus, models
 from ...order.events import OrderEvents
 from ...order.models import OrderEvent
 from ...order.utils import sum_order_totals
-from ..utils import filter_by_period, filter_by_query_param, sort_queryset
+from ...search.backends import picker
+from ..utils import filter_by_period, sort_queryset
 from .enums import OrderStatusFilter
 from .sorters import OrderSortField
 from .types import Order
 
-ORDER_SEARCH_FIELDS = ("id", "discount_name", "token", "user_email", "user__email")
-
 
 def filter_orders(qs, info, created, status, query):
-    qs = filter_by_query_param(qs, query, ORDER_SEARCH_FIELDS)
+    if query:
+        search = picker.pick_order_search_backend()
+        qs = search(qs, query)
 
     # DEPRECATED: Will be removed in Saleor 2.11, use the `filter` field instead.
     # filter orders by status
@@ -97,6 +97,7 @@ class OrderQueries(graphene.ObjectType):
             ),
         ),
         description="List of orders.",
+        keyset_pagination=True,
     )
     draft_orders = FilterInputConnectionField(
         Order,
@@ -111,6 +112,7 @@ class OrderQueries(graphene.ObjectType):
             ),
         ),
         description="List of draft orders.",
+        keyset_pagination=True,
     )
     orders_total = graphene.Field(
         TaxedMoney,
@@ -1,6 +1,11 @@
 import graphene
 
 from ...core.permissions import PagePermissions
+from ...menu.utils import (
+    get_menu_ids_linked_to,
+    schedule_menus_update,
+    update_menus_linked_to,
+)
 from ...page import models
 from ..core.mutations import BaseBulkMutation, ModelBulkDeleteMutation
 
@@ -16,6 +21,13 @@ class PageBulkDelete(ModelBulkDeleteMutation):
         model = models.Page
         permissions = (PagePermissions.MANAGE_PAGES,)
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        # Menu items linked to the pages are deleted with them
+        menu_ids = get_menu_ids_linked_to(page__in=queryset)
+        queryset.delete()
+        schedule_menus_update(menu_ids)
+
 
 class PageBulkPublish(BaseBulkMutation):
     class Arguments:
@@ -34,3 +46,4 @@ class PageBulkPublish(BaseBulkMutation):
     @classmethod
     def bulk_action(cls, queryset, is_published):
         queryset.update(is_published=is_published)
+        update_menus_linked_to(page__in=queryset)
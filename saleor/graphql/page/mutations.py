@@ -2,11 +2,20 @@ import graphene
 from django.core.exceptions import ValidationError
 
 from ...core.permissions import PagePermissions
+from ...menu.utils import (
+    get_menu_ids_linked_to,
+    schedule_menus_update,
+    update_menus_linked_to,
+)
 from ...page import models
 from ...page.error_codes import PageErrorCode
 from ..core.mutations import ModelDeleteMutation, ModelMutation
 from ..core.types.common import PageError, SeoInput
-from ..core.utils import clean_seo_fields, validate_slug_and_generate_if_needed
+from ..core.utils import (
+    clean_seo_fields,
+    from_global_id_strict_type,
+    validate_slug_and_generate_if_needed,
+)
 
 
 class PageInput(graphene.InputObjectType):
@@ -66,6 +75,11 @@ class PageUpdate(PageCreate):
         error_type_class = PageError
         error_type_field = "page_errors"
 
+    @classmethod
+    def save(cls, info, instance, cleaned_input):
+        super().save(info, instance, cleaned_input)
+        update_menus_linked_to(page=instance)
+
 
 class PageDelete(ModelDeleteMutation):
     class Arguments:
@@ -77,3 +91,12 @@ class PageDelete(ModelDeleteMutation):
         permissions = (PagePermissions.MANAGE_PAGES,)
         error_type_class = PageError
         error_type_field = "page_errors"
+
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        page_pk = from_global_id_strict_type(data.get("id"), "Page", field="id")
+        # Menu items linked to the page are deleted with it
+        menu_ids = get_menu_ids_linked_to(page_id=page_pk)
+        response = super().perform_mutation(_root, info, **data)
+        schedule_menus_update(menu_ids)
+        return response
@@ -2,6 +2,7 @@ import graphene
 
 from ....core.permissions import ProductPermissions
 from ....product import models
+from ....product.attribute_index import invalidate_attribute_index
 from ...core.mutations import ModelBulkDeleteMutation
 from ...core.types.common import ProductError
 
@@ -19,6 +20,11 @@ class AttributeBulkDelete(ModelBulkDeleteMutation):
         error_type_class = ProductError
         error_type_field = "product_errors"
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        queryset.delete()
+        invalidate_attribute_index()
+
 
 class AttributeValueBulkDelete(ModelBulkDeleteMutation):
     class Arguments:
@@ -34,3 +40,8 @@ class AttributeValueBulkDelete(ModelBulkDeleteMutation):
         permissions = (ProductPermissions.MANAGE_PRODUCTS,)
         error_type_class = ProductError
         error_type_field = "product_errors"
+
+    @classmethod
+    def bulk_action(cls, queryset):
+        queryset.delete()
+        invalidate_attribute_index()
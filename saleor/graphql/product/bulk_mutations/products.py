@@ -5,8 +5,17 @@ from django.core.exceptions import ValidationError
 from django.db import transaction
 
 from ....core.permissions import ProductPermissions
+from ....menu.utils import (
+    get_menu_ids_linked_to,
+    schedule_menus_update,
+    update_menus_linked_to,
+)
 from ....product import models
 from ....product.error_codes import ProductErrorCode
+from ....product.search import (
+    update_product_search_vector,
+    update_products_search_vector_by_ids,
+)
 from ....product.tasks import update_product_minimal_variant_price_task
 from ....product.utils import delete_categories
 from ....product.utils.attributes import generate_name_for_variant
@@ -68,6 +77,13 @@ class CollectionBulkDelete(ModelBulkDeleteMutation):
         error_type_class = ProductError
         error_type_field = "product_errors"
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        # Menu items linked to the collections are deleted with them
+        menu_ids = get_menu_ids_linked_to(collection__in=queryset)
+        queryset.delete()
+        schedule_menus_update(menu_ids)
+
 
 class CollectionBulkPublish(BaseBulkMutation):
     class Arguments:
@@ -91,6 +107,7 @@ class CollectionBulkPublish(BaseBulkMutation):
     @classmethod
     def bulk_action(cls, queryset, is_published):
         queryset.update(is_published=is_published)
+        update_menus_linked_to(collection__in=queryset)
 
 
 class ProductBulkDelete(ModelBulkDeleteMutation):
@@ -287,6 +304,7 @@ class ProductVariantBulkCreate(BaseMutation):
 
         # Recalculate the "minimal variant price" for the parent product
         update_product_minimal_variant_price_task.delay(product.pk)
+        update_product_search_vector(product)
 
         return ProductVariantBulkCreate(
             count=len(instances), product_variants=instances
@@ -322,6 +340,14 @@ class ProductVariantBulkDelete(ModelBulkDeleteMutation):
         error_type_class = ProductError
         error_type_field = "product_errors"
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        product_ids = list(queryset.values_list("product_id", flat=True))
+        queryset.delete()
+        update_products_search_vector_by_ids(product_ids)
+        # Stocks of the variants were deleted along with them
+        warehouse_models.ProductStockSummary.objects.refresh(product_ids)
+
 
 class ProductVariantStocksCreate(BaseMutation):
     product_variant = graphene.Field(
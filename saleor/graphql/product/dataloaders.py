@@ -0,0 +1,182 @@
+from typing import List
+
+from ...product.models import (
+    AssignedProductAttribute,
+    AssignedVariantAttribute,
+    AttributeProduct,
+    AttributeVariant,
+    Category,
+    Collection,
+    CollectionProduct,
+    Product,
+    ProductImage,
+    ProductType,
+    ProductVariant,
+    VariantImage,
+)
+from ..core.dataloaders import DataLoader, group_by_key
+
+
+class ProductByIdLoader(DataLoader[int, Product]):
+    context_key = "product_by_id"
+
+    def batch_load(self, keys):
+        products = Product.objects.in_bulk(keys)
+        return [products.get(product_id) for product_id in keys]
+
+
+class ProductTypeByIdLoader(DataLoader[int, ProductType]):
+    context_key = "product_type_by_id"
+
+    def batch_load(self, keys):
+        product_types = ProductType.objects.in_bulk(keys)
+        return [product_types.get(product_type_id) for product_type_id in keys]
+
+
+class CategoryByIdLoader(DataLoader[int, Category]):
+    context_key = "category_by_id"
+
+    def batch_load(self, keys):
+        categories = Category.objects.in_bulk(keys)
+        return [categories.get(category_id) for category_id in keys]
+
+
+class ProductVariantByIdLoader(DataLoader[int, ProductVariant]):
+    context_key = "productvariant_by_id"
+
+    def batch_load(self, keys):
+        variants = ProductVariant.objects.in_bulk(keys)
+        return [variants.get(variant_id) for variant_id in keys]
+
+
+class ProductVariantsByProductIdLoader(DataLoader[int, List[ProductVariant]]):
+    context_key = "productvariants_by_product"
+
+    def batch_load(self, keys):
+        variants = (
+            ProductVariant.objects.filter(product_id__in=keys)
+            .select_related("product")
+            .order_by("pk")
+        )
+        variant_by_id_loader = ProductVariantByIdLoader(self.context)
+        for variant in variants:
+            variant_by_id_loader.prime(variant.id, variant)
+        return group_by_key(
+            keys, ((variant.product_id, variant) for variant in variants)
+        )
+
+
+class ImagesByProductIdLoader(DataLoader[int, List[ProductImage]]):
+    context_key = "images_by_product"
+
+    def batch_load(self, keys):
+        images = ProductImage.objects.filter(product_id__in=keys)
+        return group_by_key(keys, ((image.product_id, image) for image in images))
+
+
+class ImagesByProductVariantIdLoader(DataLoader[int, List[ProductImage]]):
+    context_key = "images_by_productvariant"
+
+    def batch_load(self, keys):
+        variant_images = (
+            VariantImage.objects.filter(variant_id__in=keys)
+            .select_related("image")
+            .order_by("image__sort_order", "image__pk")
+        )
+        return group_by_key(
+            keys,
+            (
+                (variant_image.variant_id, variant_image.image)
+                for variant_image in variant_images
+            ),
+        )
+
+
+class CollectionsByProductIdLoader(DataLoader[int, List[Collection]]):
+    context_key = "collections_by_product"
+
+    def batch_load(self, keys):
+        collection_products = (
+            CollectionProduct.objects.filter(product_id__in=keys)
+            .select_related("collection")
+            .order_by("collection__slug")
+        )
+        return group_by_key(
+            keys,
+            (
+                (collection_product.product_id, collection_product.collection)
+                for collection_product in collection_products
+            ),
+        )
+
+
+class AttributeProductsByProductTypeIdLoader(
+    DataLoader[int, List[AttributeProduct]]
+):
+    """Return the product attributes of product types visible to the current user."""
+
+    context_key = "attributeproducts_by_producttype"
+
+    def batch_load(self, keys):
+        attribute_products = (
+            AttributeProduct.objects.get_visible_to_user(self.context.user)
+            .filter(product_type_id__in=keys)
+            .select_related("attribute")
+        )
+        return group_by_key(
+            keys, ((ap.product_type_id, ap) for ap in attribute_products)
+        )
+
+
+class AttributeVariantsByProductTypeIdLoader(
+    DataLoader[int, List[AttributeVariant]]
+):
+    """Return the variant attributes of product types visible to the current user."""
+
+    context_key = "attributevariants_by_producttype"
+
+    def batch_load(self, keys):
+        attribute_variants = (
+            AttributeVariant.objects.get_visible_to_user(self.context.user)
+            .filter(product_type_id__in=keys)
+            .select_related("attribute")
+        )
+        return group_by_key(
+            keys, ((av.product_type_id, av) for av in attribute_variants)
+        )
+
+
+class AssignedProductAttributesByProductIdLoader(
+    DataLoader[int, List[AssignedProductAttribute]]
+):
+    context_key = "assignedproductattributes_by_product"
+
+    def batch_load(self, keys):
+        assigned_attributes = AssignedProductAttribute.objects.filter(
+            product_id__in=keys
+        ).prefetch_related("values")
+        return group_by_key(
+            keys,
+            (
+                (assigned.product_id, assigned)
+                for assigned in assigned_attributes
+            ),
+        )
+
+
+class AssignedVariantAttributesByProductVariantIdLoader(
+    DataLoader[int, List[AssignedVariantAttribute]]
+):
+    context_key = "assignedvariantattributes_by_productvariant"
+
+    def batch_load(self, keys):
+        assigned_attributes = AssignedVariantAttribute.objects.filter(
+            variant_id__in=keys
+        ).prefetch_related("values")
+        return group_by_key(
+            keys,
+            (
+                (assigned.variant_id, assigned)
+                for assigned in assigned_attributes
+            ),
+        )
@@ -6,6 +6,7 @@ import graphene
 from django.db.models import Q, Subquery, Sum
 from graphene_django.filter import GlobalIDFilter, GlobalIDMultipleChoiceFilter
 
+from ...product.attribute_index import get_attribute_pks, get_attribute_value_pks
 from ...product.filters import filter_products_by_attributes_values
 from ...product.models import (
     Attribute,
@@ -16,7 +17,7 @@ from ...product.models import (
     ProductVariant,
 )
 from ...search.backends import picker
-from ...warehouse.models import Stock
+from ...warehouse.models import ProductStockSummary
 from ..core.filters import EnumFilter, ListObjectTypeFilter, ObjectTypeFilter
 from ..core.types import FilterInputObjectType
 from ..core.types.common import IntRangeInput, PriceRangeInput
@@ -52,25 +53,25 @@ def filter_fields_containing_value(*search_fields: str):
 def _clean_product_attributes_filter_input(
     filter_value,
 ) -> Dict[int, List[Optional[int]]]:
-    attributes = Attribute.objects.prefetch_related("values")
-    attributes_map: Dict[str, int] = {
-        attribute.slug: attribute.pk for attribute in attributes
-    }
-    values_map: Dict[str, Dict[str, int]] = {
-        attr.slug: {value.slug: value.pk for value in attr.values.all()}
-        for attr in attributes
-    }
+    filter_value = list(filter_value)
+    attributes_map = get_attribute_pks(attr_name for attr_name, _ in filter_value)
+    for attr_name, _ in filter_value:
+        if attr_name not in attributes_map:
+            raise ValueError("Unknown attribute name: %r" % (attr_name,))
+    values_map = get_attribute_value_pks(
+        (attributes_map[attr_name], val_slug)
+        for attr_name, val_slugs in filter_value
+        for val_slug in val_slugs
+    )
     queries: Dict[int, List[Optional[int]]] = defaultdict(list)
     # Convert attribute:value pairs into a dictionary where
     # attributes are keys and values are grouped in lists
     for attr_name, val_slugs in filter_value:
-        if attr_name not in attributes_map:
-            raise ValueError("Unknown attribute name: %r" % (attr_name,))
         attr_pk = attributes_map[attr_name]
         attr_val_pk = [
-            values_map[attr_name][val_slug]
+            values_map[(attr_pk, val_slug)]
             for val_slug in val_slugs
-            if val_slug in values_map[attr_name]
+            if (attr_pk, val_slug) in values_map
         ]
         queries[attr_pk] += attr_val_pk
 
@@ -113,18 +114,11 @@ def filter_products_by_collections(qs, collections):
 
 
 def filter_products_by_stock_availability(qs, stock_availability):
-    total_stock = (
-        Stock.objects.select_related("product_variant")
-        .annotate_available_quantity()
-        .values("product_variant__product_id")
-        .annotate(total_quantity=Sum("available_quantity"))
-        .filter(total_quantity__lte=0)
-        .values_list("product_variant__product_id", flat=True)
-    )
+    out_of_stock = ProductStockSummary.objects.out_of_stock().values("product_id")
     if stock_availability == StockAvailability.IN_STOCK:
-        qs = qs.exclude(id__in=Subquery(total_stock))
+        qs = qs.exclude(id__in=Subquery(out_of_stock))
     elif stock_availability == StockAvailability.OUT_OF_STOCK:
-        qs = qs.filter(id__in=Subquery(total_stock))
+        qs = qs.filter(id__in=Subquery(out_of_stock))
     return qs
 
 
@@ -180,7 +174,11 @@ def filter_stock_availability(qs, _, value):
 def filter_search(qs, _, value):
     if value:
         search = picker.pick_backend()
-        qs &= search(value).distinct()
+        results = search(value).distinct()
+        if qs.query.order_by:
+            # Keep the requested sorting instead of the search ranking
+            results = results.order_by()
+        qs &= results
     return qs
 
 
@@ -7,8 +7,10 @@ from django.db.models import Q
 from django.template.defaultfilters import slugify
 
 from ....core.permissions import ProductPermissions
+from ....core.response_cache import ResponseCacheTag, invalidate_response_cache
 from ....product import AttributeInputType, models
 from ....product.error_codes import ProductErrorCode
+from ....product.tasks import update_products_search_vector_task
 from ...core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
 from ...core.types.common import ProductAttributeError, ProductError
 from ...core.utils import (
@@ -510,6 +512,7 @@ class AttributeUnassign(BaseMutation):
         # Commit
         cls.save_field_values(product_type, "product_attributes", attribute_pks)
         cls.save_field_values(product_type, "variant_attributes", attribute_pks)
+        invalidate_response_cache(ResponseCacheTag.ATTRIBUTE)
 
         return cls(product_type=product_type)
 
@@ -656,6 +659,14 @@ class AttributeValueUpdate(ModelMutation):
 
     @classmethod
     def success_response(cls, instance):
+        # Attribute values are a part of the products' search document
+        product_ids = list(
+            models.AssignedProductAttribute.objects.filter(
+                values=instance
+            ).values_list("product_id", flat=True)
+        )
+        if product_ids:
+            update_products_search_vector_task.delay(product_ids)
         response = super().success_response(instance)
         response.attribute = instance.attribute
         return response
@@ -674,8 +685,21 @@ class AttributeValueDelete(ModelDeleteMutation):
         error_type_class = ProductError
         error_type_field = "product_errors"
 
+    @classmethod
+    def clean_instance(cls, info, instance):
+        super().clean_instance(info, instance)
+        # Remember the products using the value before the assignments are gone
+        instance.affected_product_ids = list(
+            models.AssignedProductAttribute.objects.filter(
+                values=instance
+            ).values_list("product_id", flat=True)
+        )
+
     @classmethod
     def success_response(cls, instance):
+        product_ids = getattr(instance, "affected_product_ids", None)
+        if product_ids:
+            update_products_search_vector_task.delay(product_ids)
         response = super().success_response(instance)
         response.attribute = instance.attribute
         return response
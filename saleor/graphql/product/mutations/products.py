@@ -11,11 +11,22 @@ from graphql_jwt.exceptions import PermissionDenied
 from graphql_relay import from_global_id
 
 from ....core.permissions import ProductPermissions
+from ....core.response_cache import ResponseCacheTag, invalidate_response_cache
+from ....menu.utils import (
+    get_menu_ids_linked_to,
+    schedule_menus_update,
+    update_menus_linked_to,
+)
 from ....product import models
 from ....product.error_codes import ProductErrorCode
+from ....product.search import (
+    update_product_search_vector,
+    update_products_search_vector_by_ids,
+)
 from ....product.tasks import (
     update_product_minimal_variant_price_task,
     update_products_minimal_variant_prices_of_catalogues_task,
+    update_products_search_vector_task,
     update_variants_names,
 )
 from ....product.thumbnails import (
@@ -29,6 +40,7 @@ from ....product.utils.attributes import (
     generate_name_for_variant,
 )
 from ....warehouse.management import set_stock_quantity
+from ....warehouse.models import ProductStockSummary
 from ...core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
 from ...core.scalars import Decimal, WeightScalar
 from ...core.types import SeoInput, Upload
@@ -131,6 +143,16 @@ class CategoryUpdate(CategoryCreate):
         error_type_class = ProductError
         error_type_field = "product_errors"
 
+    @classmethod
+    def save(cls, info, instance, cleaned_input):
+        super().save(info, instance, cleaned_input)
+        if "name" in cleaned_input:
+            # Category name is a part of the products' search document
+            product_ids = list(instance.products.values_list("id", flat=True))
+            if product_ids:
+                update_products_search_vector_task.delay(product_ids)
+        update_menus_linked_to(category=instance)
+
 
 class CategoryDelete(ModelDeleteMutation):
     class Arguments:
@@ -239,6 +261,7 @@ class CollectionUpdate(CollectionCreate):
         if cleaned_input.get("background_image"):
             create_collection_background_image_thumbnails.delay(instance.pk)
         instance.save()
+        update_menus_linked_to(collection=instance)
 
 
 class CollectionDelete(ModelDeleteMutation):
@@ -252,6 +275,16 @@ class CollectionDelete(ModelDeleteMutation):
         error_type_class = ProductError
         error_type_field = "product_errors"
 
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        node_id = data.get("id")
+        collection_pk = from_global_id_strict_type(node_id, Collection, field="id")
+        # Menu items linked to the collection are deleted with it
+        menu_ids = get_menu_ids_linked_to(collection_id=collection_pk)
+        response = super().perform_mutation(_root, info, **data)
+        schedule_menus_update(menu_ids)
+        return response
+
 
 class MoveProductInput(graphene.InputObjectType):
     product_id = graphene.ID(
@@ -331,6 +364,7 @@ class CollectionReorderProducts(BaseMutation):
 
         with transaction.atomic():
             perform_reordering(m2m_related_field, operations)
+        invalidate_response_cache(ResponseCacheTag.COLLECTION)
         return CollectionReorderProducts(collection=collection)
 
 
@@ -361,6 +395,9 @@ class CollectionAddProducts(BaseMutation):
         )
         products = cls.get_nodes_or_error(products, "products", Product)
         collection.products.add(*products)
+        invalidate_response_cache(
+            ResponseCacheTag.COLLECTION, ResponseCacheTag.PRODUCT
+        )
         if collection.sale_set.exists():
             # Updated the db entries, recalculating discounts of affected products
             update_products_minimal_variant_prices_of_catalogues_task.delay(
@@ -395,6 +432,9 @@ class CollectionRemoveProducts(BaseMutation):
         )
         products = cls.get_nodes_or_error(products, "products", only_type=Product)
         collection.products.remove(*products)
+        invalidate_response_cache(
+            ResponseCacheTag.COLLECTION, ResponseCacheTag.PRODUCT
+        )
         if collection.sale_set.exists():
             # Updated the db entries, recalculating discounts of affected products
             update_products_minimal_variant_prices_of_catalogues_task.delay(
@@ -964,6 +1004,8 @@ class ProductCreate(ModelMutation):
         if attributes:
             AttributeAssignmentMixin.save(instance, attributes)
 
+        update_product_search_vector(instance)
+
     @classmethod
     def create_variant_stocks(cls, variant, stocks):
         warehouse_ids = [stock["warehouse"] for stock in stocks]
@@ -1043,6 +1085,8 @@ class ProductUpdate(ProductCreate):
         if attributes:
             AttributeAssignmentMixin.save(instance, attributes)
 
+        update_product_search_vector(instance)
+
 
 class ProductDelete(ModelDeleteMutation):
     class Arguments:
@@ -1296,6 +1340,8 @@ class ProductVariantCreate(ModelMutation):
             instance.name = generate_name_for_variant(instance)
             instance.save(update_fields=["name"])
 
+        update_product_search_vector(instance.product)
+
     @classmethod
     def create_variant_stocks(cls, variant, stocks):
         warehouse_ids = [stock["warehouse"] for stock in stocks]
@@ -1355,6 +1401,9 @@ class ProductVariantDelete(ModelDeleteMutation):
     def success_response(cls, instance):
         # Update the "minimal_variant_prices" of the parent product
         update_product_minimal_variant_price_task.delay(instance.product_id)
+        update_products_search_vector_by_ids([instance.product_id])
+        # Stocks of the variant were deleted along with it
+        ProductStockSummary.objects.refresh([instance.product_id])
         return super().success_response(instance)
 
 
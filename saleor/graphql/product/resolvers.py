@@ -147,12 +147,15 @@ def resolve_products(
 
     user = get_user_or_service_account_from_context(info.context)
     qs = models.Product.objects.visible_to_user(user)
-    qs = sort_products(qs, sort_by)
 
     if query:
         search = picker.pick_backend()
         qs &= search(query)
 
+    # Sort after searching, so the explicit sorting takes precedence over the
+    # search ranking
+    qs = sort_products(qs, sort_by)
+
     if attributes:
         qs = filter_products_by_attributes(qs, attributes)
 
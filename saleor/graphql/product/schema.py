@@ -205,6 +205,7 @@ class ProductQueries(graphene.ObjectType):
             ),
         ),
         description="List of the shop's products.",
+        keyset_pagination=True,
     )
     product_type = graphene.Field(
         ProductType,
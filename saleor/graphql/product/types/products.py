@@ -3,10 +3,10 @@ from typing import List, Union
 
 import graphene
 import graphene_django_optimizer as gql_optimizer
-from django.db.models import Prefetch
 from graphene import relay
 from graphene_federation import key
 from graphql.error import GraphQLError
+from promise import Promise
 
 from ....core.permissions import ProductPermissions
 from ....product import models
@@ -20,14 +20,7 @@ from ....product.utils.availability import (
     get_variant_availability,
 )
 from ....product.utils.costs import get_margin_for_variant, get_product_costs_data
-from ....warehouse import models as stock_models
-from ....warehouse.availability import (
-    get_available_quantity,
-    get_available_quantity_for_customer,
-    get_quantity_allocated,
-    is_product_in_stock,
-    is_variant_in_stock,
-)
+from ....warehouse.availability import get_available_quantity_for_customer
 from ...account.enums import CountryCodeEnum
 from ...core.connection import CountableDjangoObjectType
 from ...core.enums import ReportingPeriod, TaxRateType
@@ -44,66 +37,89 @@ from ...translations.types import (
     ProductVariantTranslation,
 )
 from ...utils import get_database_id, reporting_period_to_date
+from ...warehouse.dataloaders import (
+    IsProductInStockByProductIdAndCountryCodeLoader,
+    StockByProductVariantIdAndCountryCodeLoader,
+    StocksByProductVariantIdLoader,
+)
 from ...warehouse.types import Stock
+from ..dataloaders import (
+    AssignedProductAttributesByProductIdLoader,
+    AssignedVariantAttributesByProductVariantIdLoader,
+    AttributeProductsByProductTypeIdLoader,
+    AttributeVariantsByProductTypeIdLoader,
+    CategoryByIdLoader,
+    CollectionsByProductIdLoader,
+    ImagesByProductIdLoader,
+    ImagesByProductVariantIdLoader,
+    ProductByIdLoader,
+    ProductTypeByIdLoader,
+    ProductVariantsByProductIdLoader,
+)
 from ..filters import AttributeFilterInput
 from ..resolvers import resolve_attributes
 from .attributes import Attribute, SelectedAttribute
 from .digital_contents import DigitalContent
 
 
-def resolve_attribute_list(
-    instance: Union[models.Product, models.ProductVariant], *, user
+def _build_selected_attributes(
+    attribute_assignments: Union[
+        List[models.AttributeProduct], List[models.AttributeVariant]
+    ],
+    assigned_attributes: Union[
+        List[models.AssignedProductAttribute], List[models.AssignedVariantAttribute]
+    ],
 ) -> List[SelectedAttribute]:
-    """Resolve attributes from a product into a list of `SelectedAttribute`s.
+    """Combine the product type's attributes with the values assigned to an instance.
 
-    Note: you have to prefetch the below M2M fields.
-        - product_type -> attribute[rel] -> [rel]assignments -> values
-        - product_type -> attribute[rel] -> attribute
+    Attributes that are assigned to the product type but have no values assigned
+    to the given instance are returned with an empty list of values.
     """
-    resolved_attributes = []
-    attributes_qs = None
-
-    # Retrieve the product type
-    if isinstance(instance, models.Product):
-        product_type = instance.product_type
-        product_type_attributes_assoc_field = "attributeproduct"
-        assigned_attribute_instance_field = "productassignments"
-        assigned_attribute_instance_filters = {"product_id": instance.pk}
-        if hasattr(product_type, "storefront_attributes"):
-            attributes_qs = product_type.storefront_attributes  # type: ignore
-    elif isinstance(instance, models.ProductVariant):
-        product_type = instance.product.product_type
-        product_type_attributes_assoc_field = "attributevariant"
-        assigned_attribute_instance_field = "variantassignments"
-        assigned_attribute_instance_filters = {"variant_id": instance.pk}
-    else:
-        raise AssertionError(f"{instance.__class__.__name__} is unsupported")
-
-    # Retrieve all the product attributes assigned to this product type
-    if not attributes_qs:
-        attributes_qs = getattr(product_type, product_type_attributes_assoc_field)
-        attributes_qs = attributes_qs.get_visible_to_user(user)
-
-    # An empty QuerySet for unresolved values
-    empty_qs = models.AttributeValue.objects.none()
-
-    # Goes through all the attributes assigned to the product type
-    # The assigned values are returned as a QuerySet, but will assign a
-    # dummy empty QuerySet if no values are assigned to the given instance.
-    for attr_data_rel in attributes_qs:
-        attr_instance_data = getattr(attr_data_rel, assigned_attribute_instance_field)
-
-        # Retrieve the instance's associated data
-        attr_data = attr_instance_data.filter(**assigned_attribute_instance_filters)
-        attr_data = attr_data.first()
-
-        # Return the instance's attribute values if the assignment was found,
-        # otherwise it sets the values as an empty QuerySet
-        values = attr_data.values.all() if attr_data is not None else empty_qs
-        resolved_attributes.append(
-            SelectedAttribute(attribute=attr_data_rel.attribute, values=values)
+    values_by_assignment_id = {
+        assigned.assignment_id: list(assigned.values.all())
+        for assigned in assigned_attributes
+    }
+    return [
+        SelectedAttribute(
+            attribute=assignment.attribute,
+            values=values_by_assignment_id.get(assignment.id, []),
+        )
+        for assignment in attribute_assignments
+    ]
+
+
+def resolve_product_attributes(
+    root: models.Product, info
+) -> Promise[List[SelectedAttribute]]:
+    context = info.context
+    attribute_products = AttributeProductsByProductTypeIdLoader(context).load(
+        root.product_type_id
+    )
+    assigned_attributes = AssignedProductAttributesByProductIdLoader(context).load(
+        root.id
+    )
+    return Promise.all([attribute_products, assigned_attributes]).then(
+        lambda results: _build_selected_attributes(*results)
+    )
+
+
+def resolve_variant_attributes(
+    root: models.ProductVariant, info
+) -> Promise[List[SelectedAttribute]]:
+    context = info.context
+
+    def with_product(product):
+        attribute_variants = AttributeVariantsByProductTypeIdLoader(context).load(
+            product.product_type_id
+        )
+        assigned_attributes = AssignedVariantAttributesByProductVariantIdLoader(
+            context
+        ).load(root.id)
+        return Promise.all([attribute_variants, assigned_attributes]).then(
+            lambda results: _build_selected_attributes(*results)
         )
-    return resolved_attributes
+
+    return ProductByIdLoader(context).load(root.product_id).then(with_product)
 
 
 class Margin(graphene.ObjectType):
@@ -201,12 +217,10 @@ class ProductVariant(CountableDjangoObjectType):
         "Use the stock field instead.",
     )
 
-    attributes = gql_optimizer.field(
-        graphene.List(
-            graphene.NonNull(SelectedAttribute),
-            required=True,
-            description="List of attributes assigned to this variant.",
-        )
+    attributes = graphene.List(
+        graphene.NonNull(SelectedAttribute),
+        required=True,
+        description="List of attributes assigned to this variant.",
     )
     cost_price = graphene.Field(Money, description="Cost price of the variant.")
     margin = graphene.Int(description="Gross margin percentage value.")
@@ -220,11 +234,8 @@ class ProductVariant(CountableDjangoObjectType):
             "optimizations suitable for such calculations."
         ),
     )
-    images = gql_optimizer.field(
-        graphene.List(
-            lambda: ProductImage, description="List of images for the product variant."
-        ),
-        model_field="images",
+    images = graphene.List(
+        lambda: ProductImage, description="List of images for the product variant."
     )
     translation = TranslationField(
         ProductVariantTranslation, type_name="product variant"
@@ -236,16 +247,14 @@ class ProductVariant(CountableDjangoObjectType):
         model_field="digital_content",
     )
 
-    stocks = gql_optimizer.field(
-        graphene.Field(
-            graphene.List(Stock),
-            description="Stocks for the product variant.",
-            country_code=graphene.Argument(
-                CountryCodeEnum,
-                description="Two-letter ISO 3166-1 country code.",
-                required=False,
-            ),
-        )
+    stocks = graphene.Field(
+        graphene.List(Stock),
+        description="Stocks for the product variant.",
+        country_code=graphene.Argument(
+            CountryCodeEnum,
+            description="Two-letter ISO 3166-1 country code.",
+            required=False,
+        ),
     )
 
     class Meta:
@@ -259,9 +268,7 @@ class ProductVariant(CountableDjangoObjectType):
     @staticmethod
     def resolve_stocks(root: models.ProductVariant, info, country_code=None):
         if not country_code:
-            return gql_optimizer.query(
-                root.stocks.annotate_available_quantity().all(), info
-            )
+            return StocksByProductVariantIdLoader(info.context).load(root.id)
         return gql_optimizer.query(
             root.stocks.annotate_available_quantity().for_country(country_code).all(),
             info,
@@ -275,20 +282,19 @@ class ProductVariant(CountableDjangoObjectType):
     @staticmethod
     def resolve_stock_quantity(root: models.ProductVariant, info):
         country = info.context.country
-        try:
-            stock = stock_models.Stock.objects.get_variant_stock_for_country(
-                country, root
+        return (
+            StockByProductVariantIdAndCountryCodeLoader(info.context)
+            .load((root.id, country))
+            .then(
+                lambda stock: get_available_quantity_for_customer(stock)
+                if stock
+                else 0
             )
-        except stock_models.Stock.DoesNotExist:
-            return 0
-        return get_available_quantity_for_customer(stock)
+        )
 
     @staticmethod
-    @gql_optimizer.resolver_hints(
-        prefetch_related=["attributes__values", "attributes__assignment__attribute"]
-    )
     def resolve_attributes(root: models.ProductVariant, info):
-        return resolve_attribute_list(root, user=info.context.user)
+        return resolve_variant_attributes(root, info)
 
     @staticmethod
     @permission_required(ProductPermissions.MANAGE_PRODUCTS)
@@ -306,7 +312,8 @@ class ProductVariant(CountableDjangoObjectType):
 
     @staticmethod
     @gql_optimizer.resolver_hints(
-        prefetch_related=("product",), only=["price_override_amount", "currency"]
+        prefetch_related=("product__collections",),
+        only=["price_override_amount", "currency"],
     )
     def resolve_pricing(root: models.ProductVariant, info):
         context = info.context
@@ -322,7 +329,11 @@ class ProductVariant(CountableDjangoObjectType):
     @staticmethod
     def resolve_is_available(root: models.ProductVariant, info):
         country = info.context.country
-        return is_variant_in_stock(root, country)
+        return (
+            StockByProductVariantIdAndCountryCodeLoader(info.context)
+            .load((root.id, country))
+            .then(lambda stock: bool(stock) and stock.quantity_available > 0)
+        )
 
     @staticmethod
     @permission_required(ProductPermissions.MANAGE_PRODUCTS)
@@ -332,7 +343,12 @@ class ProductVariant(CountableDjangoObjectType):
     @staticmethod
     @permission_required(ProductPermissions.MANAGE_PRODUCTS)
     def resolve_quantity(root: models.ProductVariant, info):
-        return get_available_quantity(root, info.context.country)
+        country = info.context.country
+        return (
+            StockByProductVariantIdAndCountryCodeLoader(info.context)
+            .load((root.id, country))
+            .then(lambda stock: stock.quantity_available if stock else 0)
+        )
 
     @staticmethod
     @permission_required(ProductPermissions.MANAGE_PRODUCTS)
@@ -345,7 +361,11 @@ class ProductVariant(CountableDjangoObjectType):
     @permission_required(ProductPermissions.MANAGE_PRODUCTS)
     def resolve_quantity_allocated(root: models.ProductVariant, info):
         country = info.context.country
-        return get_quantity_allocated(root, country)
+        return (
+            StockByProductVariantIdAndCountryCodeLoader(info.context)
+            .load((root.id, country))
+            .then(lambda stock: stock.quantity_allocated if stock else 0)
+        )
 
     @staticmethod
     @permission_required(ProductPermissions.MANAGE_PRODUCTS)
@@ -354,8 +374,8 @@ class ProductVariant(CountableDjangoObjectType):
         return calculate_revenue_for_variant(root, start_date)
 
     @staticmethod
-    def resolve_images(root: models.ProductVariant, *_args):
-        return root.images.all()
+    def resolve_images(root: models.ProductVariant, info, *_args):
+        return ImagesByProductVariantIdLoader(info.context).load(root.id)
 
     @classmethod
     def get_node(cls, info, id):
@@ -421,21 +441,14 @@ class Product(CountableDjangoObjectType):
         id=graphene.Argument(graphene.ID, description="ID of a product image."),
         description="Get a single product image by ID.",
     )
-    variants = gql_optimizer.field(
-        graphene.List(ProductVariant, description="List of variants for the product."),
-        model_field="variants",
+    variants = graphene.List(
+        ProductVariant, description="List of variants for the product."
     )
-    images = gql_optimizer.field(
-        graphene.List(
-            lambda: ProductImage, description="List of images for the product."
-        ),
-        model_field="images",
+    images = graphene.List(
+        lambda: ProductImage, description="List of images for the product."
     )
-    collections = gql_optimizer.field(
-        graphene.List(
-            lambda: Collection, description="List of collections for the product."
-        ),
-        model_field="collections",
+    collections = graphene.List(
+        lambda: Collection, description="List of collections for the product."
     )
     translation = TranslationField(ProductTranslation, type_name="product")
 
@@ -466,14 +479,30 @@ class Product(CountableDjangoObjectType):
         return TaxType(tax_code=tax_data.code, description=tax_data.description)
 
     @staticmethod
-    @gql_optimizer.resolver_hints(prefetch_related="images")
     def resolve_thumbnail(root: models.Product, info, *, size=255):
-        image = root.get_first_image()
-        if image:
-            url = get_product_image_thumbnail(image, size, method="thumbnail")
-            alt = image.alt
-            return Image(alt=alt, url=info.context.build_absolute_uri(url))
-        return None
+        def return_first_thumbnail(images):
+            image = images[0] if images else None
+            if image:
+                url = get_product_image_thumbnail(image, size, method="thumbnail")
+                alt = image.alt
+                return Image(alt=alt, url=info.context.build_absolute_uri(url))
+            return None
+
+        return (
+            ImagesByProductIdLoader(info.context)
+            .load(root.id)
+            .then(return_first_thumbnail)
+        )
+
+    @staticmethod
+    def resolve_category(root: models.Product, info):
+        if root.category_id is None:
+            return None
+        return CategoryByIdLoader(info.context).load(root.category_id)
+
+    @staticmethod
+    def resolve_product_type(root: models.Product, info):
+        return ProductTypeByIdLoader(info.context).load(root.product_type_id)
 
     @staticmethod
     def resolve_url(root: models.Product, *_args):
@@ -502,11 +531,13 @@ class Product(CountableDjangoObjectType):
         return ProductPricingInfo(**asdict(availability))
 
     @staticmethod
-    @gql_optimizer.resolver_hints(prefetch_related=("variants"))
     def resolve_is_available(root: models.Product, info):
         country = info.context.country
-        in_stock = is_product_in_stock(root, country)
-        return root.is_visible and in_stock
+        return (
+            IsProductInStockByProductIdAndCountryCodeLoader(info.context)
+            .load((root.id, country))
+            .then(lambda in_stock: root.is_visible and in_stock)
+        )
 
     @staticmethod
     @permission_required(ProductPermissions.MANAGE_PRODUCTS)
@@ -532,19 +563,8 @@ class Product(CountableDjangoObjectType):
         return price.net
 
     @staticmethod
-    @gql_optimizer.resolver_hints(
-        prefetch_related=[
-            Prefetch(
-                "product_type__attributeproduct",
-                queryset=models.AttributeProduct.objects.filter(
-                    attribute__visible_in_storefront=True
-                ).prefetch_related("productassignments__values", "attribute"),
-                to_attr="storefront_attributes",
-            )
-        ]
-    )
     def resolve_attributes(root: models.Product, info):
-        return resolve_attribute_list(root, user=info.context.user)
+        return resolve_product_attributes(root, info)
 
     @staticmethod
     @permission_required(ProductPermissions.MANAGE_PRODUCTS)
@@ -567,17 +587,16 @@ class Product(CountableDjangoObjectType):
             raise GraphQLError("Product image not found.")
 
     @staticmethod
-    @gql_optimizer.resolver_hints(model_field="images")
-    def resolve_images(root: models.Product, *_args, **_kwargs):
-        return root.images.all()
+    def resolve_images(root: models.Product, info, **_kwargs):
+        return ImagesByProductIdLoader(info.context).load(root.id)
 
     @staticmethod
-    def resolve_variants(root: models.Product, *_args, **_kwargs):
-        return root.variants.all()
+    def resolve_variants(root: models.Product, info, **_kwargs):
+        return ProductVariantsByProductIdLoader(info.context).load(root.id)
 
     @staticmethod
-    def resolve_collections(root: models.Product, *_args):
-        return root.collections.all()
+    def resolve_collections(root: models.Product, info):
+        return CollectionsByProductIdLoader(info.context).load(root.id)
 
     @classmethod
     def get_node(cls, info, pk):
@@ -815,6 +834,12 @@ class Category(CountableDjangoObjectType):
         qs = root.children.all()
         return gql_optimizer.query(qs, info)
 
+    @staticmethod
+    def resolve_parent(root: models.Category, info):
+        if root.parent_id is None:
+            return None
+        return CategoryByIdLoader(info.context).load(root.parent_id)
+
     @staticmethod
     def resolve_url(root: models.Category, _info):
         return ""
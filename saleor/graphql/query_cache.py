@@ -0,0 +1,116 @@
+"""Caches sparing the API from processing the same query documents over again.
+
+Parsed and validated documents are kept in a per-process LRU cache, so frequently
+sent queries are lexed, parsed and validated only once.
+
+Clients may also use automatic persisted queries: instead of the query they send
+its SHA-256 hash in the `persistedQuery` request extension. If the hash is not
+known yet, the API responds with the `PersistedQueryNotFound` error and the client
+retries sending both the query and its hash, which is then stored in the cache
+shared by all processes.
+"""
+import hashlib
+import json
+from functools import lru_cache
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import GraphQLDocument
+from graphql.error import GraphQLError
+from graphql.execution import ExecutionResult
+from graphql.validation import validate
+
+PERSISTED_QUERY_CACHE_KEY = "graphql.persisted_query:{}"
+PERSISTED_QUERY_VERSION = 1
+
+
+class PersistedQueryNotFound(GraphQLError):
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound")
+
+
+class PersistedQueryError(GraphQLError):
+    pass
+
+
+def get_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=settings.GRAPHQL_DOCUMENT_CACHE_SIZE)
+def get_document(backend, schema, query: str) -> GraphQLDocument:
+    """Return a parsed document of the query, validated against the schema.
+
+    Documents are validated once, when they are put in the cache; executing a
+    document that failed validation returns the validation errors.
+    """
+    document = backend.document_from_string(schema, query)
+    validation_errors = validate(schema, document.document_ast)
+    if validation_errors:
+
+        def execute(*_args, **_kwargs):
+            return ExecutionResult(errors=validation_errors, invalid=True)
+
+    else:
+
+        def execute(*args, **kwargs):
+            return document.execute(*args, validate=False, **kwargs)
+
+    return GraphQLDocument(
+        schema=schema,
+        document_string=document.document_string,
+        document_ast=document.document_ast,
+        execute=execute,
+    )
+
+
+def clear_document_cache():
+    get_document.cache_clear()
+
+
+def _get_persisted_query_hash(data: dict) -> Optional[str]:
+    extensions = data.get("extensions")
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            raise PersistedQueryError("Unable to parse request extensions.")
+    if not isinstance(extensions, dict):
+        return None
+
+    persisted_query = extensions.get("persistedQuery")
+    if not persisted_query:
+        return None
+    if persisted_query.get("version") != PERSISTED_QUERY_VERSION:
+        raise PersistedQueryError("Unsupported persisted query version.")
+    query_hash = persisted_query.get("sha256Hash")
+    if not query_hash or not isinstance(query_hash, str):
+        raise PersistedQueryError("Persisted query hash is missing.")
+    return query_hash
+
+
+def resolve_persisted_query(
+    data: dict, query: Optional[str], save: bool = True
+) -> Optional[str]:
+    """Return the query to execute for a request using persisted queries.
+
+    Requests without the hash are returned the query they were sent with. Queries
+    sent with their hash are stored unless `save` is False.
+    """
+    query_hash = _get_persisted_query_hash(data)
+    if query_hash is None:
+        return query
+
+    cache_key = PERSISTED_QUERY_CACHE_KEY.format(query_hash)
+    if not query:
+        query = cache.get(cache_key)
+        if query is None:
+            raise PersistedQueryNotFound()
+        return query
+
+    if not isinstance(query, str) or get_query_hash(query) != query_hash:
+        raise PersistedQueryError("Provided hash does not match the query.")
+    if save:
+        cache.set(cache_key, query, timeout=settings.GRAPHQL_PERSISTED_QUERY_TIMEOUT)
+    return query
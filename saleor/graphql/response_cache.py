@@ -0,0 +1,210 @@
+"""Cache of the responses to anonymous storefront queries.
+
+Queries sent without credentials return the same data for every user browsing
+the store in a given country, currency and language, so their results can be
+shared. Only queries of the catalog and navigation are cached, data depending on
+the client, like checkouts, never is. The cache is disabled unless
+`GRAPHQL_RESPONSE_CACHE_TIMEOUT` is set; as stock changes don't invalidate
+the responses, the timeout also limits how long the product availability may
+be outdated.
+
+Responses are tagged with the kinds of objects their queries select (see
+`saleor.core.response_cache`), so saving e.g. a product makes stale only the
+responses containing products.
+"""
+import hashlib
+import json
+from typing import Optional, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest
+from django.utils.translation import get_language
+from graphql import GraphQLDocument
+from graphql.language import ast
+from graphql.type.definition import get_named_type
+from graphql_jwt.settings import jwt_settings
+
+from ..core.response_cache import (
+    ResponseCacheTag,
+    get_tag_versions,
+    is_response_cache_enabled,
+)
+from .query_cache import get_query_hash
+
+RESPONSE_CACHE_KEY = "graphql.response:{}"
+
+CACHEABLE_QUERY_FIELDS = {
+    "attribute",
+    "attributes",
+    "categories",
+    "category",
+    "collection",
+    "collections",
+    "menu",
+    "menuItem",
+    "menuItems",
+    "menus",
+    "product",
+    "productType",
+    "productTypes",
+    "productVariant",
+    "productVariants",
+    "products",
+    "shop",
+}
+
+RESPONSE_CACHE_TAGS_BY_TYPE = {
+    "Product": ResponseCacheTag.PRODUCT,
+    "ProductVariant": ResponseCacheTag.PRODUCT,
+    "ProductImage": ResponseCacheTag.PRODUCT,
+    "ProductType": ResponseCacheTag.PRODUCT_TYPE,
+    "Attribute": ResponseCacheTag.ATTRIBUTE,
+    "AttributeValue": ResponseCacheTag.ATTRIBUTE,
+    "Category": ResponseCacheTag.CATEGORY,
+    "Collection": ResponseCacheTag.COLLECTION,
+    "Menu": ResponseCacheTag.MENU,
+    "MenuItem": ResponseCacheTag.MENU,
+    "Page": ResponseCacheTag.PAGE,
+    "Sale": ResponseCacheTag.SALE,
+    "Shop": ResponseCacheTag.SHOP,
+    # Prices depend on the active sales
+    "ProductPricingInfo": ResponseCacheTag.SALE,
+    "VariantPricingInfo": ResponseCacheTag.SALE,
+}
+
+
+def _get_selected_type_names(schema, document_ast: ast.Document) -> Set[str]:
+    """Return names of the types selected by the queries of the document."""
+    fragments = {
+        definition.name.value: definition
+        for definition in document_ast.definitions
+        if isinstance(definition, ast.FragmentDefinition)
+    }
+    type_names: Set[str] = set()
+    visited_fragments: Set[str] = set()
+
+    def visit(parent_type, selection_set):
+        for selection in selection_set.selections:
+            if isinstance(selection, ast.Field):
+                fields = getattr(parent_type, "fields", {})
+                field = fields.get(selection.name.value)
+                if field is None:
+                    continue
+                field_type = get_named_type(field.type)
+                type_names.add(field_type.name)
+                if selection.selection_set:
+                    visit(field_type, selection.selection_set)
+            elif isinstance(selection, ast.InlineFragment):
+                fragment_type = parent_type
+                type_condition = selection.type_condition
+                if type_condition:
+                    fragment_type = schema.get_type(type_condition.name.value)
+                    type_names.add(fragment_type.name)
+                visit(fragment_type, selection.selection_set)
+            elif isinstance(selection, ast.FragmentSpread):
+                name = selection.name.value
+                if name in visited_fragments or name not in fragments:
+                    continue
+                visited_fragments.add(name)
+                fragment = fragments[name]
+                fragment_type = schema.get_type(fragment.type_condition.name.value)
+                type_names.add(fragment_type.name)
+                visit(fragment_type, fragment.selection_set)
+
+    for definition in document_ast.definitions:
+        if isinstance(definition, ast.OperationDefinition):
+            if definition.operation == "query":
+                visit(schema.get_query_type(), definition.selection_set)
+    return type_names
+
+
+def _is_document_cacheable(document_ast: ast.Document) -> bool:
+    for definition in document_ast.definitions:
+        if not isinstance(definition, ast.OperationDefinition):
+            continue
+        if definition.operation != "query":
+            return False
+        for selection in definition.selection_set.selections:
+            if not isinstance(selection, ast.Field):
+                return False
+            name = selection.name.value
+            if name not in CACHEABLE_QUERY_FIELDS and not name.startswith("__"):
+                return False
+    return True
+
+
+def get_document_tags(document: GraphQLDocument) -> Optional[Set[str]]:
+    """Return the tags of responses to the document.
+
+    `None` is returned if responses to the document must not be cached. Tags are
+    stored on the document, which is reused thanks to the document cache.
+    """
+    if not hasattr(document, "response_cache_tags"):
+        tags = None
+        if _is_document_cacheable(document.document_ast):
+            type_names = _get_selected_type_names(
+                document.schema, document.document_ast
+            )
+            tags = {
+                RESPONSE_CACHE_TAGS_BY_TYPE[name]
+                for name in type_names
+                if name in RESPONSE_CACHE_TAGS_BY_TYPE
+            }
+        document.response_cache_tags = tags  # type: ignore
+    return document.response_cache_tags  # type: ignore
+
+
+def is_request_cacheable(request: HttpRequest) -> bool:
+    """Check if the request is sent anonymously to the storefront API.
+
+    Users are authenticated while the query is executed, so requests carrying any
+    credentials accepted by the API, either the authorization header or the JWT
+    cookie, are never served from nor stored in the cache.
+    """
+    return (
+        is_response_cache_enabled()
+        and "HTTP_AUTHORIZATION" not in request.META
+        and jwt_settings.JWT_COOKIE_NAME not in request.COOKIES
+        and request.content_type != "multipart/form-data"
+    )
+
+
+def get_response_cache_key(
+    request: HttpRequest,
+    document: GraphQLDocument,
+    variables: Optional[dict],
+    operation_name: Optional[str],
+) -> Optional[str]:
+    """Return the key the response to the request is cached under.
+
+    `None` is returned if the response must not be cached.
+    """
+    if not is_request_cacheable(request):
+        return None
+    if document.get_operation_type(operation_name) != "query":
+        return None
+    tags = get_document_tags(document)
+    if tags is None:
+        return None
+
+    key_data = {
+        "query": get_query_hash(document.document_string),
+        "variables": variables,
+        "operation_name": operation_name,
+        "country": str(getattr(request, "country", "")),
+        "currency": getattr(request, "currency", ""),
+        "language": get_language(),
+        "tags": get_tag_versions(tags),
+    }
+    key = json.dumps(key_data, sort_keys=True, cls=DjangoJSONEncoder)
+    return RESPONSE_CACHE_KEY.format(hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+
+def get_cached_response(cache_key: str) -> Optional[dict]:
+    return cache.get(cache_key)
+
+
+def cache_response(cache_key: str, data: dict):
+    cache.set(cache_key, data, timeout=settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT)
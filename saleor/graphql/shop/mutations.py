@@ -6,6 +6,7 @@ from django.core.management import call_command
 from ...account import models as account_models
 from ...core.error_codes import ShopErrorCode
 from ...core.permissions import SitePermissions
+from ...core.response_cache import ResponseCacheTag, invalidate_response_cache
 from ...core.utils.url import validate_storefront_url
 from ...site import models as site_models
 from ..account.i18n import I18nMixin
@@ -95,6 +96,8 @@ class ShopSettingsUpdate(BaseMutation):
         instance = cls.construct_instance(instance, cleaned_input)
         cls.clean_instance(info, instance)
         instance.save()
+        # Prices depend on the tax settings
+        invalidate_response_cache(ResponseCacheTag.SALE)
         return ShopSettingsUpdate(shop=Shop())
 
 
@@ -130,6 +133,7 @@ class ShopAddressUpdate(BaseMutation, I18nMixin):
         else:
             if site_settings.company_address:
                 site_settings.company_address.delete()
+                invalidate_response_cache(ResponseCacheTag.SHOP)
         return ShopAddressUpdate(shop=Shop())
 
 
@@ -157,6 +161,7 @@ class ShopDomainUpdate(BaseMutation):
             site.name = name
         cls.clean_instance(info, site)
         site.save()
+        invalidate_response_cache(ResponseCacheTag.SHOP)
         return ShopDomainUpdate(shop=Shop())
 
 
@@ -227,10 +227,14 @@ class Shop(graphene.ObjectType):
     @staticmethod
     def resolve_navigation(_, info):
         site_settings = info.context.site.settings
-        qs = menu_models.Menu.objects.all()
-        top_menu = get_node_optimized(qs, {"pk": site_settings.top_menu_id}, info)
-        bottom_menu = get_node_optimized(qs, {"pk": site_settings.bottom_menu_id}, info)
-        return Navigation(main=top_menu, secondary=bottom_menu)
+        # Items are served from the compiled menu content, so they aren't prefetched
+        menus = menu_models.Menu.objects.in_bulk(
+            [site_settings.top_menu_id, site_settings.bottom_menu_id]
+        )
+        return Navigation(
+            main=menus.get(site_settings.top_menu_id),
+            secondary=menus.get(site_settings.bottom_menu_id),
+        )
 
     @staticmethod
     def resolve_permissions(_, _info):
@@ -1,8 +1,14 @@
 import graphene
 
 from ...core.permissions import SitePermissions
+from ...core.response_cache import (
+    ResponseCacheTag,
+    invalidate_response_cache,
+    invalidate_response_cache_for_model,
+)
 from ...discount import models as discount_models
 from ...menu import models as menu_models
+from ...menu.utils import update_menu
 from ...page import models as page_models
 from ...product import models as product_models
 from ...shipping import models as shipping_models
@@ -29,6 +35,7 @@ class BaseTranslateMutation(ModelMutation):
         instance.translations.update_or_create(
             language_code=data["language_code"], defaults=data["input"]
         )
+        invalidate_response_cache_for_model(cls._meta.model)
         return cls(**{cls._meta.return_field_name: instance})
 
 
@@ -175,6 +182,12 @@ class MenuItemTranslate(BaseTranslateMutation):
         description = "Creates/Updates translations for Menu Item."
         model = menu_models.MenuItem
 
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        response = super().perform_mutation(_root, info, **data)
+        update_menu(response.menuItem.menu)
+        return response
+
 
 class PageTranslationInput(SeoTranslationInput):
     title = graphene.String()
@@ -222,4 +235,5 @@ class ShopSettingsTranslate(BaseMutation):
         instance.translations.update_or_create(
             language_code=language_code, defaults=data.get("input")
         )
+        invalidate_response_cache(ResponseCacheTag.SHOP)
         return ShopSettingsTranslate(shop=Shop())
@@ -25,6 +25,16 @@ from graphql.execution import ExecutionResult
 from graphql_jwt.exceptions import PermissionDenied
 
 from ..core.utils import is_valid_ipv4, is_valid_ipv6
+from .query_cache import (
+    PersistedQueryNotFound,
+    get_document,
+    resolve_persisted_query,
+)
+from .response_cache import (
+    cache_response,
+    get_cached_response,
+    get_response_cache_key,
+)
 
 API_PATH = SimpleLazyObject(lambda: reverse("api"))
 
@@ -183,7 +193,8 @@ class GraphQLView(View):
 
         If no query was given or query is not a string, it returns an error.
         If the query is invalid, it returns an error as well.
-        Otherwise, it returns the parsed gql document.
+        Otherwise, it returns the parsed gql document. Documents are cached,
+        so repeated queries are parsed and validated only once.
         """
         if not query or not isinstance(query, str):
             return (
@@ -195,12 +206,7 @@ class GraphQLView(View):
 
         # Attempt to parse the query, if it fails, return the error
         try:
-            return (
-                self.backend.document_from_string(  # type: ignore
-                    self.schema, query
-                ),
-                None,
-            )
+            return get_document(self.backend, self.schema, query), None
         except (ValueError, GraphQLSyntaxError) as e:
             return None, ExecutionResult(errors=[e], invalid=True)
 
@@ -212,6 +218,14 @@ class GraphQLView(View):
             span.set_tag(ot_tags.COMPONENT, "graphql_query")
 
             query, variables, operation_name = self.get_graphql_params(request, data)
+            try:
+                query = resolve_persisted_query(data, query)
+            except PersistedQueryNotFound as e:
+                # Not an invalid request, the client is expected to retry with
+                # the full query
+                return ExecutionResult(errors=[e])
+            except GraphQLError as e:
+                return ExecutionResult(errors=[e], invalid=True)
 
             document, error = self.parse_query(query)
             if error:
@@ -226,6 +240,15 @@ class GraphQLView(View):
                     }
                 )
 
+            cache_key = get_response_cache_key(
+                request, document, variables, operation_name  # type: ignore
+            )
+            if cache_key:
+                cached_data = get_cached_response(cache_key)
+                if cached_data is not None:
+                    span.set_tag("graphql.response_cache_hit", True)
+                    return ExecutionResult(data=cached_data)
+
             extra_options: Dict[str, Optional[Any]] = {}
 
             if self.executor:
@@ -234,7 +257,7 @@ class GraphQLView(View):
                 extra_options["executor"] = self.executor
             try:
                 with connection.execute_wrapper(tracing_wrapper):
-                    return document.execute(  # type: ignore
+                    result = document.execute(  # type: ignore
                         root=self.get_root_value(),
                         variables=variables,
                         operation_name=operation_name,
@@ -245,6 +268,9 @@ class GraphQLView(View):
             except Exception as e:
                 span.set_tag(ot_tags.ERROR, True)
                 return ExecutionResult(errors=[e], invalid=True)
+            if cache_key and not result.errors and not result.invalid:
+                cache_response(cache_key, result.data)
+            return result
 
     @staticmethod
     def parse_body(request: HttpRequest):
@@ -0,0 +1,80 @@
+from collections import defaultdict
+from typing import DefaultDict, Dict, Iterable, List, Optional, Tuple
+
+from ...warehouse.models import ProductStockSummary, Stock
+from ..core.dataloaders import DataLoader, group_by_key
+
+CountryCode = str
+ProductIdCountryCodeTuple = Tuple[int, CountryCode]
+VariantIdCountryCodeTuple = Tuple[int, CountryCode]
+
+
+def _group_keys_by_country(
+    keys: Iterable[Tuple[int, CountryCode]]
+) -> Dict[CountryCode, List[int]]:
+    ids_by_country: DefaultDict[CountryCode, List[int]] = defaultdict(list)
+    for pk, country_code in keys:
+        ids_by_country[country_code].append(pk)
+    return ids_by_country
+
+
+class StockByProductVariantIdAndCountryCodeLoader(
+    DataLoader[VariantIdCountryCodeTuple, Optional[Stock]]
+):
+    """Return the stock of a variant in the warehouse shipping to a given country.
+
+    This is the batched equivalent of `Stock.objects.get_variant_stock_for_country`;
+    `None` is returned when there is no such stock.
+    """
+
+    context_key = "stock_by_productvariant_and_country"
+
+    def batch_load(self, keys):
+        stocks_by_key: Dict[VariantIdCountryCodeTuple, Stock] = {}
+        for country_code, variant_ids in _group_keys_by_country(keys).items():
+            stocks = (
+                Stock.objects.annotate_available_quantity()
+                .for_country(country_code)
+                .filter(product_variant_id__in=variant_ids)
+                .order_by("pk")
+            )
+            for stock in stocks:
+                stocks_by_key.setdefault(
+                    (stock.product_variant_id, country_code), stock
+                )
+        return [stocks_by_key.get(key) for key in keys]
+
+
+class StocksByProductVariantIdLoader(DataLoader[int, List[Stock]]):
+    context_key = "stocks_by_productvariant"
+
+    def batch_load(self, keys):
+        stocks = Stock.objects.annotate_available_quantity().filter(
+            product_variant_id__in=keys
+        )
+        return group_by_key(
+            keys, ((stock.product_variant_id, stock) for stock in stocks)
+        )
+
+
+class IsProductInStockByProductIdAndCountryCodeLoader(
+    DataLoader[ProductIdCountryCodeTuple, bool]
+):
+    """Check if any variant of a product is available in a given country.
+
+    This is the batched equivalent of `warehouse.availability.is_product_in_stock`.
+    """
+
+    context_key = "is_product_in_stock_by_product_and_country"
+
+    def batch_load(self, keys):
+        in_stock = set()
+        for country_code, product_ids in _group_keys_by_country(keys).items():
+            available_product_ids = (
+                ProductStockSummary.objects.for_country(country_code)
+                .filter(product_id__in=product_ids, available_stocks_count__gt=0)
+                .values_list("product_id", flat=True)
+            )
+            for product_id in available_product_ids:
+                in_stock.add((product_id, country_code))
+        return [key in in_stock for key in keys]
@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 
 from ...core.permissions import WebhookPermissions
 from ...webhook import models
+from ...webhook.cache import invalidate_webhooks_cache
 from ...webhook.error_codes import WebhookErrorCode
 from ..core.mutations import ModelDeleteMutation, ModelMutation
 from ..core.types.common import WebhookError
@@ -92,6 +93,7 @@ class WebhookCreate(ModelMutation):
                 for event in events
             ]
         )
+        invalidate_webhooks_cache()
 
 
 class WebhookUpdateInput(graphene.InputObjectType):
@@ -144,6 +146,7 @@ class WebhookUpdate(ModelMutation):
                     for event in events
                 ]
             )
+            invalidate_webhooks_cache()
 
 
 class WebhookDelete(ModelDeleteMutation):
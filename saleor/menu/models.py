@@ -5,15 +5,18 @@ from mptt.models import MPTTModel
 
 from ..core.models import SortableModel
 from ..core.permissions import MenuPermissions
+from ..core.response_cache import ResponseCacheInvalidationMixin, ResponseCacheTag
 from ..core.utils.translations import TranslationProxy
 from ..page.models import Page
 from ..product.models import Category, Collection
 
 
-class Menu(models.Model):
+class Menu(ResponseCacheInvalidationMixin, models.Model):
     name = models.CharField(max_length=128)
     json_content = JSONField(blank=True, default=dict)
 
+    response_cache_tag = ResponseCacheTag.MENU
+
     class Meta:
         ordering = ("pk",)
         permissions = ((MenuPermissions.MANAGE_MENUS.codename, "Manage navigation."),)
@@ -22,7 +25,7 @@ class Menu(models.Model):
         return self.name
 
 
-class MenuItem(MPTTModel, SortableModel):
+class MenuItem(ResponseCacheInvalidationMixin, MPTTModel, SortableModel):
     menu = models.ForeignKey(Menu, related_name="items", on_delete=models.CASCADE)
     name = models.CharField(max_length=128)
     parent = models.ForeignKey(
@@ -43,6 +46,8 @@ class MenuItem(MPTTModel, SortableModel):
     tree = TreeManager()
     translated = TranslationProxy()
 
+    response_cache_tag = ResponseCacheTag.MENU
+
     class Meta:
         ordering = ("sort_order",)
         app_label = "menu"
@@ -0,0 +1,10 @@
+from typing import List
+
+from ..celeryconf import app
+from .utils import update_menus
+
+
+@app.task
+def update_menus_task(menu_ids: List[int]):
+    """Rebuild the content of menus after the objects linked to them changed."""
+    update_menus(menu_ids)
@@ -1,50 +1,171 @@
-from django.db import transaction
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Type
 
-from ..menu.models import Menu
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Model
+
+from ..menu.models import Menu, MenuItem, MenuItemTranslation
+from ..page.models import Page
+from ..product.models import Category, Collection
+
+# Fields of the objects linked to menu items stored in the compiled menus, other
+# fields are fetched from the database when accessed
+CATEGORY_FIELDS = ["id", "name", "slug", "parent_id", "level"]
+COLLECTION_FIELDS = ["id", "name", "slug", "is_published"]
+PAGE_FIELDS = ["id", "title", "slug", "is_published"]
+
+
+def _get_linked_object_as_dict(obj: Optional[Model], fields: List[str]):
+    if obj is None:
+        return None
+    return {field: getattr(obj, field) for field in fields}
 
 
 def get_menu_item_as_dict(menu_item):
     data = {}
+    data["id"] = menu_item.pk
     data["url"] = menu_item.url or ""
     data["name"] = menu_item.name
+    data["sort_order"] = menu_item.sort_order
+    data["level"] = menu_item.level
+    data["parent_id"] = menu_item.parent_id
+    data["category"] = _get_linked_object_as_dict(menu_item.category, CATEGORY_FIELDS)
+    data["collection"] = _get_linked_object_as_dict(
+        menu_item.collection, COLLECTION_FIELDS
+    )
+    data["page"] = _get_linked_object_as_dict(menu_item.page, PAGE_FIELDS)
     data["translations"] = {
-        translated.language_code: {"name": translated.name}
+        translated.language_code: {"id": translated.pk, "name": translated.name}
         for translated in menu_item.translations.all()
     }
     return data
 
 
 def get_menu_as_json(menu):
-    """Build a tree structure from top menu items, its children and grandchildren."""
-    top_items = menu.items.filter(parent=None).prefetch_related(
-        "category",
-        "page",
-        "collection",
-        "children__category",
-        "children__page",
-        "children__collection",
-        "children__children__category",
-        "children__children__page",
-        "children__children__collection",
-        "translations",
-        "children__translations",
-        "children__children__translations",
+    """Build a tree structure from all menu items, regardless of their depth."""
+    items = (
+        MenuItem.objects.filter(menu=menu)
+        .select_related("category", "collection", "page")
+        .prefetch_related("translations")
+        .order_by("sort_order", "pk")
     )
-    menu_data = []
-    for item in top_items:
-        top_item_data = get_menu_item_as_dict(item)
-        top_item_data["child_items"] = []
-        children = item.children.all()
-        for child in children:
-            child_data = get_menu_item_as_dict(child)
-            grand_children = child.children.all()
-            grand_children_data = [
-                get_menu_item_as_dict(grand_child) for grand_child in grand_children
-            ]
-            child_data["child_items"] = grand_children_data
-            top_item_data["child_items"].append(child_data)
-        menu_data.append(top_item_data)
-    return menu_data
+    items_by_parent: Dict[Optional[int], List[MenuItem]] = defaultdict(list)
+    for item in items:
+        items_by_parent[item.parent_id].append(item)
+
+    def get_items_data(parent_id):
+        items_data = []
+        for item in items_by_parent[parent_id]:
+            item_data = get_menu_item_as_dict(item)
+            item_data["child_items"] = get_items_data(item.pk)
+            items_data.append(item_data)
+        return items_data
+
+    return get_items_data(None)
+
+
+def _get_instance_from_dict(model: Type[Model], data: dict):
+    """Return an instance with the given field values, as if fetched from database.
+
+    Fields missing in the data are deferred and fetched when accessed.
+    """
+    field_names = [
+        field.attname for field in model._meta.concrete_fields if field.attname in data
+    ]
+    values = [data[field_name] for field_name in field_names]
+    return model.from_db(DEFAULT_DB_ALIAS, field_names, values)
+
+
+def _get_linked_object_from_dict(model: Type[Model], data: Optional[dict]):
+    return _get_instance_from_dict(model, data) if data is not None else None
+
+
+def _get_menu_items_from_json(
+    menu: Menu, items_data: List[dict], parent: Optional[MenuItem] = None
+) -> List[MenuItem]:
+    items = []
+    for item_data in items_data:
+        category = _get_linked_object_from_dict(Category, item_data["category"])
+        collection = _get_linked_object_from_dict(Collection, item_data["collection"])
+        page = _get_linked_object_from_dict(Page, item_data["page"])
+        item = _get_instance_from_dict(
+            MenuItem,
+            {
+                "id": item_data["id"],
+                "menu_id": menu.pk,
+                "name": item_data["name"],
+                "url": item_data["url"] or None,
+                "sort_order": item_data["sort_order"],
+                "level": item_data["level"],
+                "parent_id": item_data["parent_id"],
+                "category_id": category.pk if category else None,
+                "collection_id": collection.pk if collection else None,
+                "page_id": page.pk if page else None,
+            },
+        )
+        item.menu = menu
+        item.parent = parent
+        item.category = category
+        item.collection = collection
+        item.page = page
+        item.compiled_translations = {
+            language_code: _get_instance_from_dict(
+                MenuItemTranslation,
+                {
+                    "id": translation["id"],
+                    "language_code": language_code,
+                    "menu_item_id": item.pk,
+                    "name": translation["name"],
+                },
+            )
+            for language_code, translation in item_data["translations"].items()
+        }
+        item.compiled_children = _get_menu_items_from_json(
+            menu, item_data["child_items"], parent=item
+        )
+        items.append(item)
+    return items
+
+
+def is_menu_compiled(menu: Menu) -> bool:
+    """Check if the menu content was built in the current format."""
+    content = menu.json_content
+    return isinstance(content, list) and all("id" in item for item in content)
+
+
+def get_compiled_menu_items(menu: Menu) -> Optional[List[MenuItem]]:
+    """Return top level items of the menu built from its compiled content.
+
+    Items have their children stored in `compiled_children` and translations in
+    `compiled_translations`. `None` is returned if the menu was not compiled yet.
+    """
+    if not is_menu_compiled(menu):
+        return None
+    return _get_menu_items_from_json(menu, menu.json_content)
+
+
+def get_menu_ids_linked_to(**lookup) -> List[int]:
+    """Return IDs of the menus with items matching the lookup."""
+    return list(
+        MenuItem.objects.filter(**lookup)
+        .order_by()
+        .values_list("menu_id", flat=True)
+        .distinct()
+    )
+
+
+def schedule_menus_update(menu_ids: Iterable[int]):
+    """Rebuild the content of the menus in the background."""
+    from .tasks import update_menus_task
+
+    menu_ids = list(menu_ids)
+    if menu_ids:
+        update_menus_task.delay(menu_ids)
+
+
+def update_menus_linked_to(**lookup):
+    """Rebuild in the background the menus with items matching the lookup."""
+    schedule_menus_update(get_menu_ids_linked_to(**lookup))
 
 
 @transaction.atomic
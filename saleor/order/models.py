@@ -5,6 +5,7 @@ from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models import F, Max, Sum
@@ -25,6 +26,7 @@ from ..giftcard.models import GiftCard
 from ..payment import ChargeStatus, TransactionKind
 from ..shipping.models import ShippingMethod
 from . import FulfillmentStatus, OrderEvents, OrderStatus
+from .search import ORDER_SEARCH_DOCUMENT_FIELDS, prepare_order_search_document_value
 
 
 class OrderQueryset(models.QuerySet):
@@ -168,16 +170,52 @@ class Order(ModelWithMetadata):
     weight = MeasurementField(
         measurement=Weight, unit_choices=WeightUnits.CHOICES, default=zero_weight
     )
+    search_document = models.TextField(blank=True, default="")
     objects = OrderQueryset.as_manager()
 
     class Meta:
         ordering = ("-pk",)
         permissions = ((OrderPermissions.MANAGE_ORDERS.codename, "Manage orders."),)
+        indexes = [
+            GinIndex(
+                fields=["search_document"],
+                name="order_search_gin",
+                opclasses=["gin_trgm_ops"],
+            )
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._search_document_values = instance._get_search_document_values()
+        return instance
+
+    def _get_search_document_values(self):
+        # Deferred fields are left out instead of being fetched
+        return {
+            field_name: self.__dict__.get(self._meta.get_field(field_name).attname)
+            for field_name in ORDER_SEARCH_DOCUMENT_FIELDS
+        }
+
+    def _is_search_document_outdated(self, update_fields) -> bool:
+        if update_fields is not None:
+            return bool(ORDER_SEARCH_DOCUMENT_FIELDS.intersection(update_fields))
+        # Orders that weren't fetched from the database have no loaded values
+        loaded_values = getattr(self, "_search_document_values", None)
+        return loaded_values != self._get_search_document_values()
 
     def save(self, *args, **kwargs):
         if not self.token:
             self.token = str(uuid4())
-        return super().save(*args, **kwargs)
+        # Keep the search document in sync with the fields it is built from
+        update_fields = kwargs.get("update_fields")
+        if self._is_search_document_outdated(update_fields):
+            self.search_document = prepare_order_search_document_value(self)
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | {"search_document"}
+        result = super().save(*args, **kwargs)
+        self._search_document_values = self._get_search_document_values()
+        return result
 
     def is_fully_paid(self):
         total_paid = self._total_paid()
@@ -0,0 +1,43 @@
+from typing import TYPE_CHECKING, List
+
+from ..account.search import (
+    join_search_document_values,
+    prepare_address_search_document_value,
+)
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from .models import Order
+
+# Fields of the order that are a part of its search document; saving any of them
+# refreshes the document
+ORDER_SEARCH_DOCUMENT_FIELDS = {
+    "token",
+    "user",
+    "user_email",
+    "discount_name",
+    "translated_discount_name",
+    "billing_address",
+}
+
+ORDER_SEARCH_BATCH_SIZE = 1000
+
+
+def prepare_order_search_document_value(order: "Order") -> str:
+    """Return the search document of the order.
+
+    The document holds the order's token, customer email, discount names and
+    the customer data known at the time of saving the order: the names and the
+    email of the assigned user and the billing address.
+    """
+    values: List[str] = [
+        order.token,
+        order.user_email,
+        order.discount_name,
+        order.translated_discount_name,
+    ]
+    user = order.user
+    if user:
+        values.extend([user.email, user.first_name, user.last_name])
+    values.append(prepare_address_search_document_value(order.billing_address))
+    return join_search_document_values(values)
@@ -0,0 +1,7 @@
+from ..celeryconf import app
+from .utils import update_user_orders_search_document
+
+
+@app.task
+def update_user_orders_search_document_task(user_id: int):
+    update_user_orders_search_document(user_id)
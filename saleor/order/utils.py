@@ -13,6 +13,7 @@ from ..discount.utils import get_products_voucher_discount, validate_voucher_in_
 from ..extensions.manager import get_extensions_manager
 from ..order import OrderStatus
 from ..order.models import Order, OrderLine
+from ..order.search import ORDER_SEARCH_BATCH_SIZE, prepare_order_search_document_value
 from ..product.utils.digital_products import get_default_digital_content_settings
 from ..shipping.models import ShippingMethod
 from ..warehouse.availability import check_stock_quantity
@@ -338,3 +339,26 @@ def get_voucher_discount_for_order(order: Order) -> Money:
 
 def match_orders_with_new_user(user: User) -> None:
     Order.objects.confirmed().filter(user_email=user.email, user=None).update(user=user)
+    update_user_orders_search_document(user.pk)
+
+
+def update_user_orders_search_document(user_id: int):
+    """Rebuild the search documents of the user's orders.
+
+    Orders copy the email and the names of their user into their search documents,
+    so the documents have to be refreshed whenever the user's data changes.
+    """
+    orders = Order.objects.filter(user_id=user_id).select_related(
+        "user", "billing_address"
+    )
+    last_pk = 0
+    while True:
+        batch = list(
+            orders.filter(pk__gt=last_pk).order_by("pk")[:ORDER_SEARCH_BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for order in batch:
+            order.search_document = prepare_order_search_document_value(order)
+        Order.objects.bulk_update(batch, ["search_document"])
+        last_pk = batch[-1].pk
@@ -4,6 +4,7 @@ from draftjs_sanitizer import clean_draft_js
 from ..core.db.fields import SanitizedJSONField
 from ..core.models import PublishableModel, PublishedQuerySet
 from ..core.permissions import PagePermissions
+from ..core.response_cache import ResponseCacheInvalidationMixin, ResponseCacheTag
 from ..core.utils.translations import TranslationProxy
 from ..seo.models import SeoModel, SeoModelTranslation
 
@@ -14,7 +15,7 @@ class PagePublishedQuerySet(PublishedQuerySet):
         return user.is_active and user.has_perm(PagePermissions.MANAGE_PAGES)
 
 
-class Page(SeoModel, PublishableModel):
+class Page(ResponseCacheInvalidationMixin, SeoModel, PublishableModel):
     slug = models.SlugField(unique=True, max_length=255)
     title = models.CharField(max_length=250)
     content = models.TextField(blank=True)
@@ -26,6 +27,8 @@ class Page(SeoModel, PublishableModel):
     objects = PagePublishedQuerySet.as_manager()
     translated = TranslationProxy()
 
+    response_cache_tag = ResponseCacheTag.PAGE
+
     class Meta:
         ordering = ("slug",)
         permissions = ((PagePermissions.MANAGE_PAGES.codename, "Manage pages."),)
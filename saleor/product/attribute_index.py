@@ -0,0 +1,163 @@
+"""Shared index translating attribute and attribute value slugs to primary keys.
+
+Storefront filtering refers to attributes and their values by slugs. Resolving
+them is done through a two level cache: a small in-process LRU in front of the
+Django cache. All entries are namespaced with a version stamp stored in the
+Django cache, so bumping the stamp with `invalidate_attribute_index` makes every
+process drop its entries at once. Only the slugs that were asked for and are not
+cached yet are fetched from the database.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+ATTRIBUTE_INDEX_VERSION_CACHE_KEY = "product.attribute_index.version"
+ATTRIBUTE_INDEX_CACHE_TIMEOUT = 60 * 60 * 24
+ATTRIBUTE_INDEX_LOCAL_CACHE_SIZE = 10000
+
+AttributeValueKey = Tuple[int, str]
+
+
+class _LRUCache:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._lock = Lock()
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, int]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    found[key] = self._data[key]
+        return found
+
+    def set_many(self, items: Dict[Hashable, int]):
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = value
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local_cache = _LRUCache(ATTRIBUTE_INDEX_LOCAL_CACHE_SIZE)
+
+
+def get_attribute_index_version() -> str:
+    version = cache.get(ATTRIBUTE_INDEX_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(ATTRIBUTE_INDEX_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+        version = cache.get(ATTRIBUTE_INDEX_VERSION_CACHE_KEY)
+    return version
+
+
+def _bump_attribute_index_version():
+    cache.set(ATTRIBUTE_INDEX_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+
+
+def invalidate_attribute_index():
+    """Drop the index in all processes.
+
+    Has to be called whenever an attribute or a value is created, deleted
+    or its slug changes. The version is bumped once the current transaction is
+    committed, so the slugs from before the change can't be cached under it.
+    """
+    transaction.on_commit(_bump_attribute_index_version)
+
+
+def clear_attribute_index_local_cache():
+    """Drop the entries cached by the current process."""
+    _local_cache.clear()
+
+
+def _get_cache_key(version: str, namespace: str, key: Hashable) -> str:
+    parts = key if isinstance(key, tuple) else (key,)
+    return ":".join(["attribute_index", version, namespace, *map(str, parts)])
+
+
+def _lookup(
+    namespace: str,
+    keys: List[Hashable],
+    fetch: Callable[[List[Hashable]], Dict[Hashable, int]],
+) -> Dict[Hashable, int]:
+    version = get_attribute_index_version()
+    local_keys = {key: (version, namespace, key) for key in keys}
+    found = {
+        key[2]: pk
+        for key, pk in _local_cache.get_many(local_keys.values()).items()
+    }
+
+    missing = [key for key in keys if key not in found]
+    if missing:
+        cache_keys = {_get_cache_key(version, namespace, key): key for key in missing}
+        from_cache = {
+            cache_keys[cache_key]: pk
+            for cache_key, pk in cache.get_many(cache_keys.keys()).items()
+        }
+        missing = [key for key in missing if key not in from_cache]
+        from_db = fetch(missing) if missing else {}
+        if from_db:
+            cache.set_many(
+                {
+                    cache_key: from_db[key]
+                    for cache_key, key in cache_keys.items()
+                    if key in from_db
+                },
+                timeout=ATTRIBUTE_INDEX_CACHE_TIMEOUT,
+            )
+        fetched = {**from_cache, **from_db}
+        _local_cache.set_many({local_keys[key]: pk for key, pk in fetched.items()})
+        found.update(fetched)
+    return found
+
+
+def _fetch_attribute_pks(slugs: List[str]) -> Dict[str, int]:
+    from .models import Attribute
+
+    return dict(Attribute.objects.filter(slug__in=slugs).values_list("slug", "pk"))
+
+
+def _fetch_attribute_value_pks(
+    keys: List[AttributeValueKey],
+) -> Dict[AttributeValueKey, int]:
+    from .models import AttributeValue
+
+    attribute_pks = {attribute_pk for attribute_pk, _slug in keys}
+    slugs = {slug for _attribute_pk, slug in keys}
+    values = AttributeValue.objects.filter(
+        attribute_id__in=attribute_pks, slug__in=slugs
+    ).values_list("attribute_id", "slug", "pk")
+    requested = set(keys)
+    return {
+        (attribute_pk, slug): pk
+        for attribute_pk, slug, pk in values
+        if (attribute_pk, slug) in requested
+    }
+
+
+def get_attribute_pks(slugs: Iterable[str]) -> Dict[str, int]:
+    """Return the primary keys of attributes with the given slugs.
+
+    Slugs of nonexistent attributes are not included in the result.
+    """
+    return _lookup("attribute", list(set(slugs)), _fetch_attribute_pks)
+
+
+def get_attribute_value_pks(
+    keys: Iterable[AttributeValueKey],
+) -> Dict[AttributeValueKey, int]:
+    """Return the primary keys of values given as `(attribute_pk, slug)` pairs.
+
+    Pairs not matching any value are not included in the result.
+    """
+    return _lookup("value", list(set(keys)), _fetch_attribute_value_pks)
@@ -1,23 +1,49 @@
 import logging
+import time
 
 from django.core.management.base import BaseCommand
-from tqdm import tqdm
 
 from ....discount.utils import fetch_active_discounts
 from ...models import Product
-from ...utils.variant_prices import update_product_minimal_variant_price
+from ...utils.variant_prices import (
+    MINIMAL_VARIANT_PRICES_BATCH_SIZE,
+    update_minimal_variant_prices_in_batches,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class Command(BaseCommand):
-    help = "Generate thumbnails for all images"
+    help = 'Update the "minimal_variant_price" field of all the products.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=MINIMAL_VARIANT_PRICES_BATCH_SIZE,
+            help="Number of products updated at once.",
+        )
 
     def handle(self, *args, **options):
         self.stdout.write('Updating "minimal_variant_price" field of all the products.')
+        started = time.monotonic()
         # Fetching the discounts just once and reusing them
         discounts = fetch_active_discounts()
-        # Run the update on all the products with "progress bar" (tqdm)
-        qs = Product.objects.all()
-        for product in tqdm(qs.iterator(), total=qs.count()):
-            update_product_minimal_variant_price(product, discounts=discounts)
+        product_pks = list(Product.objects.values_list("pk", flat=True))
+        processed = updated = 0
+        batches = update_minimal_variant_prices_in_batches(
+            product_pks, discounts, batch_size=options["batch_size"]
+        )
+        for batch_processed, batch_updated in batches:
+            processed += batch_processed
+            updated += batch_updated
+            elapsed = time.monotonic() - started
+            products_per_second = processed / elapsed if elapsed else 0.0
+            self.stdout.write(
+                f"  {processed}/{len(product_pks)} products, {updated} updated, "
+                f"{products_per_second:.1f} products/s"
+            )
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f"Updated {updated} of {processed} products in {elapsed:.2f}s."
+        )
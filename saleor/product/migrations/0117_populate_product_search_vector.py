@@ -0,0 +1,65 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import TextField, Value
+
+BATCH_SIZE = 500
+
+
+def _search_vector(value, weight):
+    return SearchVector(Value(value, output_field=TextField()), weight=weight)
+
+
+def populate_product_search_vector(apps, schema_editor):
+    Product = apps.get_model("product", "Product")
+    products = (
+        Product.objects.filter(search_vector__isnull=True)
+        .select_related("category")
+        .prefetch_related("variants", "attributes__values")
+        .order_by("pk")
+    )
+    last_pk = 0
+    while True:
+        batch = list(products.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not batch:
+            break
+        for product in batch:
+            vectors = [_search_vector(product.name, "A")]
+            vectors.extend(
+                _search_vector(variant.sku, "A") for variant in product.variants.all()
+            )
+            if product.category:
+                vectors.append(_search_vector(product.category.name, "B"))
+            for assigned_attribute in product.attributes.all():
+                vectors.extend(
+                    _search_vector(value.name, "B")
+                    for value in assigned_attribute.values.all()
+                )
+            if product.description:
+                vectors.append(_search_vector(product.description, "C"))
+            search_vector = vectors[0]
+            for vector in vectors[1:]:
+                search_vector += vector
+            product.search_vector = search_vector
+        Product.objects.bulk_update(batch, ["search_vector"])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0037_auto_20171124_0847"),
+        ("product", "0116_product_search_vector"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_product_search_vector, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="product_name_trgm_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -4,6 +4,8 @@ from uuid import uuid4
 from django.conf import settings
 from django.contrib.postgres.aggregates import StringAgg
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.db.models import Case, Count, F, FilteredRelation, Q, When
 from django.urls import reverse
@@ -27,14 +29,16 @@ from ..core.models import (
     SortableModel,
 )
 from ..core.permissions import ProductPermissions
+from ..core.response_cache import ResponseCacheInvalidationMixin, ResponseCacheTag
 from ..core.utils import build_absolute_uri
 from ..core.utils.draftjs import json_content_to_raw_text
 from ..core.utils.translations import TranslationProxy
 from ..core.weight import WeightUnits, zero_weight
 from ..discount import DiscountInfo
-from ..discount.utils import calculate_discounted_price
+from ..discount.utils import calculate_discounted_price, calculate_variants_prices
 from ..seo.models import SeoModel, SeoModelTranslation
 from . import AttributeInputType
+from .attribute_index import invalidate_attribute_index
 
 if TYPE_CHECKING:
     # flake8: noqa
@@ -44,7 +48,9 @@ if TYPE_CHECKING:
     from django.db.models import OrderBy
 
 
-class Category(MPTTModel, ModelWithMetadata, SeoModel):
+class Category(
+    ResponseCacheInvalidationMixin, MPTTModel, ModelWithMetadata, SeoModel
+):
     name = models.CharField(max_length=250)
     slug = models.SlugField(max_length=255, unique=True)
     description = models.TextField(blank=True)
@@ -61,6 +67,8 @@ class Category(MPTTModel, ModelWithMetadata, SeoModel):
     tree = TreeManager()
     translated = TranslationProxy()
 
+    response_cache_tag = ResponseCacheTag.CATEGORY
+
     def __str__(self) -> str:
         return self.name
 
@@ -90,7 +98,7 @@ class CategoryTranslation(SeoModelTranslation):
         )
 
 
-class ProductType(ModelWithMetadata):
+class ProductType(ResponseCacheInvalidationMixin, ModelWithMetadata):
     name = models.CharField(max_length=250)
     slug = models.SlugField(max_length=255, unique=True)
     has_variants = models.BooleanField(default=True)
@@ -100,6 +108,8 @@ class ProductType(ModelWithMetadata):
         measurement=Weight, unit_choices=WeightUnits.CHOICES, default=zero_weight
     )
 
+    response_cache_tag = ResponseCacheTag.PRODUCT_TYPE
+
     class Meta:
         app_label = "product"
 
@@ -139,12 +149,21 @@ class ProductsQueryset(PublishedQuerySet):
         Make sure every product has "minimal_variant_price" set. Otherwise
         make it default to the "price".
         """
+        from .search import prepare_product_base_search_vector_value
+
+        without_search_vector = []
         for obj in objs:
             if obj.minimal_variant_price_amount is None:
                 obj.minimal_variant_price_amount = obj.price.amount
-        return super().bulk_create(
+            if obj.search_vector is None:
+                obj.search_vector = prepare_product_base_search_vector_value(obj)
+                without_search_vector.append(obj)
+        objs = super().bulk_create(
             objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts
         )
+        for obj in without_search_vector:
+            obj.defer_search_vector()
+        return objs
 
     def collection_sorted(self, user: "User"):
         qs = self.visible_to_user(user).prefetch_related(
@@ -237,7 +256,9 @@ class ProductsQueryset(PublishedQuerySet):
         return qs
 
 
-class Product(SeoModel, ModelWithMetadata, PublishableModel):
+class Product(
+    ResponseCacheInvalidationMixin, SeoModel, ModelWithMetadata, PublishableModel
+):
     product_type = models.ForeignKey(
         ProductType, related_name="products", on_delete=models.CASCADE
     )
@@ -278,15 +299,27 @@ class Product(SeoModel, ModelWithMetadata, PublishableModel):
     weight = MeasurementField(
         measurement=Weight, unit_choices=WeightUnits.CHOICES, blank=True, null=True
     )
+    search_vector = SearchVectorField(null=True, blank=True)
+
     objects = ProductsQueryset.as_manager()
     translated = TranslationProxy()
 
+    response_cache_tag = ResponseCacheTag.PRODUCT
+
     class Meta:
         app_label = "product"
         ordering = ("name",)
         permissions = (
             (ProductPermissions.MANAGE_PRODUCTS.codename, "Manage products."),
         )
+        indexes = [
+            GinIndex(fields=["search_vector"], name="product_search_gin"),
+            GinIndex(
+                fields=["name"],
+                name="product_name_trgm_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     def __iter__(self):
         if not hasattr(self, "__variants"):
@@ -308,11 +341,33 @@ class Product(SeoModel, ModelWithMetadata, PublishableModel):
     def save(
         self, force_insert=False, force_update=False, using=None, update_fields=None
     ):
+        from .search import prepare_product_base_search_vector_value
+
         # Make sure the "minimal_variant_price_amount" is set
         if self.minimal_variant_price_amount is None:
             self.minimal_variant_price_amount = self.price_amount
 
-        return super().save(force_insert, force_update, using, update_fields)
+        # Make sure the "search_vector" is set, so the product can be searched for
+        # before its full search document is computed
+        set_search_vector = (
+            update_fields is None
+            and "search_vector" in self.__dict__
+            and self.search_vector is None
+        )
+        if set_search_vector:
+            self.search_vector = prepare_product_base_search_vector_value(self)
+        result = super().save(force_insert, force_update, using, update_fields)
+        if set_search_vector:
+            self.defer_search_vector()
+        return result
+
+    def defer_search_vector(self):
+        """Forget the search vector expression assigned to the instance.
+
+        Once saved, the field is deferred, so later saves don't overwrite the full
+        search document with the expression and reading it fetches the value.
+        """
+        del self.search_vector
 
     @property
     def plain_text_description(self) -> str:
@@ -326,7 +381,7 @@ class Product(SeoModel, ModelWithMetadata, PublishableModel):
         self, discounts: Optional[Iterable[DiscountInfo]] = None
     ) -> MoneyRange:
         if self.variants.all():
-            prices = [variant.get_price(discounts) for variant in self]
+            prices = list(calculate_variants_prices(self, discounts).values())
             return MoneyRange(min(prices), max(prices))
         price = calculate_discounted_price(self, self.price, discounts)
         return MoneyRange(start=price, stop=price)
@@ -393,7 +448,7 @@ class ProductVariantQueryset(models.QuerySet):
         return variants
 
 
-class ProductVariant(ModelWithMetadata):
+class ProductVariant(ResponseCacheInvalidationMixin, ModelWithMetadata):
     sku = models.CharField(max_length=255, unique=True)
     name = models.CharField(max_length=255, blank=True)
     currency = models.CharField(
@@ -431,6 +486,8 @@ class ProductVariant(ModelWithMetadata):
     objects = ProductVariantQueryset.as_manager()
     translated = TranslationProxy()
 
+    response_cache_tag = ResponseCacheTag.PRODUCT
+
     class Meta:
         app_label = "product"
 
@@ -611,7 +668,7 @@ class AssociatedAttributeQuerySet(BaseAttributeQuerySet):
         return self.filter(attribute__visible_in_storefront=True)
 
 
-class AttributeProduct(SortableModel):
+class AttributeProduct(ResponseCacheInvalidationMixin, SortableModel):
     attribute = models.ForeignKey(
         "Attribute", related_name="attributeproduct", on_delete=models.CASCADE
     )
@@ -628,6 +685,8 @@ class AttributeProduct(SortableModel):
 
     objects = AssociatedAttributeQuerySet.as_manager()
 
+    response_cache_tag = ResponseCacheTag.ATTRIBUTE
+
     class Meta:
         unique_together = (("attribute", "product_type"),)
         ordering = ("sort_order",)
@@ -636,7 +695,7 @@ class AttributeProduct(SortableModel):
         return self.product_type.attributeproduct.all()
 
 
-class AttributeVariant(SortableModel):
+class AttributeVariant(ResponseCacheInvalidationMixin, SortableModel):
     attribute = models.ForeignKey(
         "Attribute", related_name="attributevariant", on_delete=models.CASCADE
     )
@@ -653,6 +712,8 @@ class AttributeVariant(SortableModel):
 
     objects = AssociatedAttributeQuerySet.as_manager()
 
+    response_cache_tag = ResponseCacheTag.ATTRIBUTE
+
     class Meta:
         unique_together = (("attribute", "product_type"),)
         ordering = ("sort_order",)
@@ -696,7 +757,7 @@ class AttributeQuerySet(BaseAttributeQuerySet):
         return self._get_sorted_m2m_field("attributevariant", asc)
 
 
-class Attribute(ModelWithMetadata):
+class Attribute(ResponseCacheInvalidationMixin, ModelWithMetadata):
     slug = models.SlugField(max_length=250, unique=True)
     name = models.CharField(max_length=255)
 
@@ -734,12 +795,22 @@ class Attribute(ModelWithMetadata):
     objects = AttributeQuerySet.as_manager()
     translated = TranslationProxy()
 
+    response_cache_tag = ResponseCacheTag.ATTRIBUTE
+
     class Meta:
         ordering = ("storefront_search_position", "slug")
 
     def __str__(self) -> str:
         return self.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_attribute_index()
+
+    def delete(self, *args, **kwargs):
+        super().delete(*args, **kwargs)
+        invalidate_attribute_index()
+
     def has_values(self) -> bool:
         return self.values.exists()
 
@@ -767,7 +838,7 @@ class AttributeTranslation(models.Model):
         return self.name
 
 
-class AttributeValue(SortableModel):
+class AttributeValue(ResponseCacheInvalidationMixin, SortableModel):
     name = models.CharField(max_length=250)
     value = models.CharField(max_length=100, blank=True, default="")
     slug = models.SlugField(max_length=255)
@@ -777,6 +848,8 @@ class AttributeValue(SortableModel):
 
     translated = TranslationProxy()
 
+    response_cache_tag = ResponseCacheTag.ATTRIBUTE
+
     class Meta:
         ordering = ("sort_order", "id")
         unique_together = ("slug", "attribute")
@@ -791,6 +864,14 @@ class AttributeValue(SortableModel):
     def get_ordering_queryset(self):
         return self.attribute.values.all()
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_attribute_index()
+
+    def delete(self, *args, **kwargs):
+        super().delete(*args, **kwargs)
+        invalidate_attribute_index()
+
 
 class AttributeValueTranslation(models.Model):
     language_code = models.CharField(max_length=10)
@@ -815,7 +896,7 @@ class AttributeValueTranslation(models.Model):
         return self.name
 
 
-class ProductImage(SortableModel):
+class ProductImage(ResponseCacheInvalidationMixin, SortableModel):
     product = models.ForeignKey(
         Product, related_name="images", on_delete=models.CASCADE
     )
@@ -823,6 +904,8 @@ class ProductImage(SortableModel):
     ppoi = PPOIField()
     alt = models.CharField(max_length=128, blank=True)
 
+    response_cache_tag = ResponseCacheTag.PRODUCT
+
     class Meta:
         ordering = ("sort_order",)
         app_label = "product"
@@ -855,7 +938,9 @@ class CollectionProduct(SortableModel):
         return self.product.collectionproduct.all()
 
 
-class Collection(SeoModel, ModelWithMetadata, PublishableModel):
+class Collection(
+    ResponseCacheInvalidationMixin, SeoModel, ModelWithMetadata, PublishableModel
+):
     name = models.CharField(max_length=250, unique=True)
     slug = models.SlugField(max_length=255, unique=True)
     products = models.ManyToManyField(
@@ -874,6 +959,8 @@ class Collection(SeoModel, ModelWithMetadata, PublishableModel):
 
     translated = TranslationProxy()
 
+    response_cache_tag = ResponseCacheTag.COLLECTION
+
     class Meta:
         ordering = ("slug",)
 
@@ -0,0 +1,92 @@
+from typing import Iterable, List
+
+from django.contrib.postgres.search import SearchVector
+from django.db.models import Prefetch, TextField, Value
+
+from .models import AssignedProductAttribute, Product
+
+PRODUCT_SEARCH_BATCH_SIZE = 500
+
+
+def _search_vector(value: str, weight: str) -> SearchVector:
+    return SearchVector(Value(value, output_field=TextField()), weight=weight)
+
+
+def prepare_product_search_vector_value(product: Product) -> SearchVector:
+    """Return the expression computing the search document of the product.
+
+    Product name and variants' SKUs have the highest weight, followed by the
+    category name and the assigned attribute values, then the description.
+
+    Note: you have to prefetch the below fields.
+        - category
+        - variants
+        - attributes -> values
+    """
+    vectors: List[SearchVector] = [_search_vector(product.name, "A")]
+    vectors.extend(
+        _search_vector(variant.sku, "A") for variant in product.variants.all()
+    )
+    if product.category:
+        vectors.append(_search_vector(product.category.name, "B"))
+    for assigned_attribute in product.attributes.all():
+        vectors.extend(
+            _search_vector(value.name, "B") for value in assigned_attribute.values.all()
+        )
+    if product.description:
+        vectors.append(_search_vector(product.description, "C"))
+
+    search_vector = vectors[0]
+    for vector in vectors[1:]:
+        search_vector += vector
+    return search_vector
+
+
+def prepare_product_base_search_vector_value(product: Product) -> SearchVector:
+    """Return the search document built from the product's own fields.
+
+    Products get it when they are saved without a search document, so they can
+    be found until the full document is computed.
+    """
+    search_vector = _search_vector(product.name, "A")
+    if product.description:
+        search_vector += _search_vector(product.description, "C")
+    return search_vector
+
+
+def prefetch_search_document_data(queryset):
+    return queryset.select_related("category").prefetch_related(
+        "variants",
+        Prefetch(
+            "attributes",
+            queryset=AssignedProductAttribute.objects.prefetch_related("values"),
+        ),
+    )
+
+
+def update_products_search_vector(products: Iterable[Product]):
+    """Recompute and store the search document of the given products.
+
+    The products are expected to be fetched with `prefetch_search_document_data`.
+    """
+    products = list(products)
+    for product in products:
+        product.search_vector = prepare_product_search_vector_value(product)
+    Product.objects.bulk_update(
+        products, ["search_vector"], batch_size=PRODUCT_SEARCH_BATCH_SIZE
+    )
+
+
+def update_product_search_vector(product: Product):
+    products = prefetch_search_document_data(Product.objects.filter(pk=product.pk))
+    update_products_search_vector(products)
+
+
+def update_products_search_vector_by_ids(product_ids: Iterable[int]):
+    ids = sorted(set(product_ids))
+    for start in range(0, len(ids), PRODUCT_SEARCH_BATCH_SIZE):
+        batch_ids = ids[start : start + PRODUCT_SEARCH_BATCH_SIZE]
+        products = prefetch_search_document_data(
+            Product.objects.filter(pk__in=batch_ids)
+        )
+        update_products_search_vector(products)
@@ -3,6 +3,7 @@ from typing import Iterable, List, Optional
 from ..celeryconf import app
 from ..discount.models import Sale
 from .models import Attribute, Product, ProductType, ProductVariant
+from .search import update_products_search_vector_by_ids
 from .utils.attributes import generate_name_for_variant
 from .utils.variant_prices import (
     update_product_minimal_variant_price,
@@ -68,3 +69,8 @@ def update_products_minimal_variant_prices_of_discount_task(discount_pk: int):
 def update_products_minimal_variant_prices_task(product_ids: List[int]):
     products = Product.objects.filter(pk__in=product_ids)
     update_products_minimal_variant_prices(products)
+
+
+@app.task
+def update_products_search_vector_task(product_ids: List[int]):
+    update_products_search_vector_by_ids(product_ids)
@@ -6,6 +6,8 @@ from django import template
 from django.conf import settings
 from django.templatetags.static import static
 
+from ...core.thumbnails import get_thumbnail_url
+
 logger = logging.getLogger(__name__)
 register = template.Library()
 
@@ -87,13 +89,11 @@ def get_thumbnail(image_file, size, method, rendition_key_set="products"):
     if image_file:
         used_size = get_thumbnail_size(size, method, rendition_key_set)
         try:
-            thumbnail = getattr(image_file, method)[used_size]
+            return get_thumbnail_url(image_file, method, used_size)
         except Exception:
             logger.exception(
                 "Thumbnail fetch failed", extra={"image_file": image_file, "size": size}
             )
-        else:
-            return thumbnail.url
     return static(choose_placeholder("%sx%s" % (size, size)))
 
 
@@ -34,21 +34,29 @@ def delete_categories(categories_ids: List[str]):
     """Delete categories and perform all necessary actions.
 
     Set products of deleted categories as unpublished, delete categories
-    and update products minimal variant prices.
+    and update products minimal variant prices and menus linked to them.
     """
     from ..models import Product, Category
+    from ...menu.utils import get_menu_ids_linked_to, schedule_menus_update
 
     categories = Category.objects.select_for_update().filter(pk__in=categories_ids)
     categories.prefetch_related("products")
 
     products = Product.objects.none()
+    tree_categories = Category.objects.none()
     for category in categories:
         products = products | collect_categories_tree_products(category)
+        tree_categories = tree_categories | category.get_descendants(
+            include_self=True
+        )
 
     products.update(is_published=False, publication_date=None)
     product_ids = list(products.values_list("id", flat=True))
+    # Menu items linked to the categories are deleted with them
+    menu_ids = get_menu_ids_linked_to(category__in=tree_categories)
     categories.delete()
     update_products_minimal_variant_prices_task.delay(product_ids=product_ids)
+    schedule_menus_update(menu_ids)
 
 
 def collect_categories_tree_products(category: "Category") -> "QuerySet[Product]":
@@ -1,18 +1,31 @@
 import operator
+from collections import defaultdict
 from functools import reduce
+from typing import Dict, Iterable, Iterator, Tuple
 
+from django.db.models import Min, QuerySet
+from django.db.models.functions import Coalesce
 from django.db.models.query_utils import Q
 from prices import Money
 
-from ...discount.utils import fetch_active_discounts
+from ...discount.utils import (
+    calculate_discounted_price,
+    calculate_variants_prices,
+    fetch_active_discounts,
+    get_products_collection_ids,
+    get_sale_index,
+)
 from ..models import Product
 
+# Number of products whose minimal variant prices are computed and saved at once
+MINIMAL_VARIANT_PRICES_BATCH_SIZE = 2000
+
 
 def _get_product_minimal_variant_price(product, discounts) -> Money:
     # Start with the product's price as the minimal one
     minimal_variant_price = product.price
-    for variant in product.variants.all():
-        variant_price = variant.get_price(discounts=discounts)
+    variants_prices = calculate_variants_prices(product.variants.all(), discounts)
+    for variant_price in variants_prices.values():
         minimal_variant_price = min(minimal_variant_price, variant_price)
     return minimal_variant_price
 
@@ -28,22 +41,91 @@ def update_product_minimal_variant_price(product, discounts=None, save=True):
     return product
 
 
-def update_products_minimal_variant_prices(products, discounts=None):
+def _get_minimal_variant_prices(products, discounts) -> Dict[int, Money]:
+    """Return minimal variant prices of the products, keyed by their IDs.
+
+    Products need the `min_variant_base_price_amount` annotation. Discounts
+    never change the order of prices, so the cheapest variant of a product stays
+    the cheapest one once discounted, and only its price has to be discounted.
+    """
+    sale_index = get_sale_index(discounts)
+    if sale_index.has_collection_discounts:
+        collection_ids = get_products_collection_ids(products)
+    else:
+        collection_ids = defaultdict(set)
+    minimal_variant_prices = {}
+    for product in products:
+        # Start with the product's price as the minimal one
+        minimal_variant_price = product.price
+        if product.min_variant_base_price_amount is not None:
+            variant_price = calculate_discounted_price(
+                product,
+                Money(product.min_variant_base_price_amount, product.currency),
+                sale_index,
+                collection_ids[product.pk],
+            )
+            minimal_variant_price = min(minimal_variant_price, variant_price)
+        minimal_variant_prices[product.pk] = minimal_variant_price
+    return minimal_variant_prices
+
+
+def update_minimal_variant_prices_in_batches(
+    product_pks: Iterable[int],
+    discounts=None,
+    batch_size: int = MINIMAL_VARIANT_PRICES_BATCH_SIZE,
+) -> Iterator[Tuple[int, int]]:
+    """Update minimal variant prices of the products, batch by batch.
+
+    Base prices of the cheapest variants are aggregated in the database, then
+    discounted and saved for each batch of products. Yields numbers of the
+    products processed and updated in each batch.
+    """
     if discounts is None:
         discounts = fetch_active_discounts()
-    changed_products_to_update = []
-    for product in products:
-        old_minimal_variant_price = product.minimal_variant_price
-        updated_product = update_product_minimal_variant_price(
-            product, discounts, save=False
+    sale_index = get_sale_index(discounts)
+    product_pks = sorted(set(product_pks))
+    for index in range(0, len(product_pks), batch_size):
+        batch_pks = product_pks[index : index + batch_size]
+        products = list(
+            Product.objects.filter(pk__in=batch_pks)
+            .annotate(
+                # Products without variants are joined with a row of nulls, which
+                # must not count as a variant with the product's price
+                min_variant_base_price_amount=Min(
+                    Coalesce("variants__price_override_amount", "price_amount"),
+                    filter=Q(variants__isnull=False),
+                )
+            )
+            .only(
+                "id",
+                "category_id",
+                "currency",
+                "price_amount",
+                "minimal_variant_price_amount",
+            )
         )
-        # Check if the "minimal_variant_price" has changed
-        if updated_product.minimal_variant_price != old_minimal_variant_price:
-            changed_products_to_update.append(updated_product)
-    # Bulk update the changed products
-    Product.objects.bulk_update(
-        changed_products_to_update, ["minimal_variant_price_amount"]
-    )
+        minimal_variant_prices = _get_minimal_variant_prices(products, sale_index)
+        changed_products = []
+        for product in products:
+            minimal_variant_price = minimal_variant_prices[product.pk]
+            if product.minimal_variant_price != minimal_variant_price:
+                product.minimal_variant_price_amount = minimal_variant_price.amount
+                changed_products.append(product)
+        Product.objects.bulk_update(changed_products, ["minimal_variant_price_amount"])
+        yield len(products), len(changed_products)
+
+
+def update_products_minimal_variant_prices(products, discounts=None) -> int:
+    """Update minimal variant prices of the products.
+
+    Return the number of products whose minimal variant price has changed.
+    """
+    if isinstance(products, QuerySet):
+        product_pks = products.order_by().values_list("pk", flat=True).distinct()
+    else:
+        product_pks = [product.pk for product in products]
+    batches = update_minimal_variant_prices_in_batches(product_pks, discounts)
+    return sum(updated for _, updated in batches)
 
 
 def update_products_minimal_variant_prices_of_catalogues(
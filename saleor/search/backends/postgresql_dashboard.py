@@ -0,0 +1,34 @@
+from django.db.models import Q
+
+
+def search_orders(qs, phrase):
+    """Return orders matching the phrase for dashboard views.
+
+    The phrase is matched against the precomputed, trigram indexed search
+    document of the orders. Numeric phrases additionally match the order number.
+
+    Args:
+        qs (QuerySet): orders to search through
+        phrase (str): searched phrase
+
+    """
+    phrase = phrase.strip()
+    lookup = Q(search_document__contains=phrase.lower())
+    number = phrase.lstrip("#")
+    if number.isdigit():
+        lookup |= Q(pk=int(number))
+    return qs.filter(lookup)
+
+
+def search_users(qs, phrase):
+    """Return users matching the phrase for dashboard views.
+
+    The phrase is matched against the precomputed, trigram indexed search
+    document of the users.
+
+    Args:
+        qs (QuerySet): users to search through
+        phrase (str): searched phrase
+
+    """
+    return qs.filter(search_document__contains=phrase.strip().lower())
@@ -1,5 +1,5 @@
-from django.contrib.postgres.search import TrigramSimilarity
-from django.db.models import Q
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db.models import F, Q
 
 from ...product.models import Product
 
@@ -8,17 +8,22 @@ def search(phrase):
     """Return matching products for storefront views.
 
     Fuzzy storefront search that is resistant to small typing errors made
-    by user. Name is matched using trigram similarity, description uses
-    standard postgres full text search.
+    by user. Name, SKUs, category, attribute values and description are matched
+    against the precomputed `search_vector` of the product, while typos in the
+    name are matched with the trigram similarity operator. Both lookups are
+    served by GIN indexes. Results are ordered by their full text search rank,
+    then by the name similarity.
 
     Args:
         phrase (str): searched phrase
 
     """
-    name_sim = TrigramSimilarity("name", phrase)
-    ft_in_description = Q(description__search=phrase)
-    ft_by_sku = Q(variants__sku__search=phrase)
-    name_similar = Q(name_sim__gt=0.2)
-    return Product.objects.annotate(name_sim=name_sim).filter(
-        (ft_in_description | name_similar | ft_by_sku)
+    query = SearchQuery(phrase)
+    # Ordering by the expressions rather than by the annotation, as querysets
+    # combined with the results don't keep their annotations
+    return Product.objects.filter(
+        Q(search_vector=query) | Q(name__trigram_similar=phrase)
+    ).order_by(
+        SearchRank(F("search_vector"), query).desc(),
+        TrigramSimilarity("name", phrase).desc(),
     )
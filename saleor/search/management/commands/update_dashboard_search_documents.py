@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from tqdm import tqdm
+
+from ....account.models import User
+from ....account.search import prepare_user_search_document_value
+from ....order.models import Order
+from ....order.search import prepare_order_search_document_value
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Populate the search documents of orders and users used by dashboard."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Update only the objects that have no search document yet.",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.select_related("default_shipping_address")
+        orders = Order.objects.select_related("user", "billing_address")
+        if options["missing_only"]:
+            users = users.filter(search_document="")
+            orders = orders.filter(search_document="")
+
+        self.stdout.write('Updating "search_document" field of the users.')
+        self.update_search_documents(users, prepare_user_search_document_value)
+        self.stdout.write('Updating "search_document" field of the orders.')
+        self.update_search_documents(orders, prepare_order_search_document_value)
+
+    @staticmethod
+    def update_search_documents(qs, prepare_value):
+        progress = tqdm(total=qs.count())
+        last_pk = 0
+        while True:
+            # Paginate by primary key so every batch is a cheap index range scan
+            batch = list(qs.filter(pk__gt=last_pk).order_by("pk")[:BATCH_SIZE])
+            if not batch:
+                break
+            for instance in batch:
+                instance.search_document = prepare_value(instance)
+            qs.model.objects.bulk_update(batch, ["search_document"])
+            last_pk = batch[-1].pk
+            progress.update(len(batch))
+        progress.close()
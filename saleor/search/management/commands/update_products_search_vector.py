@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from tqdm import tqdm
+
+from ....product.models import Product
+from ....product.search import (
+    PRODUCT_SEARCH_BATCH_SIZE,
+    prefetch_search_document_data,
+    update_products_search_vector,
+)
+
+
+class Command(BaseCommand):
+    help = "Populate the search vector of products used by the storefront search."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Update only the products that have no search vector yet.",
+        )
+
+    def handle(self, *args, **options):
+        qs = Product.objects.all()
+        if options["missing_only"]:
+            qs = qs.filter(search_vector__isnull=True)
+        self.stdout.write('Updating "search_vector" field of the products.')
+        progress = tqdm(total=qs.count())
+        last_pk = 0
+        while True:
+            # Paginate by primary key so every batch is a cheap index range scan
+            batch = list(
+                prefetch_search_document_data(
+                    qs.filter(pk__gt=last_pk).order_by("pk")[
+                        :PRODUCT_SEARCH_BATCH_SIZE
+                    ]
+                )
+            )
+            if not batch:
+                break
+            update_products_search_vector(batch)
+            last_pk = batch[-1].pk
+            progress.update(len(batch))
+        progress.close()
@@ -62,6 +62,13 @@ DATABASES = {
     )
 }
 
+# The storefront search matches product names with the pg_trgm similarity operator,
+# lower its default threshold of 0.3 to keep tolerating typos in short names
+if "postgresql" in DATABASES["default"]["ENGINE"]:
+    DATABASES["default"].setdefault("OPTIONS", {}).setdefault(
+        "options", "-c pg_trgm.similarity_threshold=0.2"
+    )
+
 
 TIME_ZONE = "America/Chicago"
 LANGUAGE_CODE = "en"
@@ -386,6 +393,10 @@ TEST_RUNNER = "tests.runner.PytestTestRunner"
 
 PLAYGROUND_ENABLED = get_bool_from_env("PLAYGROUND_ENABLED", True)
 
+# Connections supporting keyset pagination return keyset cursors for their first
+# pages only when enabled; cursors sent by clients are accepted in both formats.
+KEYSET_PAGINATION_ENABLED = get_bool_from_env("KEYSET_PAGINATION_ENABLED", False)
+
 ALLOWED_HOSTS = get_list(os.environ.get("ALLOWED_HOSTS", "localhost,127.0.0.1"))
 ALLOWED_GRAPHQL_ORIGINS = os.environ.get("ALLOWED_GRAPHQL_ORIGINS", "*")
 
@@ -446,6 +457,16 @@ VERSATILEIMAGEFIELD_SETTINGS = {
     "create_images_on_demand": get_bool_from_env("CREATE_IMAGES_ON_DEMAND", DEBUG)
 }
 
+# Number of seconds the thumbnail URLs are kept in the thumbnail manifest. Has to
+# be shorter than the expiration time of signed URLs if the storage uses them.
+THUMBNAIL_MANIFEST_TIMEOUT = int(
+    os.environ.get("THUMBNAIL_MANIFEST_TIMEOUT", 60 * 60 * 24 * 30)
+)
+
+# Number of seconds since the last written shard after which an interrupted export
+# of the product feed is started over instead of being resumed
+FEED_CHECKPOINT_MAX_AGE = int(os.environ.get("FEED_CHECKPOINT_MAX_AGE", 60 * 60))
+
 PLACEHOLDER_IMAGES = {
     60: "images/placeholder60x60.png",
     120: "images/placeholder120x120.png",
@@ -487,6 +508,27 @@ REAL_IP_ENVIRON = os.environ.get("REAL_IP_ENVIRON", "REMOTE_ADDR")
 # The maximum length of a graphql query to log in tracings
 OPENTRACING_MAX_QUERY_LENGTH_LOG = 2000
 
+# Number of parsed and validated GraphQL documents kept in memory by each process
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.environ.get("GRAPHQL_DOCUMENT_CACHE_SIZE", 1000))
+
+# Number of seconds automatic persisted queries are kept in the cache
+GRAPHQL_PERSISTED_QUERY_TIMEOUT = int(
+    os.environ.get("GRAPHQL_PERSISTED_QUERY_TIMEOUT", 60 * 60 * 24 * 7)
+)
+
+# Number of seconds the active discounts are shared between requests. They are
+# fetched again earlier when sales change or when a sale starts or ends. Set to 0
+# to fetch them on every request.
+ACTIVE_DISCOUNTS_CACHE_TIMEOUT = int(
+    os.environ.get("ACTIVE_DISCOUNTS_CACHE_TIMEOUT", 60 * 60)
+)
+
+# Number of seconds responses to anonymous storefront queries are cached for.
+# Responses are not cached when set to 0.
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = int(
+    os.environ.get("GRAPHQL_RESPONSE_CACHE_TIMEOUT", 0)
+)
+
 # Slugs for menus precreated in Django migrations
 DEFAULT_MENUS = {"top_menu_name": "navbar", "bottom_menu_name": "footer"}
 
@@ -507,6 +549,23 @@ GRAPHENE = {
 
 EXTENSIONS_MANAGER = "saleor.extensions.manager.ExtensionsManager"
 
+# Number of seconds a process keeps reusing an already built extensions manager.
+# Managers are rebuilt earlier when any plugin configuration is saved. Set to 0 to
+# build a new manager on every call.
+EXTENSIONS_MANAGER_CACHE_TIMEOUT = int(
+    os.environ.get("EXTENSIONS_MANAGER_CACHE_TIMEOUT", 300)
+)
+
+# Number of seconds the webhook subscriptions are shared between requests. They
+# are fetched again earlier when webhooks change. Set to 0 to fetch them for every
+# event.
+WEBHOOKS_CACHE_TIMEOUT = int(os.environ.get("WEBHOOKS_CACHE_TIMEOUT", 60 * 60))
+
+# Maximum number of hosts webhook payloads of an event are sent to at once
+WEBHOOK_MAX_CONCURRENT_DELIVERIES = int(
+    os.environ.get("WEBHOOK_MAX_CONCURRENT_DELIVERIES", 10)
+)
+
 PLUGINS = [
     "saleor.extensions.plugins.avatax.plugin.AvataxPlugin",
     "saleor.extensions.plugins.vatlayer.plugin.VatlayerPlugin",
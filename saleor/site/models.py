@@ -9,6 +9,7 @@ from django.core.validators import MaxLengthValidator, RegexValidator
 from django.db import models
 
 from ..core.permissions import SitePermissions
+from ..core.response_cache import ResponseCacheInvalidationMixin, ResponseCacheTag
 from ..core.utils.translations import TranslationProxy
 from ..core.weight import WeightUnits
 from . import AuthenticationBackends
@@ -30,7 +31,7 @@ def email_sender_name_validators():
     ]
 
 
-class SiteSettings(models.Model):
+class SiteSettings(ResponseCacheInvalidationMixin, models.Model):
     site = models.OneToOneField(Site, related_name="settings", on_delete=models.CASCADE)
     header_text = models.CharField(max_length=200, blank=True)
     description = models.CharField(max_length=500, blank=True)
@@ -70,6 +71,8 @@ class SiteSettings(models.Model):
     customer_set_password_url = models.CharField(max_length=255, blank=True, null=True)
     translated = TranslationProxy()
 
+    response_cache_tag = ResponseCacheTag.SHOP
+
     class Meta:
         permissions = (
             (SitePermissions.MANAGE_SETTINGS.codename, "Manage settings."),
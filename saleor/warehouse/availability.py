@@ -1,10 +1,10 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Iterable, Optional, Set
 
 from django.conf import settings
 from django.db.models import Sum
 
 from ..core.exceptions import InsufficientStock
-from .models import Stock
+from .models import ProductStockSummary, Stock
 
 if TYPE_CHECKING:
     from ..product.models import Product, ProductVariant
@@ -48,6 +48,18 @@ def is_variant_in_stock(variant: "ProductVariant", country_code: str) -> bool:
     return quantity_available > 0
 
 
+def get_in_stock_variant_ids(
+    variants: Iterable["ProductVariant"], country_code: str
+) -> Set[int]:
+    """Return IDs of the given variants that are available in given country."""
+    return set(
+        Stock.objects.annotate_available_quantity()
+        .for_country(country_code)
+        .filter(product_variant__in=variants, available_quantity__gt=0)
+        .values_list("product_variant_id", flat=True)
+    )
+
+
 def stocks_for_product(product: "Product", country_code: str):
     return (
         Stock.objects.annotate_available_quantity()
@@ -58,25 +70,23 @@ def stocks_for_product(product: "Product", country_code: str):
 
 def is_product_in_stock(product: "Product", country_code: str) -> bool:
     """Check if there is any variant of given product available in given country."""
-    return any(
-        stocks_for_product(product, country_code).values_list(
-            "available_quantity", flat=True
-        )
+    return (
+        ProductStockSummary.objects.for_country(country_code)
+        .filter(product_id=product.pk, available_stocks_count__gt=0)
+        .exists()
     )
 
 
 def are_all_product_variants_in_stock(product: "Product", country_code: str) -> bool:
     """Check if all variants of given product are available in given country."""
-    product_stocks = (
+    in_stock_variants_count = (
         stocks_for_product(product, country_code)
-        .values_list("available_quantity", "product_variant_id")
-        .all()
+        .filter(available_quantity__gt=0)
+        .values("product_variant_id")
+        .distinct()
+        .count()
     )
-    are_all_available = all([elem[0] for elem in product_stocks])
-    variants_with_stocks = [elem[1] for elem in product_stocks]
-
-    product_variants = product.variants.exclude(id__in=variants_with_stocks).exists()
-    return are_all_available and not product_variants
+    return in_stock_variants_count == len(product.variants.all())
 
 
 def products_with_low_stock(threshold: Optional[int] = None):
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
 
 from django.db import transaction
 
@@ -19,6 +20,50 @@ def allocate_stock(
     return stock
 
 
+@transaction.atomic
+def allocate_stocks(
+    variants_quantities: Iterable[Tuple["ProductVariant", int]], country_code: str
+) -> List[Stock]:
+    """Allocate the given quantities of the variants in the stocks for the country.
+
+    All the stocks are locked with a single query, ordered by their primary keys so
+    concurrent allocations lock them in the same order and can't deadlock, and are
+    updated with a single query.
+
+    Note it will raise a 'Stock.DoesNotExist' exception if a stock of any of the
+    variants is not found.
+    """
+    quantities: Dict[int, int] = defaultdict(int)
+    for variant, quantity in variants_quantities:
+        quantities[variant.pk] += quantity
+    if not quantities:
+        return []
+
+    stocks = list(
+        Stock.objects.select_for_update(of=("self",))
+        .for_country(country_code)
+        .filter(product_variant_id__in=quantities.keys())
+        .order_by("pk")
+    )
+    stocks_by_variant = {}
+    for stock in stocks:
+        if stock.product_variant_id in stocks_by_variant:
+            raise Stock.MultipleObjectsReturned(
+                f"More than one stock of variant {stock.product_variant_id} found."
+            )
+        stocks_by_variant[stock.product_variant_id] = stock
+    missing_variant_ids = quantities.keys() - stocks_by_variant.keys()
+    if missing_variant_ids:
+        raise Stock.DoesNotExist(
+            f"Stocks of variants {sorted(missing_variant_ids)} not found."
+        )
+
+    for variant_id, stock in stocks_by_variant.items():
+        stock.allocate_stock(quantities[variant_id], commit=False)
+    Stock.objects.bulk_update(stocks, ["quantity_allocated"])
+    return stocks
+
+
 @transaction.atomic
 def deallocate_stock(
     variant: "ProductVariant", country_code: str, quantity: int, commit: bool = True
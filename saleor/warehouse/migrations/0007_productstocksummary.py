@@ -0,0 +1,109 @@
+# Generated by Django 3.0.5 on 2020-04-22 08:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Q, Sum
+
+BATCH_SIZE = 1000
+
+
+def populate_product_stock_summaries(apps, _schema_editor):
+    Stock = apps.get_model("warehouse", "Stock")
+    ProductStockSummary = apps.get_model("warehouse", "ProductStockSummary")
+
+    aggregates = {
+        "quantity_available": Sum(F("quantity") - F("quantity_allocated")),
+        "stocks_count": Count("pk"),
+        "available_stocks_count": Count(
+            "pk", filter=Q(quantity__gt=F("quantity_allocated"))
+        ),
+    }
+    stocks = Stock.objects.order_by()
+    per_warehouse = stocks.values("product_variant__product_id", "warehouse_id")
+    per_product = stocks.values("product_variant__product_id")
+
+    summaries = []
+    for groups in [per_warehouse, per_product]:
+        for row in groups.annotate(**aggregates).iterator():
+            summaries.append(
+                ProductStockSummary(
+                    product_id=row["product_variant__product_id"],
+                    warehouse_id=row.get("warehouse_id"),
+                    quantity_available=row["quantity_available"],
+                    stocks_count=row["stocks_count"],
+                    available_stocks_count=row["available_stocks_count"],
+                )
+            )
+            if len(summaries) >= BATCH_SIZE:
+                ProductStockSummary.objects.bulk_create(summaries)
+                summaries = []
+    ProductStockSummary.objects.bulk_create(summaries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0116_product_search_vector"),
+        ("warehouse", "0006_auto_20200228_0519"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductStockSummary",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("quantity_available", models.IntegerField(default=0)),
+                ("stocks_count", models.PositiveIntegerField(default=0)),
+                ("available_stocks_count", models.PositiveIntegerField(default=0)),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stock_summaries",
+                        to="product.Product",
+                    ),
+                ),
+                (
+                    "warehouse",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="warehouse.Warehouse",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="productstocksummary",
+            index=models.Index(
+                fields=["warehouse", "quantity_available"],
+                name="stock_summary_available_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="productstocksummary",
+            constraint=models.UniqueConstraint(
+                fields=("product", "warehouse"), name="unique_product_warehouse"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="productstocksummary",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(warehouse__isnull=True),
+                fields=("product",),
+                name="unique_product_total",
+            ),
+        ),
+        migrations.RunPython(
+            populate_product_stock_summaries, migrations.RunPython.noop
+        ),
+    ]
@@ -1,15 +1,22 @@
 import itertools
+import operator
 import uuid
-from typing import Set
+from collections import defaultdict
+from functools import reduce
+from typing import Any, Dict, Iterable, List, Set, Tuple
 
-from django.db import models
-from django.db.models import F
+from django.db import models, transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
 
 from ..account.models import Address
 from ..core.exceptions import InsufficientStock
-from ..product.models import ProductVariant
+from ..product.models import Product, ProductVariant
 from ..shipping.models import ShippingZone
 
+# Stock ID, product ID, warehouse ID, quantity and quantity allocated
+StockState = Tuple[int, int, Any, int, int]
+
 
 class WarehouseQueryset(models.QuerySet):
     def prefetch_data(self):
@@ -52,6 +59,77 @@ class Warehouse(models.Model):
 
 
 class StockQuerySet(models.QuerySet):
+    """Stock queryset keeping the product stock summaries up to date.
+
+    Bulk writes apply the changes of the stocks to the summaries of their products
+    the same way `Stock.save` and `Stock.delete` do.
+    """
+
+    def _get_states(self) -> List[StockState]:
+        return list(
+            self.order_by("pk").values_list(
+                "pk",
+                "product_variant__product_id",
+                "warehouse_id",
+                "quantity",
+                "quantity_allocated",
+            )
+        )
+
+    def _lock_states(self) -> List[StockState]:
+        """Lock the stocks and return their states before they are changed."""
+        return self.select_for_update(of=("self",))._get_states()
+
+    @transaction.atomic
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        variant_ids = {stock.product_variant_id for stock in objs}
+        product_ids = dict(
+            ProductVariant.objects.filter(pk__in=variant_ids).values_list(
+                "pk", "product_id"
+            )
+        )
+        ProductStockSummary.objects.apply_stock_changes(
+            added=[
+                (
+                    stock.pk,
+                    product_ids[stock.product_variant_id],
+                    stock.warehouse_id,
+                    stock.quantity,
+                    stock.quantity_allocated,
+                )
+                for stock in objs
+            ]
+        )
+        return objs
+
+    @transaction.atomic
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        stocks = Stock.objects.filter(pk__in=[stock.pk for stock in objs])
+        removed = stocks._lock_states()
+        super().bulk_update(objs, fields, *args, **kwargs)
+        ProductStockSummary.objects.apply_stock_changes(
+            removed=removed, added=stocks._get_states()
+        )
+
+    @transaction.atomic
+    def update(self, **kwargs):
+        removed = self._lock_states()
+        pks = [state[0] for state in removed]
+        stocks = Stock.objects.filter(pk__in=pks)
+        rows = super(StockQuerySet, stocks).update(**kwargs)
+        ProductStockSummary.objects.apply_stock_changes(
+            removed=removed, added=stocks._get_states()
+        )
+        return rows
+
+    @transaction.atomic
+    def delete(self):
+        removed = self._lock_states()
+        result = super().delete()
+        ProductStockSummary.objects.apply_stock_changes(removed=removed)
+        return result
+
     def annotate_available_quantity(self):
         return self.annotate(available_quantity=F("quantity") - F("quantity_allocated"))
 
@@ -135,3 +213,202 @@ class Stock(models.Model):
         self.quantity_allocated = F("quantity_allocated") - quantity
         if commit:
             self.save(update_fields=["quantity", "quantity_allocated"])
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            removed = []
+            if not self._state.adding:
+                removed = Stock.objects.filter(pk=self.pk)._lock_states()
+            super().save(*args, **kwargs)
+            # Quantities changed with F() expressions are only known after the update
+            added = Stock.objects.filter(pk=self.pk)._get_states()
+            _, _, _, self.quantity, self.quantity_allocated = added[0]
+            ProductStockSummary.objects.apply_stock_changes(
+                removed=removed, added=added
+            )
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            removed = Stock.objects.filter(pk=self.pk)._lock_states()
+            result = super().delete(*args, **kwargs)
+            ProductStockSummary.objects.apply_stock_changes(removed=removed)
+        return result
+
+
+class ProductStockSummaryQuerySet(models.QuerySet):
+    def for_country(self, country_code: str):
+        query_warehouse = models.Subquery(
+            Warehouse.objects.filter(
+                shipping_zones__countries__contains=country_code
+            ).values("pk")
+        )
+        return self.filter(warehouse__in=query_warehouse)
+
+    def out_of_stock(self):
+        """Return the summaries of products not available in any warehouse."""
+        return self.filter(
+            warehouse__isnull=True, stocks_count__gt=0, quantity_available__lte=0
+        )
+
+    def apply_stock_changes(
+        self, removed: Iterable[StockState] = (), added: Iterable[StockState] = ()
+    ):
+        """Update the summaries with the states of stocks before and after a write.
+
+        The summaries are changed by the differences between the removed and added
+        states with `F()` expressions in a single query, without recomputing them
+        from all the stocks of the products.
+        """
+        removed, added = list(removed), list(added)
+        deltas: Dict[Tuple[int, Any], List[int]] = defaultdict(lambda: [0, 0, 0])
+        for sign, states in [(-1, removed), (1, added)]:
+            for _, product_id, warehouse_id, quantity, quantity_allocated in states:
+                values = [
+                    quantity - quantity_allocated,
+                    1,
+                    int(quantity > quantity_allocated),
+                ]
+                for key in [(product_id, warehouse_id), (product_id, None)]:
+                    for index, value in enumerate(values):
+                        deltas[key][index] += sign * value
+        deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+        if not deltas:
+            return
+
+        # Stocks in new warehouses of a product need the summaries to be created
+        removed_keys = {(state[1], state[2]) for state in removed}
+        new_keys = {(state[1], state[2]) for state in added} - removed_keys
+        if new_keys:
+            new_keys |= {(product_id, None) for product_id, _ in new_keys}
+            self.bulk_create(
+                [
+                    ProductStockSummary(product_id=key[0], warehouse_id=key[1])
+                    for key in new_keys
+                ],
+                ignore_conflicts=True,
+            )
+
+        lookups = {
+            key: Q(product_id=key[0], warehouse_id=key[1])
+            if key[1] is not None
+            else Q(product_id=key[0], warehouse__isnull=True)
+            for key in deltas
+        }
+
+        fields = ["quantity_available", "stocks_count", "available_stocks_count"]
+        changes = {}
+        for index, field_name in enumerate(fields):
+            delta = Case(
+                *[
+                    When(lookup, then=Value(deltas[key][index]))
+                    for key, lookup in lookups.items()
+                ],
+                default=Value(0),
+                output_field=self.model._meta.get_field(field_name),
+            )
+            changes[field_name] = F(field_name) + delta
+        self.filter(reduce(operator.or_, lookups.values())).update(**changes)
+
+    @transaction.atomic
+    def refresh(self, product_ids: Iterable[int]):
+        """Recompute the stock summaries of given products from their stocks.
+
+        Used when stocks are removed without going through `Stock` methods, e.g.
+        by cascades of variant deletion.
+        """
+        product_ids = sorted(set(product_ids))
+        if not product_ids:
+            return
+
+        # Make sure all the summaries exist: a row per warehouse having stocks of
+        # the product and a row with the totals across all warehouses.
+        pairs = (
+            Stock.objects.filter(product_variant__product_id__in=product_ids)
+            .values_list("product_variant__product_id", "warehouse_id")
+            .distinct()
+        )
+        summaries = [
+            ProductStockSummary(product_id=product_id, warehouse_id=warehouse_id)
+            for product_id, warehouse_id in pairs
+        ]
+        summaries += [
+            ProductStockSummary(product_id=product_id, warehouse_id=None)
+            for product_id in product_ids
+        ]
+        self.bulk_create(summaries, ignore_conflicts=True)
+
+        # Lock the summaries before computing them, so the update below sees
+        # stocks changes committed by concurrent transactions refreshing
+        # the same products.
+        summaries = self.select_for_update().filter(product_id__in=product_ids)
+        list(summaries.order_by("pk").values_list("pk", flat=True))
+
+        product_stocks = Stock.objects.filter(
+            product_variant__product_id=OuterRef("product_id")
+        )
+        warehouse_stocks = product_stocks.filter(warehouse_id=OuterRef("warehouse_id"))
+        summaries.filter(warehouse__isnull=False).update(
+            **self._get_summary_expressions(warehouse_stocks)
+        )
+        summaries.filter(warehouse__isnull=True).update(
+            **self._get_summary_expressions(product_stocks)
+        )
+
+    @staticmethod
+    def _get_summary_expressions(stocks):
+        stocks = stocks.order_by().values("product_variant__product_id")
+
+        def aggregate(expression):
+            subquery = stocks.annotate(value=expression).values("value")
+            return Coalesce(
+                Subquery(subquery, output_field=models.IntegerField()), 0
+            )
+
+        return {
+            "quantity_available": aggregate(
+                Sum(F("quantity") - F("quantity_allocated"))
+            ),
+            "stocks_count": aggregate(Count("pk")),
+            "available_stocks_count": aggregate(
+                Count("pk", filter=Q(quantity__gt=F("quantity_allocated")))
+            ),
+        }
+
+
+class ProductStockSummary(models.Model):
+    """Denormalized totals of the stocks of product's variants.
+
+    There is a row per product and warehouse and a row with the totals across
+    all the warehouses, which has no warehouse assigned. Summaries are updated
+    with the changes whenever stocks of the product are saved.
+    """
+
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="stock_summaries"
+    )
+    warehouse = models.ForeignKey(
+        Warehouse, null=True, on_delete=models.CASCADE, related_name="+"
+    )
+    quantity_available = models.IntegerField(default=0)
+    stocks_count = models.PositiveIntegerField(default=0)
+    available_stocks_count = models.PositiveIntegerField(default=0)
+
+    objects = ProductStockSummaryQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "warehouse"], name="unique_product_warehouse"
+            ),
+            models.UniqueConstraint(
+                fields=["product"],
+                condition=Q(warehouse__isnull=True),
+                name="unique_product_total",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["warehouse", "quantity_available"],
+                name="stock_summary_available_idx",
+            )
+        ]
@@ -0,0 +1,36 @@
+"""Shared cache of the webhook subscriptions.
+
+Events are triggered by many mutations, while webhooks change rarely. The webhooks
+receiving each of the events are cached along with the version stamp bumped
+whenever webhooks, their events, service accounts or their permissions change.
+"""
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+WEBHOOKS_CACHE_KEY = "webhooks:{}"
+WEBHOOKS_VERSION_CACHE_KEY = "webhooks_version"
+
+
+def get_webhooks_version() -> str:
+    version = cache.get(WEBHOOKS_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(WEBHOOKS_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+        version = cache.get(WEBHOOKS_VERSION_CACHE_KEY)
+    return version
+
+
+def _bump_webhooks_version():
+    cache.set(WEBHOOKS_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+
+
+def invalidate_webhooks_cache():
+    """Make the cached webhook subscriptions stale.
+
+    Has to be called after webhooks, their events, service accounts or their
+    permissions are changed. The version is bumped once the current transaction
+    is committed, so the subscriptions from before the change can't be cached
+    under it.
+    """
+    transaction.on_commit(_bump_webhooks_version)
@@ -2,6 +2,7 @@ from django.db import models
 
 from ..account.models import ServiceAccount
 from ..core.permissions import WebhookPermissions
+from .cache import invalidate_webhooks_cache
 
 
 class Webhook(models.Model):
@@ -18,6 +19,15 @@ class Webhook(models.Model):
             (WebhookPermissions.MANAGE_WEBHOOKS.codename, "Manage webhooks"),
         )
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_webhooks_cache()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_webhooks_cache()
+        return result
+
 
 class WebhookEvent(models.Model):
     webhook = models.ForeignKey(
@@ -27,3 +37,12 @@ class WebhookEvent(models.Model):
 
     def __repr__(self):
         return self.event_type
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_webhooks_cache()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_webhooks_cache()
+        return result
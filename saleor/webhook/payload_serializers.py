@@ -1,9 +1,14 @@
+import json
 from collections import OrderedDict
 from collections.abc import Iterable
+from types import SimpleNamespace
+from typing import Any, List, Optional
 
 import graphene
-from django.core.serializers.json import Serializer as JSONSerializer
+from django.core.serializers.json import DjangoJSONEncoder, Serializer as JSONSerializer
 from django.core.serializers.python import Serializer as PythonBaseSerializer
+from django.db.models import Field, QuerySet
+from django.utils.encoding import is_protected_type
 
 
 class PythonSerializer(PythonBaseSerializer):
@@ -67,3 +72,78 @@ class PayloadSerializer(JSONSerializer):
         # Finally update the data with the super class' "self._current" content
         data.update(self._current)
         return data
+
+
+def _is_field_selected(field: Field, fields: Iterable) -> bool:
+    # Fields are selected the same way as in Django's serializers
+    if field.remote_field is None:
+        return field.attname in fields
+    return field.attname[:-3] in fields
+
+
+def _get_field_value(field: Field, value: Any) -> Any:
+    # Values are converted the same way as in Django's Python serializer
+    if is_protected_type(value):
+        return value
+    return field.value_to_string(SimpleNamespace(**{field.attname: value}))
+
+
+class ValuesSerializer:
+    """Serialize objects to the format of `PayloadSerializer` from their values.
+
+    Only the columns of the serialized fields are fetched with `values()` and no
+    model instances are created. Objects referenced by a foreign key can be
+    fetched in the query of the referencing object, by passing the name of the
+    foreign key with "__" as the prefix.
+    """
+
+    def __init__(self, model, fields, prefix="", obj_id_name="id"):
+        self.model = model
+        self.prefix = prefix
+        self.obj_id_name = obj_id_name
+        self.fields = [
+            field
+            for field in model._meta.concrete_model._meta.local_fields
+            if field.serialize and _is_field_selected(field, fields)
+        ]
+
+    @property
+    def lookups(self) -> List[str]:
+        names = [self.obj_id_name] + [field.name for field in self.fields]
+        return [self.prefix + name for name in names]
+
+    def get_header(self, values: dict) -> OrderedDict:
+        object_name = self.model._meta.object_name
+        obj_id = values[self.prefix + self.obj_id_name]
+        return OrderedDict(
+            [
+                ("type", str(object_name)),
+                (self.obj_id_name, graphene.Node.to_global_id(object_name, obj_id)),
+            ]
+        )
+
+    def get_fields_data(self, values: dict) -> OrderedDict:
+        return OrderedDict(
+            (field.name, _get_field_value(field, values[self.prefix + field.name]))
+            for field in self.fields
+        )
+
+    def serialize(self, values: dict) -> Optional[OrderedDict]:
+        """Return the serialized object or `None` if it's not set."""
+        if values[self.prefix + self.obj_id_name] is None:
+            return None
+        data = self.get_header(values)
+        data.update(self.get_fields_data(values))
+        return data
+
+    def serialize_queryset(self, queryset: QuerySet) -> Optional[List[OrderedDict]]:
+        """Return the serialized objects or `None` if there are none."""
+        data = [self.serialize(values) for values in queryset.values(*self.lookups)]
+        return data or None
+
+
+def dump_payload(data: Optional[dict]) -> Optional[str]:
+    """Encode the object the same way as `PayloadSerializer` does."""
+    if data is None:
+        return None
+    return json.dumps([data], cls=DjangoJSONEncoder)
@@ -1,9 +1,10 @@
 import json
-from typing import Optional
+from typing import List, Optional
 
+from django.conf import settings
 from django.db.models import QuerySet
 
-from ..account.models import User
+from ..account.models import Address, User
 from ..checkout.models import Checkout
 from ..core.utils.anonymization import (
     anonymize_checkout,
@@ -11,14 +12,16 @@ from ..core.utils.anonymization import (
     generate_fake_user,
 )
 from ..order import FulfillmentStatus, OrderStatus
-from ..order.models import Fulfillment, FulfillmentLine, Order
+from ..order.models import Fulfillment, FulfillmentLine, Order, OrderLine
 from ..order.utils import get_order_country
 from ..payment import ChargeStatus
-from ..product.models import Product
+from ..payment.models import Payment
+from ..product.models import Category, Collection, Product, ProductVariant
+from ..shipping.models import ShippingMethod
 from ..warehouse.models import Warehouse
 from .event_types import WebhookEventType
-from .payload_serializers import PayloadSerializer
-from .serializers import serialize_checkout_lines
+from .payload_serializers import PayloadSerializer, ValuesSerializer, dump_payload
+from .serializers import serialize_checkout_lines, serialize_checkout_lines_values
 
 ADDRESS_FIELDS = (
     "first_name",
@@ -35,103 +38,106 @@ ADDRESS_FIELDS = (
 )
 
 
+ORDER_FIELDS = (
+    "created",
+    "status",
+    "user_email",
+    "shipping_method_name",
+    "shipping_price_net_amount",
+    "shipping_price_gross_amount",
+    "total_net_amount",
+    "total_gross_amount",
+    "shipping_price_net_amount",
+    "shipping_price_gross_amount",
+    "discount_amount",
+    "discount_name",
+    "translated_discount_name",
+    "weight",
+    "private_metadata",
+    "metadata",
+)
+ORDER_LINE_FIELDS = (
+    "product_name",
+    "variant_name",
+    "translated_product_name",
+    "translated_variant_name",
+    "product_sku",
+    "quantity",
+    "currency",
+    "unit_price_net_amount",
+    "unit_price_gross_amount",
+    "tax_rate",
+)
+ORDER_FULFILLMENT_FIELDS = ("status", "tracking_number", "created")
+PAYMENT_FIELDS = (
+    "gateway"
+    "is_active"
+    "created"
+    "modified"
+    "charge_status"
+    "total"
+    "captured_amount"
+    "currency"
+    "billing_email"
+    "billing_first_name"
+    "billing_last_name"
+    "billing_company_name"
+    "billing_address_1"
+    "billing_address_2"
+    "billing_city"
+    "billing_city_area"
+    "billing_postal_code"
+    "billing_country_code"
+    "billing_country_area"
+)
+SHIPPING_METHOD_FIELDS = ("name", "type", "currency", "price_amount")
+
+
 def generate_order_payload(order: "Order"):
     serializer = PayloadSerializer()
-    fulfillment_fields = ("status", "tracking_number", "created")
-    payment_fields = (
-        "gateway"
-        "is_active"
-        "created"
-        "modified"
-        "charge_status"
-        "total"
-        "captured_amount"
-        "currency"
-        "billing_email"
-        "billing_first_name"
-        "billing_last_name"
-        "billing_company_name"
-        "billing_address_1"
-        "billing_address_2"
-        "billing_city"
-        "billing_city_area"
-        "billing_postal_code"
-        "billing_country_code"
-        "billing_country_area"
-    )
-    line_fields = (
-        "product_name",
-        "variant_name",
-        "translated_product_name",
-        "translated_variant_name",
-        "product_sku",
-        "quantity",
-        "currency",
-        "unit_price_net_amount",
-        "unit_price_gross_amount",
-        "tax_rate",
-    )
-    shipping_method_fields = ("name", "type", "currency", "price_amount")
-    order_fields = (
-        "created",
-        "status",
-        "user_email",
-        "shipping_method_name",
-        "shipping_price_net_amount",
-        "shipping_price_gross_amount",
-        "total_net_amount",
-        "total_gross_amount",
-        "shipping_price_net_amount",
-        "shipping_price_gross_amount",
-        "discount_amount",
-        "discount_name",
-        "translated_discount_name",
-        "weight",
-        "private_metadata",
-        "metadata",
-    )
     order_data = serializer.serialize(
         [order],
-        fields=order_fields,
+        fields=ORDER_FIELDS,
         additional_fields={
-            "shipping_method": (lambda o: o.shipping_method, shipping_method_fields),
-            "lines": (lambda o: o.lines.all(), line_fields),
-            "payments": (lambda o: o.payments.all(), payment_fields),
+            "shipping_method": (lambda o: o.shipping_method, SHIPPING_METHOD_FIELDS),
+            "lines": (lambda o: o.lines.all(), ORDER_LINE_FIELDS),
+            "payments": (lambda o: o.payments.all(), PAYMENT_FIELDS),
             "shipping_address": (lambda o: o.shipping_address, ADDRESS_FIELDS),
             "billing_address": (lambda o: o.billing_address, ADDRESS_FIELDS),
-            "fulfillments": (lambda o: o.fulfillments.all(), fulfillment_fields),
+            "fulfillments": (lambda o: o.fulfillments.all(), ORDER_FULFILLMENT_FIELDS),
         },
     )
     return order_data
 
 
+CHECKOUT_FIELDS = (
+    "created",
+    "last_change",
+    "status",
+    "email",
+    "quantity",
+    "currency",
+    "discount_amount",
+    "discount_name",
+    "private_metadata",
+    "metadata",
+)
+CHECKOUT_USER_FIELDS = ("email", "first_name", "last_name")
+
+
 def generate_checkout_payload(checkout: "Checkout"):
     serializer = PayloadSerializer()
-    checkout_fields = (
-        "created",
-        "last_change",
-        "status",
-        "email",
-        "quantity",
-        "currency",
-        "discount_amount",
-        "discount_name",
-        "private_metadata",
-        "metadata",
-    )
-    user_fields = ("email", "first_name", "last_name")
-    shipping_method_fields = ("name", "type", "currency", "price_amount")
     lines_dict_data = serialize_checkout_lines(checkout)
 
     checkout_data = serializer.serialize(
         [checkout],
-        fields=checkout_fields,
+        fields=CHECKOUT_FIELDS,
         obj_id_name="token",
         additional_fields={
-            "user": (lambda c: c.user, user_fields),
+            "user": (lambda c: c.user, CHECKOUT_USER_FIELDS),
             "billing_address": (lambda c: c.billing_address, ADDRESS_FIELDS),
             "shipping_address": (lambda c: c.shipping_address, ADDRESS_FIELDS),
-            "shipping_method": (lambda c: c.shipping_method, shipping_method_fields),
+            "shipping_method": (lambda c: c.shipping_method, SHIPPING_METHOD_FIELDS),
         },
         extra_dict_data={
             # Casting to list to make it json-serializable
@@ -141,19 +147,22 @@ def generate_checkout_payload(checkout: "Checkout"):
     return checkout_data
 
 
+CUSTOMER_FIELDS = (
+    "email",
+    "first_name",
+    "last_name",
+    "is_active",
+    "date_joined",
+    "private_metadata",
+    "metadata",
+)
+
+
 def generate_customer_payload(customer: "User"):
     serializer = PayloadSerializer()
     data = serializer.serialize(
         [customer],
-        fields=[
-            "email",
-            "first_name",
-            "last_name",
-            "is_active",
-            "date_joined",
-            "private_metadata",
-            "metadata",
-        ],
+        fields=CUSTOMER_FIELDS,
         additional_fields={
             "default_shipping_address": (
                 lambda c: c.default_billing_address,
@@ -168,57 +177,62 @@ def generate_customer_payload(customer: "User"):
     return data
 
 
+PRODUCT_FIELDS = (
+    "name",
+    "description_json",
+    "currency",
+    "price_amount",
+    "minimal_variant_price_amount",
+    "attributes",
+    "updated_at",
+    "charge_taxes",
+    "weight",
+    "publication_date",
+    "is_published",
+    "private_metadata",
+    "metadata",
+)
+PRODUCT_VARIANT_FIELDS = (
+    "sku",
+    "name",
+    "currency",
+    "price_override_amount",
+    "track_inventory",
+    "quantity",
+    "quantity_allocated",
+    "cost_price_amount",
+    "private_metadata",
+    "metadata",
+)
+CATEGORY_FIELDS = ("name", "slug")
+COLLECTION_FIELDS = ("name", "slug")
+
+
 def generate_product_payload(product: "Product"):
     serializer = PayloadSerializer()
-
-    product_fields = (
-        "name",
-        "description_json",
-        "currency",
-        "price_amount",
-        "minimal_variant_price_amount",
-        "attributes",
-        "updated_at",
-        "charge_taxes",
-        "weight",
-        "publication_date",
-        "is_published",
-        "private_metadata",
-        "metadata",
-    )
-    product_variant_fields = (
-        "sku",
-        "name",
-        "currency",
-        "price_override_amount",
-        "track_inventory",
-        "quantity",
-        "quantity_allocated",
-        "cost_price_amount",
-        "private_metadata",
-        "metadata",
-    )
     product_payload = serializer.serialize(
         [product],
-        fields=product_fields,
+        fields=PRODUCT_FIELDS,
         additional_fields={
-            "category": (lambda p: p.category, ("name", "slug")),
-            "collections": (lambda p: p.collections.all(), ("name", "slug")),
-            "variants": (lambda p: p.variants.all(), product_variant_fields),
+            "category": (lambda p: p.category, CATEGORY_FIELDS),
+            "collections": (lambda p: p.collections.all(), COLLECTION_FIELDS),
+            "variants": (lambda p: p.variants.all(), PRODUCT_VARIANT_FIELDS),
         },
     )
     return product_payload
 
 
+FULFILLMENT_LINE_FIELDS = ("quantity",)
+
+
 def generate_fulfillment_lines_payload(fulfillment: Fulfillment):
     serializer = PayloadSerializer()
     lines = FulfillmentLine.objects.prefetch_related(
         "order_line__variant__product__product_type"
     ).filter(fulfillment=fulfillment)
-    line_fields = ("quantity",)
     return serializer.serialize(
         lines,
-        fields=line_fields,
+        fields=FULFILLMENT_LINE_FIELDS,
         extra_dict_data={
             "weight": (lambda fl: fl.order_line.variant.get_weight().g),
             "weight_unit": "gram",
@@ -231,16 +245,17 @@ def generate_fulfillment_lines_payload(fulfillment: Fulfillment):
     )
 
 
+# fulfilment fields to serialize
+FULFILLMENT_FIELDS = ("status", "tracking_code", "order__user_email")
+
+
 def generate_fulfillment_payload(fulfillment: Fulfillment):
     serializer = PayloadSerializer()
-
-    # fulfilment fields to serialize
-    fulfillment_fields = ("status", "tracking_code", "order__user_email")
     order_country = get_order_country(fulfillment.order)
     warehouse = Warehouse.objects.for_country(order_country)
     fulfillment_data = serializer.serialize(
         [fulfillment],
-        fields=fulfillment_fields,
+        fields=FULFILLMENT_FIELDS,
         additional_fields={
             "warehouse_address": (lambda f: warehouse.address, ADDRESS_FIELDS),
         },
@@ -252,6 +267,227 @@ def generate_fulfillment_payload(fulfillment: Fulfillment):
     return fulfillment_data
 
 
+# The functions below serialize objects to the same payloads as the generators
+# above, from the values of only the serialized columns. They are used for the
+# triggered events, while the generators above are used for the sample payloads
+# of anonymized objects, which aren't stored in the database.
+
+
+def serialize_order_values(order_id) -> Optional[dict]:
+    order = ValuesSerializer(Order, ORDER_FIELDS)
+    shipping_method = ValuesSerializer(
+        ShippingMethod, SHIPPING_METHOD_FIELDS, prefix="shipping_method__"
+    )
+    shipping_address = ValuesSerializer(
+        Address, ADDRESS_FIELDS, prefix="shipping_address__"
+    )
+    billing_address = ValuesSerializer(
+        Address, ADDRESS_FIELDS, prefix="billing_address__"
+    )
+    values = (
+        Order.objects.filter(pk=order_id)
+        .values(
+            *order.lookups,
+            *shipping_method.lookups,
+            *shipping_address.lookups,
+            *billing_address.lookups,
+        )
+        .first()
+    )
+    if values is None:
+        return None
+
+    data = order.get_header(values)
+    data["shipping_method"] = shipping_method.serialize(values)
+    data["lines"] = ValuesSerializer(OrderLine, ORDER_LINE_FIELDS).serialize_queryset(
+        OrderLine.objects.filter(order_id=order_id)
+    )
+    data["payments"] = ValuesSerializer(Payment, PAYMENT_FIELDS).serialize_queryset(
+        Payment.objects.filter(order_id=order_id)
+    )
+    data["shipping_address"] = shipping_address.serialize(values)
+    data["billing_address"] = billing_address.serialize(values)
+    data["fulfillments"] = ValuesSerializer(
+        Fulfillment, ORDER_FULFILLMENT_FIELDS
+    ).serialize_queryset(Fulfillment.objects.filter(order_id=order_id))
+    data.update(order.get_fields_data(values))
+    return data
+
+
+def serialize_checkout_values(checkout_token) -> Optional[dict]:
+    checkout = ValuesSerializer(Checkout, CHECKOUT_FIELDS, obj_id_name="token")
+    user = ValuesSerializer(User, CHECKOUT_USER_FIELDS, prefix="user__")
+    billing_address = ValuesSerializer(
+        Address, ADDRESS_FIELDS, prefix="billing_address__"
+    )
+    shipping_address = ValuesSerializer(
+        Address, ADDRESS_FIELDS, prefix="shipping_address__"
+    )
+    shipping_method = ValuesSerializer(
+        ShippingMethod, SHIPPING_METHOD_FIELDS, prefix="shipping_method__"
+    )
+    values = (
+        Checkout.objects.filter(pk=checkout_token)
+        .values(
+            *checkout.lookups,
+            *user.lookups,
+            *billing_address.lookups,
+            *shipping_address.lookups,
+            *shipping_method.lookups,
+        )
+        .first()
+    )
+    if values is None:
+        return None
+
+    data = checkout.get_header(values)
+    data["user"] = user.serialize(values)
+    data["billing_address"] = billing_address.serialize(values)
+    data["shipping_address"] = shipping_address.serialize(values)
+    data["shipping_method"] = shipping_method.serialize(values)
+    data["lines"] = serialize_checkout_lines_values(checkout_token)
+    data.update(checkout.get_fields_data(values))
+    return data
+
+
+def serialize_customer_values(customer_id) -> Optional[dict]:
+    customer = ValuesSerializer(User, CUSTOMER_FIELDS)
+    default_billing_address = ValuesSerializer(
+        Address, ADDRESS_FIELDS, prefix="default_billing_address__"
+    )
+    default_shipping_address = ValuesSerializer(
+        Address, ADDRESS_FIELDS, prefix="default_shipping_address__"
+    )
+    values = (
+        User.objects.filter(pk=customer_id)
+        .values(
+            *customer.lookups,
+            *default_billing_address.lookups,
+            *default_shipping_address.lookups,
+        )
+        .first()
+    )
+    if values is None:
+        return None
+
+    data = customer.get_header(values)
+    # The addresses are swapped the same way as in `generate_customer_payload`
+    data["default_shipping_address"] = default_billing_address.serialize(values)
+    data["default_billing_address"] = default_shipping_address.serialize(values)
+    data.update(customer.get_fields_data(values))
+    return data
+
+
+def serialize_product_values(product_id) -> Optional[dict]:
+    product = ValuesSerializer(Product, PRODUCT_FIELDS)
+    category = ValuesSerializer(Category, CATEGORY_FIELDS, prefix="category__")
+    values = (
+        Product.objects.filter(pk=product_id)
+        .values(*product.lookups, *category.lookups)
+        .first()
+    )
+    if values is None:
+        return None
+
+    data = product.get_header(values)
+    data["category"] = category.serialize(values)
+    data["collections"] = ValuesSerializer(
+        Collection, COLLECTION_FIELDS
+    ).serialize_queryset(Collection.objects.filter(products=product_id))
+    data["variants"] = ValuesSerializer(
+        ProductVariant, PRODUCT_VARIANT_FIELDS
+    ).serialize_queryset(ProductVariant.objects.filter(product_id=product_id))
+    data.update(product.get_fields_data(values))
+    return data
+
+
+def serialize_fulfillment_lines_values(fulfillment_id) -> List[dict]:
+    line = ValuesSerializer(FulfillmentLine, FULFILLMENT_LINE_FIELDS)
+    lines_values = FulfillmentLine.objects.filter(fulfillment_id=fulfillment_id).values(
+        *line.lookups,
+        "order_line__currency",
+        "order_line__unit_price_gross_amount",
+        "order_line__variant__weight",
+        "order_line__variant__product__weight",
+        "order_line__variant__product__product_type__weight",
+        "order_line__variant__product__product_type__name",
+    )
+    data = []
+    for values in lines_values:
+        weight = (
+            values["order_line__variant__weight"]
+            or values["order_line__variant__product__weight"]
+            or values["order_line__variant__product__product_type__weight"]
+        )
+        line_data = line.get_header(values)
+        line_data["weight"] = weight.g
+        line_data["weight_unit"] = "gram"
+        line_data["product_type"] = values[
+            "order_line__variant__product__product_type__name"
+        ]
+        line_data["unit_price_gross"] = values["order_line__unit_price_gross_amount"]
+        line_data["currency"] = values["order_line__currency"]
+        line_data.update(line.get_fields_data(values))
+        data.append(line_data)
+    return data
+
+
+def serialize_fulfillment_values(fulfillment_id) -> Optional[dict]:
+    fulfillment = ValuesSerializer(Fulfillment, FULFILLMENT_FIELDS)
+    values = (
+        Fulfillment.objects.filter(pk=fulfillment_id)
+        .values("order_id", *fulfillment.lookups)
+        .first()
+    )
+    if values is None:
+        return None
+
+    order_id = values["order_id"]
+    order_data = serialize_order_values(order_id)
+    # Same country as returned by `get_order_country` for the order
+    address_data = order_data["billing_address"]
+    if OrderLine.objects.filter(order_id=order_id, is_shipping_required=True).exists():
+        address_data = order_data["shipping_address"]
+    if address_data is None:
+        order_country = settings.DEFAULT_COUNTRY
+    else:
+        order_country = address_data["country"]
+    warehouse_address = ValuesSerializer(Address, ADDRESS_FIELDS, prefix="address__")
+    warehouse_values = Warehouse.objects.values(*warehouse_address.lookups).get(
+        shipping_zones__countries__contains=order_country
+    )
+
+    data = fulfillment.get_header(values)
+    data["warehouse_address"] = warehouse_address.serialize(warehouse_values)
+    data["order"] = order_data
+    data["lines"] = serialize_fulfillment_lines_values(fulfillment_id)
+    data.update(fulfillment.get_fields_data(values))
+    return data
+
+
+# Serializers of the values of the objects the events are triggered for
+EVENT_PAYLOAD_SERIALIZERS = {
+    WebhookEventType.ORDER_CREATED: serialize_order_values,
+    WebhookEventType.ORDER_FULLY_PAID: serialize_order_values,
+    WebhookEventType.ORDER_UPDATED: serialize_order_values,
+    WebhookEventType.ORDER_CANCELLED: serialize_order_values,
+    WebhookEventType.ORDER_FULFILLED: serialize_order_values,
+    WebhookEventType.FULFILLMENT_CREATED: serialize_fulfillment_values,
+    WebhookEventType.CUSTOMER_CREATED: serialize_customer_values,
+    WebhookEventType.PRODUCT_CREATED: serialize_product_values,
+    WebhookEventType.CHECKOUT_QUANTITY_CHANGED: serialize_checkout_values,
+}
+
+
+def generate_event_payload(event_type: str, object_id: str) -> Optional[str]:
+    """Return the payload of the event for the object with the given ID.
+
+    `None` is returned if the object doesn't exist anymore.
+    """
+    serialize_values = EVENT_PAYLOAD_SERIALIZERS[event_type]
+    return dump_payload(serialize_values(object_id))
+
+
 def _get_sample_object(qs: QuerySet):
     """Return random object from query."""
     random_object = qs.order_by("?").first()
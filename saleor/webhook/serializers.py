@@ -1,5 +1,7 @@
 from typing import TYPE_CHECKING, List
 
+from ..checkout.models import CheckoutLine
+
 if TYPE_CHECKING:
     # pylint: disable=unused-import
     from ..checkout.models import Checkout
@@ -22,3 +24,42 @@ def serialize_checkout_lines(checkout: "Checkout") -> List[dict]:
             }
         )
     return data
+
+
+def serialize_checkout_lines_values(checkout_token) -> List[dict]:
+    """Serialize lines of the checkout like `serialize_checkout_lines`.
+
+    Only the needed columns are fetched, in a single query.
+    """
+    data = []
+    lines_values = CheckoutLine.objects.filter(checkout_id=checkout_token).values(
+        "quantity",
+        "variant__sku",
+        "variant__name",
+        "variant__currency",
+        "variant__price_override_amount",
+        "variant__product__name",
+        "variant__product__price_amount",
+    )
+    for values in lines_values:
+        base_price = values["variant__price_override_amount"]
+        if base_price is None:
+            base_price = values["variant__product__price_amount"]
+        product_name = values["variant__product__name"]
+        variant_display = values["variant__name"] or values["variant__sku"]
+        data.append(
+            {
+                "sku": values["variant__sku"],
+                "quantity": values["quantity"],
+                "base_price": str(base_price),
+                "currency": values["variant__currency"],
+                "full_name": (
+                    f"{product_name} ({variant_display})"
+                    if variant_display
+                    else product_name
+                ),
+                "product_name": product_name,
+                "variant_name": values["variant__name"],
+            }
+        )
+    return data
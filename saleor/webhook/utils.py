@@ -0,0 +1,94 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import WEBHOOKS_CACHE_KEY, get_webhooks_version
+from .event_types import WebhookEventType
+from .models import Webhook
+
+
+@dataclass
+class WebhookSubscription:
+    webhook_id: int
+    target_url: str
+    secret_key: Optional[str]
+
+
+# Subscriptions used by this process, keyed by the version they were fetched for.
+# Each entry stores the monotonic time after which they have to be fetched again.
+_subscriptions_cache: Dict[str, Tuple[float, Dict[str, List[WebhookSubscription]]]] = {}
+
+
+def fetch_subscribed_webhooks() -> Dict[str, List[WebhookSubscription]]:
+    """Return the webhooks which receive each of the event types.
+
+    Only active webhooks of active service accounts having the permission required
+    by the event are returned.
+    """
+    webhooks = (
+        Webhook.objects.filter(is_active=True, service_account__is_active=True)
+        .select_related("service_account")
+        .prefetch_related("events", "service_account__permissions__content_type")
+        .order_by("pk")
+    )
+    subscriptions: Dict[str, List[WebhookSubscription]] = {}
+    for webhook in webhooks:
+        permissions = {
+            f"{permission.content_type.app_label}.{permission.codename}"
+            for permission in webhook.service_account.permissions.all()
+        }
+        event_types = {event.event_type for event in webhook.events.all()}
+        if WebhookEventType.ANY in event_types:
+            event_types = set(WebhookEventType.PERMISSIONS)
+        subscription = WebhookSubscription(
+            webhook.pk, webhook.target_url, webhook.secret_key
+        )
+        for event_type in sorted(event_types):
+            permission = WebhookEventType.PERMISSIONS.get(event_type)
+            if permission is None:
+                continue
+            if permission.value and permission.value not in permissions:
+                continue
+            subscriptions.setdefault(event_type, []).append(subscription)
+    return subscriptions
+
+
+def get_subscribed_webhooks() -> Dict[str, List[WebhookSubscription]]:
+    """Return the webhooks receiving the events, reusing the fetched ones.
+
+    Subscriptions are kept by the process and shared with other processes through
+    the cache. They are refetched when webhooks, service accounts or their
+    permissions change, see `saleor.webhook.cache`.
+    """
+    timeout = settings.WEBHOOKS_CACHE_TIMEOUT
+    if not timeout:
+        return fetch_subscribed_webhooks()
+
+    version = get_webhooks_version()
+    now = time.monotonic()
+    cached = _subscriptions_cache.get(version)
+    if cached is not None:
+        expires_at, subscriptions = cached
+        if now < expires_at:
+            return subscriptions
+
+    key = WEBHOOKS_CACHE_KEY.format(version)
+    subscriptions = cache.get(key)
+    if subscriptions is None:
+        subscriptions = fetch_subscribed_webhooks()
+        cache.set(key, subscriptions, timeout=timeout)
+    _subscriptions_cache.clear()
+    _subscriptions_cache[version] = (now + timeout, subscriptions)
+    return subscriptions
+
+
+def get_webhooks_for_event(event_type: str) -> List[WebhookSubscription]:
+    return get_subscribed_webhooks().get(event_type, [])
+
+
+def is_event_subscribed(event_type: str) -> bool:
+    """Check if any webhook receives the event."""
+    return bool(get_webhooks_for_event(event_type))
@@ -6,7 +6,8 @@ from saleor.discount.models import Sale
 from saleor.menu.utils import update_menu
 from saleor.payment import ChargeStatus, TransactionKind
 from saleor.payment.models import Payment
-from saleor.product.models import Category
+from saleor.product.models import Category, ProductVariant
+from saleor.warehouse.models import Stock
 
 
 @pytest.fixture
@@ -136,10 +137,7 @@ def checkout_with_billing_address(checkout_with_shipping_method, address):
     return checkout
 
 
-@pytest.fixture()
-def checkout_with_charged_payment(checkout_with_billing_address):
-    checkout = checkout_with_billing_address
-
+def create_charged_payment(checkout):
     taxed_total = calculations.checkout_total(checkout)
     payment = Payment.objects.create(
         gateway="Dummy", is_active=True, total=taxed_total.gross.amount, currency="USD"
@@ -147,7 +145,7 @@ def checkout_with_charged_payment(checkout_with_billing_address):
 
     payment.charge_status = ChargeStatus.FULLY_CHARGED
     payment.captured_amount = payment.total
-    payment.checkout = checkout_with_billing_address
+    payment.checkout = checkout
     payment.save()
 
     payment.transactions.create(
@@ -156,5 +154,36 @@ def checkout_with_charged_payment(checkout_with_billing_address):
         gateway_response={},
         is_success=True,
     )
+    return payment
+
+
+@pytest.fixture()
+def checkout_with_charged_payment(checkout_with_billing_address):
+    checkout = checkout_with_billing_address
+    create_charged_payment(checkout)
+    return checkout
+
+
+@pytest.fixture()
+def checkout_with_50_lines_and_charged_payment(
+    checkout, product, warehouse, address, shipping_method
+):
+    variants = ProductVariant.objects.bulk_create(
+        [ProductVariant(product=product, sku=f"Variant #{i}") for i in range(50)]
+    )
+    Stock.objects.bulk_create(
+        [
+            Stock(warehouse=warehouse, product_variant=variant, quantity=10)
+            for variant in variants
+        ]
+    )
+    for variant in variants:
+        add_variant_to_checkout(checkout, variant, 1)
+
+    checkout.shipping_address = address.get_copy()
+    checkout.shipping_method = shipping_method
+    checkout.billing_address = address
+    checkout.save()
 
+    create_charged_payment(checkout)
     return checkout
@@ -111,3 +111,58 @@ def test_category_view(api_client, category_with_products, count_queries):
         "id": graphene.Node.to_global_id("Category", category_with_products.pk),
     }
     get_graphql_content(api_client.post_graphql(query, variables))
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_category_products_with_stock_fields(
+    api_client, category_with_products, count_queries
+):
+    query = """
+        query CategoryProducts($id: ID!) {
+          category(id: $id) {
+            products(first: 100) {
+              edges {
+                node {
+                  id
+                  isAvailable
+                  images {
+                    url
+                  }
+                  collections {
+                    name
+                  }
+                  attributes {
+                    attribute {
+                      slug
+                    }
+                    values {
+                      slug
+                    }
+                  }
+                  variants {
+                    id
+                    stockQuantity
+                    isAvailable
+                    images {
+                      url
+                    }
+                    attributes {
+                      attribute {
+                        slug
+                      }
+                      values {
+                        slug
+                      }
+                    }
+                  }
+                }
+              }
+            }
+          }
+        }
+    """
+    variables = {
+        "id": graphene.Node.to_global_id("Category", category_with_products.pk)
+    }
+    get_graphql_content(api_client.post_graphql(query, variables))
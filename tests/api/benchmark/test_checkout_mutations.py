@@ -518,3 +518,30 @@ def test_complete_checkout(api_client, checkout_with_charged_payment, count_quer
 
     response = get_graphql_content(api_client.post_graphql(query, variables))
     assert not response["data"]["checkoutComplete"]["errors"]
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_complete_checkout_with_50_lines(
+    api_client, checkout_with_50_lines_and_charged_payment, count_queries
+):
+    query = """
+        mutation completeCheckout($checkoutId: ID!) {
+          checkoutComplete(checkoutId: $checkoutId) {
+            errors {
+              field
+              message
+            }
+            order {
+              id
+              token
+            }
+          }
+        }
+    """
+
+    checkout = checkout_with_50_lines_and_charged_payment
+    variables = {"checkoutId": Node.to_global_id("Checkout", checkout.pk)}
+
+    response = get_graphql_content(api_client.post_graphql(query, variables))
+    assert not response["data"]["checkoutComplete"]["errors"]
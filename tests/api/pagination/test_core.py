@@ -2,6 +2,7 @@ import math
 
 import graphene
 import pytest
+from graphql_relay.utils import base64
 
 from saleor.graphql.core.connection import CountableDjangoObjectType
 from saleor.graphql.core.fields import FilterInputConnectionField
@@ -16,6 +17,14 @@ class BookType(CountableDjangoObjectType):
 
 class Query(graphene.ObjectType):
     books = FilterInputConnectionField(BookType)
+    keyset_books = FilterInputConnectionField(BookType, keyset_pagination=True)
+    keyset_books_by_name = FilterInputConnectionField(
+        BookType, keyset_pagination=True
+    )
+
+    @staticmethod
+    def resolve_keyset_books_by_name(*_args, **_kwargs):
+        return Book.objects.order_by("-name")
 
 
 schema = graphene.Schema(query=Query)
@@ -27,6 +36,11 @@ def books(db):
     return Book.objects.bulk_create(books)
 
 
+@pytest.fixture
+def keyset_pagination_enabled(settings):
+    settings.KEYSET_PAGINATION_ENABLED = True
+
+
 QUERY_PAGINATION_TEST = """
     query BooksPaginationTest($first: Int, $last: Int, $after: String, $before: String){
         books(first: $first, last: $last, after: $after, before: $before) {
@@ -225,3 +239,156 @@ def test_pagination_backward_first_page_info(books):
 #     page_info = content["books"]["pageInfo"]
 #     assert page_info["hasNextPage"]
 #     assert page_info["hasPreviousPage"] is False
+
+
+def test_pagination_does_not_count_items(books, assert_num_queries):
+    variables = {"first": 5, "after": None}
+    with assert_num_queries(1):
+        result = schema.execute(QUERY_PAGINATION_TEST, variables=variables)
+    assert not result.errors
+    assert len(result.data["books"]["edges"]) == 5
+    assert result.data["books"]["pageInfo"]["hasNextPage"]
+
+
+def test_pagination_total_count(books):
+    query = """
+        query BooksTotalCount($first: Int, $after: String) {
+            books(first: $first, after: $after) {
+                totalCount
+                edges {
+                    node {
+                        name
+                    }
+                }
+            }
+        }
+    """
+    result = schema.execute(query, variables={"first": 5})
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == len(books)
+    assert len(result.data["books"]["edges"]) == 5
+
+
+QUERY_KEYSET_PAGINATION_TEST = """
+    query BooksKeysetPaginationTest(
+        $first: Int, $last: Int, $after: String, $before: String
+    ){
+        keysetBooksByName(
+            first: $first, last: $last, after: $after, before: $before
+        ) {
+            totalCount
+            edges {
+                node {
+                    name
+                }
+            }
+            pageInfo{
+                startCursor
+                endCursor
+                hasNextPage
+                hasPreviousPage
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.parametrize("page_size", [1, 5, 8, 25])
+def test_keyset_pagination_forward(page_size, books, keyset_pagination_enabled):
+    end_cursor = None
+    has_next_page = True
+    names = []
+    while has_next_page:
+        variables = {"first": page_size, "after": end_cursor}
+        result = schema.execute(QUERY_KEYSET_PAGINATION_TEST, variables=variables)
+        assert not result.errors
+        content = result.data["keysetBooksByName"]
+        assert content["pageInfo"]["hasPreviousPage"] is bool(end_cursor)
+        has_next_page = content["pageInfo"]["hasNextPage"]
+        end_cursor = content["pageInfo"]["endCursor"]
+        names.extend(edge["node"]["name"] for edge in content["edges"])
+        assert content["totalCount"] == len(books)
+    assert names == sorted((book.name for book in books), reverse=True)
+
+
+@pytest.mark.parametrize("page_size", [1, 5, 8, 25])
+def test_keyset_pagination_backward(page_size, books, keyset_pagination_enabled):
+    start_cursor = None
+    has_previous_page = True
+    names = []
+    while has_previous_page:
+        variables = {"last": page_size, "before": start_cursor}
+        result = schema.execute(QUERY_KEYSET_PAGINATION_TEST, variables=variables)
+        assert not result.errors
+        content = result.data["keysetBooksByName"]
+        assert content["pageInfo"]["hasNextPage"] is bool(start_cursor)
+        has_previous_page = content["pageInfo"]["hasPreviousPage"]
+        start_cursor = content["pageInfo"]["startCursor"]
+        names = [edge["node"]["name"] for edge in content["edges"]] + names
+    assert names == sorted((book.name for book in books), reverse=True)
+
+
+def test_keyset_pagination_previous_page_using_last(books, keyset_pagination_enabled):
+    query = """
+        query BooksKeysetPaginationTest($first: Int, $last: Int, $before: String){
+            keysetBooks(first: $first, last: $last, before: $before) {
+                edges {
+                    node {
+                        name
+                    }
+                }
+                pageInfo{
+                    endCursor
+                }
+            }
+        }
+    """
+    result = schema.execute(query, variables={"first": 10})
+    assert not result.errors
+    edges = result.data["keysetBooks"]["edges"]
+    end_cursor = result.data["keysetBooks"]["pageInfo"]["endCursor"]
+
+    result = schema.execute(query, variables={"last": 5, "before": end_cursor})
+    assert not result.errors
+    assert result.data["keysetBooks"]["edges"] == edges[4:9]
+
+
+def test_keyset_pagination_fetches_only_requested_page(
+    books, keyset_pagination_enabled, assert_num_queries
+):
+    variables = {"first": 5}
+    result = schema.execute(QUERY_KEYSET_PAGINATION_TEST, variables=variables)
+    end_cursor = result.data["keysetBooksByName"]["pageInfo"]["endCursor"]
+
+    query = QUERY_KEYSET_PAGINATION_TEST.replace("totalCount", "")
+    variables = {"first": 5, "after": end_cursor}
+    with assert_num_queries(1) as ctx:
+        result = schema.execute(query, variables=variables)
+    assert not result.errors
+    sql = ctx.captured_queries[0]["sql"]
+    assert "OFFSET" not in sql
+    assert "COUNT" not in sql
+
+
+def test_keyset_pagination_invalid_cursor(books):
+    variables = {"first": 5, "after": base64("keyset:[5")}
+    result = schema.execute(QUERY_KEYSET_PAGINATION_TEST, variables=variables)
+    assert result.errors
+    assert "is invalid" in result.errors[0].message
+
+
+def test_keyset_pagination_disabled_returns_offset_cursors(books):
+    result = schema.execute(QUERY_KEYSET_PAGINATION_TEST, variables={"first": 5})
+    assert not result.errors
+    end_cursor = result.data["keysetBooksByName"]["pageInfo"]["endCursor"]
+    assert end_cursor == base64("arrayconnection:4")
+
+
+def test_keyset_pagination_accepts_offset_cursors(books, keyset_pagination_enabled):
+    variables = {"first": 5, "after": base64("arrayconnection:4")}
+    result = schema.execute(QUERY_KEYSET_PAGINATION_TEST, variables=variables)
+    assert not result.errors
+    names = [
+        edge["node"]["name"] for edge in result.data["keysetBooksByName"]["edges"]
+    ]
+    assert names == sorted((book.name for book in books), reverse=True)[5:10]
@@ -8,6 +8,7 @@ import pytest
 from django.contrib.auth.tokens import default_token_generator
 from django.core.exceptions import ValidationError
 from django.core.files import File
+from django.core.management import call_command
 from django.core.validators import URLValidator
 from django.test import override_settings
 from freezegun import freeze_time
@@ -2855,6 +2856,8 @@ def test_query_customer_members_with_filter_search(
             ),
         ]
     )
+    # Bulk created objects get their search documents from the backfill
+    call_command("update_dashboard_search_documents")
 
     variables = {"filter": customer_filter}
     response = staff_api_client.post_graphql(
@@ -2942,6 +2945,8 @@ def test_query_staff_members_with_filter_search(
             ),
         ]
     )
+    # Bulk created objects get their search documents from the backfill
+    call_command("update_dashboard_search_documents")
 
     variables = {"filter": staff_member_filter}
     response = staff_api_client.post_graphql(
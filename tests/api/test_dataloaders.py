@@ -0,0 +1,67 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from promise import Promise
+
+from saleor.graphql.core.dataloaders import DataLoader
+from saleor.graphql.product.dataloaders import (
+    ImagesByProductIdLoader,
+    ProductVariantsByProductIdLoader,
+)
+from saleor.graphql.warehouse.dataloaders import (
+    IsProductInStockByProductIdAndCountryCodeLoader,
+    StockByProductVariantIdAndCountryCodeLoader,
+)
+
+
+class Context:
+    pass
+
+
+def test_dataloader_is_shared_within_context():
+    context = Context()
+    assert ImagesByProductIdLoader(context) is ImagesByProductIdLoader(context)
+    assert ImagesByProductIdLoader(context) is not ImagesByProductIdLoader(Context())
+
+
+def test_dataloader_without_context_key_raises_error():
+    class KeylessLoader(DataLoader):
+        pass
+
+    with pytest.raises(TypeError):
+        KeylessLoader(Context())
+
+
+def test_product_variants_loader_batches_queries(product_list):
+    loader = ProductVariantsByProductIdLoader(Context())
+    product_ids = [product.pk for product in product_list]
+
+    with CaptureQueriesContext(connection) as queries:
+        results = Promise.all([loader.load(pk) for pk in product_ids]).get()
+
+    assert len(queries) == 1
+    for product, variants in zip(product_list, results):
+        assert variants == list(product.variants.order_by("pk"))
+
+
+def test_stock_loader_returns_stock_for_country(variant, stock):
+    country = stock.warehouse.countries.pop()
+    loader = StockByProductVariantIdAndCountryCodeLoader(Context())
+
+    assert loader.load((variant.pk, country)).get() == stock
+    assert loader.load((variant.pk, "XX")).get() is None
+
+
+def test_is_product_in_stock_loader(product_list, product):
+    country = "US"
+    for stock in product.variants.first().stocks.all():
+        stock.quantity_allocated = stock.quantity
+        stock.save(update_fields=["quantity_allocated"])
+    loader = IsProductInStockByProductIdAndCountryCodeLoader(Context())
+    keys = [(product.pk, country), (product_list[0].pk, country)]
+
+    with CaptureQueriesContext(connection) as queries:
+        results = loader.load_many(keys).get()
+
+    assert len(queries) == 1
+    assert results == [False, True]
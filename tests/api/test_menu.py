@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 
 from saleor.graphql.menu.mutations import NavigationType, _validate_menu_item_instance
 from saleor.menu.models import Menu, MenuItem
+from saleor.menu.utils import update_menu
 from saleor.product.models import Category
 from tests.api.utils import get_graphql_content
 
@@ -159,6 +160,92 @@ def test_menu_items_query(user_api_client, menu_item, collection):
     assert data["url"] is None
 
 
+QUERY_MENU_WITH_ITEMS = """
+    query menu($menu_name: String) {
+        menu(name: $menu_name) {
+            items {
+                name
+                category {
+                    name
+                }
+                children {
+                    name
+                    children {
+                        name
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+def test_menu_query_uses_compiled_menu(
+    api_client, menu_item, category, assert_num_queries
+):
+    menu_item.category = category
+    menu_item.url = None
+    menu_item.save()
+    child_item = MenuItem.objects.create(
+        menu=menu_item.menu, name="Link 2", parent=menu_item
+    )
+    grand_child_item = MenuItem.objects.create(
+        menu=menu_item.menu, name="Link 3", parent=child_item
+    )
+    update_menu(menu_item.menu)
+    variables = {"menu_name": menu_item.menu.name}
+    get_graphql_content(api_client.post_graphql(QUERY_MENU_WITH_ITEMS, variables))
+
+    # Only the menu is fetched, its items come from the compiled content
+    with assert_num_queries(1):
+        response = api_client.post_graphql(QUERY_MENU_WITH_ITEMS, variables)
+    content = get_graphql_content(response)
+    items = content["data"]["menu"]["items"]
+    assert len(items) == 1
+    assert items[0]["name"] == menu_item.name
+    assert items[0]["category"]["name"] == category.name
+    assert items[0]["children"][0]["name"] == child_item.name
+    children = items[0]["children"][0]["children"]
+    assert children[0]["name"] == grand_child_item.name
+
+
+def test_menu_query_not_compiled_menu(api_client, menu_item):
+    Menu.objects.filter(pk=menu_item.menu_id).update(json_content={})
+    variables = {"menu_name": menu_item.menu.name}
+    response = api_client.post_graphql(QUERY_MENU_WITH_ITEMS, variables)
+    content = get_graphql_content(response)
+    items = content["data"]["menu"]["items"]
+    assert [item["name"] for item in items] == [menu_item.name]
+
+
+def test_compiled_menu_is_updated_on_category_rename(
+    staff_api_client, menu_item, category, permission_manage_products
+):
+    menu_item.category = category
+    menu_item.save()
+    update_menu(menu_item.menu)
+    query = """
+        mutation($id: ID!, $name: String) {
+            categoryUpdate(id: $id, input: {name: $name}) {
+                productErrors {
+                    field
+                }
+            }
+        }
+    """
+    variables = {
+        "id": graphene.Node.to_global_id("Category", category.pk),
+        "name": "New name",
+    }
+    response = staff_api_client.post_graphql(
+        query, variables, permissions=[permission_manage_products]
+    )
+    get_graphql_content(response)
+
+    menu_item.menu.refresh_from_db()
+    assert menu_item.menu.json_content[0]["category"]["name"] == "New name"
+
+
 @pytest.mark.parametrize(
     "menu_item_filter, count",
     [({"search": "MenuItem1"}, 1), ({"search": "MenuItem"}, 2)],
@@ -5,6 +5,7 @@ from unittest.mock import ANY, MagicMock, Mock
 import graphene
 import pytest
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from freezegun import freeze_time
 from prices import Money, TaxedMoney
 
@@ -2518,6 +2519,8 @@ def test_orders_query_with_filter_search(
             ),
         ]
     )
+    # Bulk created objects get their search documents from the backfill
+    call_command("update_dashboard_search_documents")
     variables = {"filter": orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
     response = staff_api_client.post_graphql(orders_query_with_filter, variables)
@@ -2581,6 +2584,8 @@ def test_draft_orders_query_with_filter_search(
             ),
         ]
     )
+    # Bulk created objects get their search documents from the backfill
+    call_command("update_dashboard_search_documents")
     variables = {"filter": draft_orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
     response = staff_api_client.post_graphql(draft_orders_query_with_filter, variables)
@@ -0,0 +1,258 @@
+import graphene
+import pytest
+from django.core.cache import cache
+from graphql import get_default_backend
+from graphql_jwt.settings import jwt_settings
+from graphql_jwt.shortcuts import get_token
+
+from saleor.core.response_cache import ResponseCacheTag, invalidate_response_cache
+from saleor.graphql.api import schema
+from saleor.graphql.query_cache import get_document
+from saleor.graphql.response_cache import get_document_tags
+from saleor.product.models import Product
+
+from .utils import get_graphql_content
+
+
+@pytest.fixture
+def response_cache(settings):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    cache.clear()
+
+
+QUERY_PRODUCT = """
+    query Product($id: ID!) {
+        product(id: $id) {
+            name
+            pricing {
+                onSale
+            }
+        }
+    }
+"""
+
+
+def test_anonymous_query_response_is_cached(
+    response_cache, api_client, product, assert_num_queries
+):
+    variables = {"id": graphene.Node.to_global_id("Product", product.pk)}
+    content = get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+    assert content["data"]["product"]["name"] == product.name
+
+    with assert_num_queries(0):
+        response = api_client.post_graphql(QUERY_PRODUCT, variables)
+    content = get_graphql_content(response)
+    assert content["data"]["product"]["name"] == product.name
+
+
+def test_cached_response_is_invalidated_on_save(
+    response_cache, run_on_commit, api_client, product
+):
+    variables = {"id": graphene.Node.to_global_id("Product", product.pk)}
+    get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+
+    product.name = "New name"
+    product.save(update_fields=["name"])
+
+    content = get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+    assert content["data"]["product"]["name"] == "New name"
+
+
+def test_cached_response_is_invalidated_after_commit(
+    response_cache, api_client, product
+):
+    variables = {"id": graphene.Node.to_global_id("Product", product.pk)}
+    get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+    old_name = product.name
+
+    product.name = "New name"
+    product.save(update_fields=["name"])
+
+    # The transaction of the test is never committed
+    content = get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+    assert content["data"]["product"]["name"] == old_name
+
+
+QUERY_ATTRIBUTES = """
+    query {
+        attributes(first: 10) {
+            edges {
+                node {
+                    name
+                }
+            }
+        }
+    }
+"""
+
+
+def test_cached_attributes_response_is_invalidated_on_save(
+    response_cache, run_on_commit, api_client, color_attribute
+):
+    get_graphql_content(api_client.post_graphql(QUERY_ATTRIBUTES))
+
+    color_attribute.name = "New name"
+    color_attribute.save(update_fields=["name"])
+
+    content = get_graphql_content(api_client.post_graphql(QUERY_ATTRIBUTES))
+    names = [edge["node"]["name"] for edge in content["data"]["attributes"]["edges"]]
+    assert "New name" in names
+
+
+QUERY_MENU_PAGES = """
+    query Menu($name: String!) {
+        menu(name: $name) {
+            items {
+                page {
+                    title
+                }
+            }
+        }
+    }
+"""
+
+
+def test_cached_menu_response_is_invalidated_on_page_save(
+    response_cache, run_on_commit, api_client, menu, page
+):
+    menu.items.create(name=page.title, page=page)
+    variables = {"name": menu.name}
+    get_graphql_content(api_client.post_graphql(QUERY_MENU_PAGES, variables))
+
+    page.title = "New title"
+    page.save(update_fields=["title"])
+
+    content = get_graphql_content(api_client.post_graphql(QUERY_MENU_PAGES, variables))
+    assert content["data"]["menu"]["items"][0]["page"]["title"] == "New title"
+
+
+def test_cached_response_is_kept_when_other_tag_is_invalidated(
+    response_cache, run_on_commit, api_client, product, assert_num_queries
+):
+    variables = {"id": graphene.Node.to_global_id("Product", product.pk)}
+    get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+
+    invalidate_response_cache(ResponseCacheTag.MENU)
+
+    with assert_num_queries(0):
+        get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+
+
+def test_authenticated_query_response_is_not_cached(
+    response_cache, user_api_client, product
+):
+    variables = {"id": graphene.Node.to_global_id("Product", product.pk)}
+    get_graphql_content(user_api_client.post_graphql(QUERY_PRODUCT, variables))
+
+    Product.objects.filter(pk=product.pk).update(name="New name")
+
+    content = get_graphql_content(
+        user_api_client.post_graphql(QUERY_PRODUCT, variables)
+    )
+    assert content["data"]["product"]["name"] == "New name"
+
+
+def test_query_authenticated_with_cookie_is_not_cached(
+    response_cache, api_client, staff_user, permission_manage_products, product
+):
+    product.is_published = False
+    product.save(update_fields=["is_published"])
+    staff_user.user_permissions.add(permission_manage_products)
+    variables = {"id": graphene.Node.to_global_id("Product", product.pk)}
+
+    api_client.cookies[jwt_settings.JWT_COOKIE_NAME] = get_token(staff_user)
+    content = get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+    assert content["data"]["product"]["name"] == product.name
+
+    del api_client.cookies[jwt_settings.JWT_COOKIE_NAME]
+    content = get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+    assert content["data"]["product"] is None
+
+
+def test_response_is_not_cached_when_disabled(settings, api_client, product):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 0
+    cache.clear()
+    variables = {"id": graphene.Node.to_global_id("Product", product.pk)}
+    get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+
+    Product.objects.filter(pk=product.pk).update(name="New name")
+
+    content = get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+    assert content["data"]["product"]["name"] == "New name"
+
+
+def test_document_tags():
+    document = get_document(get_default_backend(), schema, QUERY_PRODUCT)
+    assert get_document_tags(document) == {
+        ResponseCacheTag.PRODUCT,
+        ResponseCacheTag.SALE,
+    }
+
+
+def test_document_tags_with_fragments():
+    query = """
+        fragment MenuItemFields on MenuItem {
+            name
+            collection {
+                name
+            }
+        }
+        query {
+            shop {
+                navigation {
+                    main {
+                        items {
+                            ...MenuItemFields
+                        }
+                    }
+                }
+            }
+        }
+    """
+    document = get_document(get_default_backend(), schema, query)
+    assert get_document_tags(document) == {
+        ResponseCacheTag.SHOP,
+        ResponseCacheTag.MENU,
+        ResponseCacheTag.COLLECTION,
+    }
+
+
+def test_document_tags_of_menu_pages():
+    document = get_document(get_default_backend(), schema, QUERY_MENU_PAGES)
+    assert get_document_tags(document) == {ResponseCacheTag.MENU, ResponseCacheTag.PAGE}
+
+
+def test_document_tags_of_product_types():
+    query = """
+        query {
+            productTypes(first: 10) {
+                edges {
+                    node {
+                        name
+                        productAttributes {
+                            values {
+                                name
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """
+    document = get_document(get_default_backend(), schema, query)
+    assert get_document_tags(document) == {
+        ResponseCacheTag.PRODUCT_TYPE,
+        ResponseCacheTag.ATTRIBUTE,
+    }
+
+
+def test_client_specific_queries_are_not_cached():
+    query = """
+        query Checkout($token: UUID!) {
+            checkout(token: $token) {
+                token
+            }
+        }
+    """
+    document = get_document(get_default_backend(), schema, query)
+    assert get_document_tags(document) is None
@@ -4,9 +4,12 @@ from unittest import mock
 import graphene
 import pytest
 from django.test import override_settings
+from graphql.language.parser import parse as graphql_parse
+from graphql.validation import validate as graphql_validate
 
 from saleor.demo.views import EXAMPLE_QUERY
 from saleor.graphql.product.types import Product
+from saleor.graphql.query_cache import get_query_hash
 from saleor.graphql.views import handled_errors_logger, unhandled_errors_logger
 
 from .conftest import API_PATH
@@ -234,3 +237,79 @@ def test_example_query(api_client, product):
     response = api_client.post_graphql(EXAMPLE_QUERY)
     content = get_graphql_content(response)
     assert content["data"]["products"]["edges"][0]["node"]["name"] == product.name
+
+
+def test_query_document_is_parsed_once(api_client):
+    query = "{ shop { name } }"
+    with mock.patch(
+        "graphql.backend.core.parse", wraps=graphql_parse
+    ) as mocked_parse, mock.patch(
+        "saleor.graphql.query_cache.validate", wraps=graphql_validate
+    ) as mocked_validate:
+        for _ in range(3):
+            content = get_graphql_content(api_client.post_graphql(query))
+            assert content["data"]["shop"]["name"]
+
+    mocked_parse.assert_called_once()
+    mocked_validate.assert_called_once()
+
+
+def test_cached_invalid_query_returns_validation_errors(api_client):
+    query = "query { invalid }"
+    for _ in range(2):
+        response = api_client.post_graphql(query)
+        assert response.status_code == 400
+        content = _get_graphql_content_from_response(response)
+        assert "Cannot query field" in content["errors"][0]["message"]
+
+
+def _get_persisted_query_data(query_hash, query=None):
+    data = {
+        "extensions": {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+    }
+    if query is not None:
+        data["query"] = query
+    return data
+
+
+def test_persisted_query_not_found(api_client):
+    query = "{ shop { name } }"
+    response = api_client.post(_get_persisted_query_data(get_query_hash(query)))
+    assert response.status_code == 200
+    content = _get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+    assert content["errors"][0]["extensions"]["exception"]["code"] == (
+        "PersistedQueryNotFound"
+    )
+
+
+def test_persisted_query_is_registered_and_executed_by_hash(api_client, site_settings):
+    query = "{ shop { name } }"
+    query_hash = get_query_hash(query)
+
+    response = api_client.post(_get_persisted_query_data(query_hash, query))
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+    response = api_client.post(_get_persisted_query_data(query_hash))
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+
+def test_persisted_query_hash_mismatch(api_client):
+    query = "{ shop { name } }"
+    data = _get_persisted_query_data(get_query_hash("{ shop { domain } }"), query)
+    response = api_client.post(data)
+    assert response.status_code == 400
+    content = _get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Provided hash does not match the query."
+    )
+
+
+def test_persisted_query_unsupported_version(api_client):
+    query = "{ shop { name } }"
+    data = _get_persisted_query_data(get_query_hash(query), query)
+    data["extensions"]["persistedQuery"]["version"] = 2
+    response = api_client.post(data)
+    assert response.status_code == 400
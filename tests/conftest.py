@@ -11,6 +11,7 @@ import pytest
 from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import connection
@@ -38,7 +39,9 @@ from saleor.discount.models import (
     VoucherCustomer,
     VoucherTranslation,
 )
+from saleor.extensions.manager import clear_extensions_manager_cache
 from saleor.giftcard.models import GiftCard
+from saleor.graphql.query_cache import clear_document_cache
 from saleor.menu.models import Menu, MenuItem, MenuItemTranslation
 from saleor.menu.utils import update_menu
 from saleor.order import OrderStatus
@@ -50,6 +53,10 @@ from saleor.page.models import Page, PageTranslation
 from saleor.payment import ChargeStatus, TransactionKind
 from saleor.payment.models import Payment
 from saleor.product import AttributeInputType
+from saleor.product.attribute_index import (
+    ATTRIBUTE_INDEX_VERSION_CACHE_KEY,
+    clear_attribute_index_local_cache,
+)
 from saleor.product.models import (
     Attribute,
     AttributeTranslation,
@@ -169,6 +176,37 @@ def assert_max_num_queries(capture_queries):
     return partial(capture_queries, exact=False)
 
 
+@pytest.fixture(autouse=True)
+def reset_extensions_manager_cache():
+    """Make sure managers built by previous tests are not reused."""
+    clear_extensions_manager_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_attribute_index():
+    """Make sure slugs resolved by previous tests are not reused."""
+    cache.delete(ATTRIBUTE_INDEX_VERSION_CACHE_KEY)
+    clear_attribute_index_local_cache()
+
+
+@pytest.fixture
+def run_on_commit(monkeypatch):
+    """Run the callbacks scheduled for the end of the transaction right away."""
+    monkeypatch.setattr("django.db.transaction.on_commit", lambda func: func())
+
+
+@pytest.fixture(autouse=True)
+def reset_graphql_document_cache():
+    """Make sure documents parsed by previous tests are not reused."""
+    clear_document_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_thumbnail_manifest():
+    """Make sure thumbnail URLs recorded by previous tests are not reused."""
+    cache.clear()
+
+
 @pytest.fixture(autouse=True)
 def setup_dummy_gateway(settings):
     settings.PLUGINS = ["saleor.payment.gateways.dummy.plugin.DummyGatewayPlugin"]
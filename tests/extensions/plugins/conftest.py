@@ -1,3 +1,6 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 from django_prices_vatlayer.models import VAT
 from django_prices_vatlayer.utils import get_tax_for_rate
@@ -64,3 +67,47 @@ def vatlayer(db, settings, tax_rates, taxes):
     }
     VAT.objects.create(country_code="DE", data=tax_rates_2)
     return taxes
+
+
+class WebhookServer(ThreadingHTTPServer):
+    """Local stand-in for webhook targets recording the received requests.
+
+    Requests to paths starting with `/fail` are answered with an error.
+    """
+
+    def __init__(self):
+        self.received = []
+        super().__init__(("127.0.0.1", 0), WebhookRequestHandler)
+
+    def get_url(self, path="/", host="127.0.0.1"):
+        return f"http://{host}:{self.server_port}{path}"
+
+
+class WebhookRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.received.append(
+            {
+                "path": self.path,
+                "headers": dict(self.headers),
+                "body": body.decode("utf-8"),
+            }
+        )
+        self.send_response(500 if self.path.startswith("/fail") else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def webhook_server():
+    server = WebhookServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
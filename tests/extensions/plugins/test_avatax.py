@@ -10,9 +10,11 @@ from saleor.extensions.manager import get_extensions_manager
 from saleor.extensions.models import PluginConfiguration
 from saleor.extensions.plugins.avatax import (
     AvataxConfiguration,
-    checkout_needs_new_fetch,
+    TransactionType,
     generate_request_data_from_checkout,
+    get_cached_response_or_fetch,
     get_cached_tax_codes_or_fetch,
+    get_request_digest,
 )
 from saleor.extensions.plugins.avatax.plugin import AvataxPlugin
 
@@ -358,14 +360,67 @@ def test_get_cached_tax_codes_or_fetch_wrong_response(monkeypatch):
     assert len(tax_codes) == 0
 
 
-def test_checkout_needs_new_fetch(monkeypatch, checkout_with_item, address):
-    monkeypatch.setattr("saleor.extensions.plugins.avatax.cache.get", lambda x: None)
+@pytest.fixture
+def avatax_api(monkeypatch):
+    """Local stand-in for the Avatax transactions endpoint recording the requests."""
+    sent_requests = []
+
+    def api_post_request(url, data, config):
+        sent_requests.append(data)
+        return {"currencyCode": "USD", "totalTax": 0.0, "lines": []}
+
+    monkeypatch.setattr(
+        "saleor.extensions.plugins.avatax.api_post_request", api_post_request
+    )
+    return sent_requests
+
+
+def test_get_request_digest_ignores_sales_order_code(checkout_with_item, address):
     checkout_with_item.shipping_address = address
-    config = AvataxConfiguration(
-        username_or_account="wrong_data", password_or_license="wrong_data"
+    config = AvataxConfiguration(username_or_account="test", password_or_license="")
+    data = generate_request_data_from_checkout(checkout_with_item, config)
+    other_data = generate_request_data_from_checkout(
+        checkout_with_item, config, transaction_token="other-token"
+    )
+    assert get_request_digest(data) == get_request_digest(other_data)
+
+    data["createTransactionModel"]["lines"][0]["quantity"] += 1
+    assert get_request_digest(data) != get_request_digest(other_data)
+
+
+def test_get_request_digest_keeps_sales_invoice_code(checkout_with_item, address):
+    checkout_with_item.shipping_address = address
+    config = AvataxConfiguration(username_or_account="test", password_or_license="")
+    data = generate_request_data_from_checkout(
+        checkout_with_item, config, transaction_type=TransactionType.INVOICE
     )
-    checkout_data = generate_request_data_from_checkout(checkout_with_item, config)
-    assert checkout_needs_new_fetch(checkout_data, str(checkout_with_item.token))
+    other_data = generate_request_data_from_checkout(
+        checkout_with_item,
+        config,
+        transaction_token="other-token",
+        transaction_type=TransactionType.INVOICE,
+    )
+    assert get_request_digest(data) != get_request_digest(other_data)
+
+
+def test_get_cached_response_or_fetch(avatax_api, checkout_with_item, address):
+    checkout_with_item.shipping_address = address
+    config = AvataxConfiguration(username_or_account="test", password_or_license="")
+    data = generate_request_data_from_checkout(checkout_with_item, config)
+    other_data = generate_request_data_from_checkout(
+        checkout_with_item, config, transaction_token="other-token"
+    )
+
+    response = get_cached_response_or_fetch(data, config)
+    assert get_cached_response_or_fetch(other_data, config) == response
+    assert len(avatax_api) == 1
+
+    get_cached_response_or_fetch(data, config, force_refresh=True)
+    assert len(avatax_api) == 2
+
+    data["createTransactionModel"]["lines"][0]["quantity"] += 1
+    get_cached_response_or_fetch(data, config)
+    assert len(avatax_api) == 3
 
 
 def test_get_plugin_configuration(settings):
@@ -1,28 +1,35 @@
 from unittest import mock
 
 import pytest
-import requests
 from django.core.serializers import serialize
 
 from saleor.account.models import ServiceAccount
 from saleor.extensions.manager import get_extensions_manager
 from saleor.extensions.plugins.webhook import create_hmac_signature
-from saleor.extensions.plugins.webhook.tasks import trigger_webhooks_for_event
+from saleor.extensions.plugins.webhook.delivery import (
+    WebhookDelivery,
+    get_session,
+    send_webhook_deliveries,
+)
+from saleor.extensions.plugins.webhook.tasks import (
+    WEBHOOK_RETRY_BACKOFF,
+    trigger_webhooks_for_event,
+    trigger_webhooks_for_object,
+)
+from saleor.webhook.cache import invalidate_webhooks_cache
 from saleor.webhook.event_types import WebhookEventType
+from saleor.webhook.models import Webhook
 from saleor.webhook.payloads import (
     generate_checkout_payload,
     generate_customer_payload,
     generate_order_payload,
     generate_product_payload,
 )
+from saleor.webhook.utils import WebhookSubscription, get_webhooks_for_event
 
 
-@pytest.mark.vcr
-@mock.patch(
-    "saleor.extensions.plugins.webhook.tasks.requests.post", wraps=requests.post
-)
 def test_trigger_webhooks_for_event(
-    mock_request,
+    webhook_server,
     webhook,
     order_with_lines,
     permission_manage_orders,
@@ -30,21 +37,19 @@ def test_trigger_webhooks_for_event(
     permission_manage_products,
 ):
     webhook.service_account.permissions.add(permission_manage_orders)
-    webhook.target_url = "https://webhook.site/f0fc9979-cbd4-47b7-8705-1acb03fff1d0"
+    webhook.target_url = webhook_server.get_url("/webhook/")
     webhook.save()
 
     expected_data = serialize("json", [order_with_lines])
 
     trigger_webhooks_for_event(WebhookEventType.ORDER_CREATED, expected_data)
 
-    expected_headers = {
-        "X-Saleor-Event": "order_created",
-        "X-Saleor-Domain": "mirumee.com",
-    }
-
-    mock_request.assert_called_once_with(
-        webhook.target_url, data=expected_data, headers=expected_headers, timeout=10
-    )
+    (request,) = webhook_server.received
+    assert request["path"] == "/webhook/"
+    assert request["body"] == expected_data
+    assert request["headers"]["X-Saleor-Event"] == "order_created"
+    assert request["headers"]["X-Saleor-Domain"] == "mirumee.com"
+    assert "X-Saleor-HMAC-SHA256" not in request["headers"]
 
 
 first_url = "http://www.example.com/first/"
@@ -63,7 +68,10 @@ third_url = "http://www.example.com/third/"
         (WebhookEventType.CUSTOMER_CREATED, 0, set()),
     ],
 )
-@mock.patch("saleor.extensions.plugins.webhook.tasks.send_webhook_request.delay")
+@mock.patch(
+    "saleor.extensions.plugins.webhook.tasks.send_webhook_deliveries",
+    return_value=[],
+)
 def test_trigger_webhooks_for_event_calls_expected_events(
     mock_request,
     event_name,
@@ -103,21 +111,18 @@ def test_trigger_webhooks_for_event_calls_expected_events(
     third_webhook.events.create(event_type=WebhookEventType.ANY)
 
     trigger_webhooks_for_event(event_name, data="")
-    assert mock_request.call_count == total_webhook_calls
+    (deliveries,) = mock_request.call_args[0]
+    assert len(deliveries) == total_webhook_calls
 
-    target_url_calls = {call[0][1] for call in mock_request.call_args_list}
+    target_url_calls = {delivery.target_url for delivery in deliveries}
     assert target_url_calls == expected_target_urls
 
 
-@pytest.mark.vcr
-@mock.patch(
-    "saleor.extensions.plugins.webhook.tasks.requests.post", wraps=requests.post
-)
 def test_trigger_webhooks_for_event_with_secret_key(
-    mock_request, webhook, order_with_lines, permission_manage_orders
+    webhook_server, webhook, order_with_lines, permission_manage_orders
 ):
     webhook.service_account.permissions.add(permission_manage_orders)
-    webhook.target_url = "https://webhook.site/f0fc9979-cbd4-47b7-8705-1acb03fff1d0"
+    webhook.target_url = webhook_server.get_url("/webhook/")
     webhook.secret_key = "secret_key"
     webhook.save()
 
@@ -127,98 +132,299 @@ def test_trigger_webhooks_for_event_with_secret_key(
     expected_signature = create_hmac_signature(
         expected_data, webhook.secret_key, "utf-8"
     )
-    expected_headers = {
-        "X-Saleor-Event": "order_created",
-        "X-Saleor-Domain": "mirumee.com",
-        "X-Saleor-HMAC-SHA256": f"sha1={expected_signature}",
-    }
-
-    mock_request.assert_called_once_with(
-        webhook.target_url, data=expected_data, headers=expected_headers, timeout=10
+    (request,) = webhook_server.received
+    assert request["body"] == expected_data
+    assert request["headers"]["X-Saleor-Event"] == "order_created"
+    assert request["headers"]["X-Saleor-Domain"] == "mirumee.com"
+    assert request["headers"]["X-Saleor-HMAC-SHA256"] == f"sha1={expected_signature}"
+
+
+@mock.patch("saleor.extensions.plugins.webhook.tasks.send_webhook_request.apply_async")
+def test_trigger_webhooks_for_event_retries_failed_deliveries(
+    mocked_send_webhook_request, webhook_server, webhook, permission_manage_orders
+):
+    webhook.service_account.permissions.add(permission_manage_orders)
+    webhook.target_url = webhook_server.get_url("/fail/")
+    webhook.save()
+
+    trigger_webhooks_for_event(WebhookEventType.ORDER_CREATED, "data")
+
+    assert len(webhook_server.received) == 1
+    mocked_send_webhook_request.assert_called_once_with(
+        (
+            webhook.pk,
+            webhook.target_url,
+            webhook.secret_key,
+            WebhookEventType.ORDER_CREATED,
+            "data",
+        ),
+        countdown=WEBHOOK_RETRY_BACKOFF,
+    )
+
+
+def test_send_webhook_deliveries(webhook_server, settings):
+    settings.WEBHOOK_MAX_CONCURRENT_DELIVERIES = 2
+    deliveries = [
+        WebhookDelivery(1, webhook_server.get_url("/first/"), None, "event", "1"),
+        WebhookDelivery(2, webhook_server.get_url("/fail/"), None, "event", "2"),
+        WebhookDelivery(
+            3, webhook_server.get_url("/third/", host="localhost"), None, "event", "3"
+        ),
+    ]
+
+    failed_deliveries = send_webhook_deliveries(deliveries, domain="example.com")
+
+    assert failed_deliveries == [deliveries[1]]
+    received = sorted(webhook_server.received, key=lambda request: request["body"])
+    assert [request["path"] for request in received] == ["/first/", "/fail/", "/third/"]
+    assert all(
+        request["headers"]["X-Saleor-Domain"] == "example.com" for request in received
     )
 
 
-@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_created(mocked_webhook_trigger, settings, order_with_lines):
+def test_sessions_are_reused_for_host(webhook_server):
+    first_url = webhook_server.get_url("/first/")
+    second_url = webhook_server.get_url("/second/")
+    other_host_url = webhook_server.get_url("/first/", host="localhost")
+
+    assert get_session(first_url) is get_session(second_url)
+    assert get_session(first_url) is not get_session(other_host_url)
+
+
+@pytest.fixture
+def any_events_webhook(
+    webhook,
+    permission_manage_orders,
+    permission_manage_users,
+    permission_manage_products,
+    permission_manage_checkouts,
+):
+    webhook.service_account.permissions.add(
+        permission_manage_orders,
+        permission_manage_users,
+        permission_manage_products,
+        permission_manage_checkouts,
+    )
+    webhook.events.create(event_type=WebhookEventType.ANY)
+    return webhook
+
+
+MOCKED_TRIGGER = "saleor.extensions.plugins.webhook.tasks.trigger_webhooks_for_object"
+
+
+@mock.patch(f"{MOCKED_TRIGGER}.delay")
+def test_order_created(
+    mocked_webhook_trigger,
+    settings,
+    any_events_webhook,
+    run_on_commit,
+    order_with_lines,
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_extensions_manager()
     manager.order_created(order_with_lines)
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_CREATED, expected_data
+        WebhookEventType.ORDER_CREATED, str(order_with_lines.pk)
     )
 
 
-@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_customer_created(mocked_webhook_trigger, settings, customer_user):
+@mock.patch(f"{MOCKED_TRIGGER}.delay")
+def test_order_created_without_subscribed_webhooks(
+    mocked_webhook_trigger, settings, webhook, run_on_commit, order_with_lines
+):
+    webhook.events.all().delete()
+    settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_extensions_manager()
+    manager.order_created(order_with_lines)
+
+    mocked_webhook_trigger.assert_not_called()
+
+
+@mock.patch(f"{MOCKED_TRIGGER}.delay")
+def test_customer_created(
+    mocked_webhook_trigger, settings, any_events_webhook, run_on_commit, customer_user
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_extensions_manager()
     manager.customer_created(customer_user)
 
-    expected_data = generate_customer_payload(customer_user)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CUSTOMER_CREATED, expected_data
+        WebhookEventType.CUSTOMER_CREATED, str(customer_user.pk)
     )
 
 
-@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_fully_paid(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch(f"{MOCKED_TRIGGER}.delay")
+def test_order_fully_paid(
+    mocked_webhook_trigger,
+    settings,
+    any_events_webhook,
+    run_on_commit,
+    order_with_lines,
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_extensions_manager()
     manager.order_fully_paid(order_with_lines)
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_FULLY_PAID, expected_data
+        WebhookEventType.ORDER_FULLY_PAID, str(order_with_lines.pk)
     )
 
 
-@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_created(mocked_webhook_trigger, settings, product):
+@mock.patch(f"{MOCKED_TRIGGER}.delay")
+def test_product_created(
+    mocked_webhook_trigger, settings, any_events_webhook, run_on_commit, product
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_extensions_manager()
     manager.product_created(product)
 
-    expected_data = generate_product_payload(product)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.PRODUCT_CREATED, expected_data
+        WebhookEventType.PRODUCT_CREATED, str(product.pk)
     )
 
 
-@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_updated(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch(f"{MOCKED_TRIGGER}.delay")
+def test_order_updated(
+    mocked_webhook_trigger,
+    settings,
+    any_events_webhook,
+    run_on_commit,
+    order_with_lines,
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_extensions_manager()
     manager.order_updated(order_with_lines)
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_UPDATED, expected_data
+        WebhookEventType.ORDER_UPDATED, str(order_with_lines.pk)
     )
 
 
-@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_cancelled(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch(f"{MOCKED_TRIGGER}.delay")
+def test_order_cancelled(
+    mocked_webhook_trigger,
+    settings,
+    any_events_webhook,
+    run_on_commit,
+    order_with_lines,
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_extensions_manager()
     manager.order_cancelled(order_with_lines)
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_CANCELLED, expected_data
+        WebhookEventType.ORDER_CANCELLED, str(order_with_lines.pk)
     )
 
 
-@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+@mock.patch(f"{MOCKED_TRIGGER}.delay")
 def test_checkout_quantity_changed(
-    mocked_webhook_trigger, settings, checkout_with_items
+    mocked_webhook_trigger,
+    settings,
+    any_events_webhook,
+    run_on_commit,
+    checkout_with_items,
 ):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_extensions_manager()
     manager.checkout_quantity_changed(checkout_with_items)
 
-    expected_data = generate_checkout_payload(checkout_with_items)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CHECKOUT_QUANTITY_CHANGED, expected_data
+        WebhookEventType.CHECKOUT_QUANTITY_CHANGED, str(checkout_with_items.pk)
+    )
+
+
+@pytest.mark.parametrize(
+    "event_type, object_fixture, generate_payload",
+    [
+        (WebhookEventType.ORDER_CREATED, "order_with_lines", generate_order_payload),
+        (WebhookEventType.CUSTOMER_CREATED, "customer_user", generate_customer_payload),
+        (WebhookEventType.PRODUCT_CREATED, "product", generate_product_payload),
+        (
+            WebhookEventType.CHECKOUT_QUANTITY_CHANGED,
+            "checkout_with_items",
+            generate_checkout_payload,
+        ),
+    ],
+)
+@mock.patch("saleor.extensions.plugins.webhook.tasks.trigger_webhooks_for_event")
+def test_trigger_webhooks_for_object(
+    mocked_webhook_trigger, event_type, object_fixture, generate_payload, request
+):
+    instance = request.getfixturevalue(object_fixture)
+
+    trigger_webhooks_for_object(event_type, str(instance.pk))
+
+    instance = type(instance).objects.get(pk=instance.pk)
+    mocked_webhook_trigger.assert_called_once_with(
+        event_type, generate_payload(instance)
     )
+
+
+@mock.patch("saleor.extensions.plugins.webhook.tasks.trigger_webhooks_for_event")
+def test_trigger_webhooks_for_deleted_object(mocked_webhook_trigger, order):
+    order_id = str(order.pk)
+    order.delete()
+
+    trigger_webhooks_for_object(WebhookEventType.ORDER_CREATED, order_id)
+
+    mocked_webhook_trigger.assert_not_called()
+
+
+def test_get_webhooks_for_event(webhook, permission_manage_orders):
+    assert get_webhooks_for_event(WebhookEventType.ORDER_CREATED) == []
+
+    webhook.service_account.permissions.add(permission_manage_orders)
+    assert get_webhooks_for_event(WebhookEventType.ORDER_CREATED) == [
+        WebhookSubscription(webhook.pk, webhook.target_url, webhook.secret_key)
+    ]
+    assert get_webhooks_for_event(WebhookEventType.ORDER_UPDATED) == []
+
+    webhook.events.create(event_type=WebhookEventType.ANY)
+    assert len(get_webhooks_for_event(WebhookEventType.ORDER_UPDATED)) == 1
+    assert get_webhooks_for_event(WebhookEventType.PRODUCT_CREATED) == []
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda webhook: webhook.events.all().delete(),
+        lambda webhook: webhook.delete(),
+        lambda webhook: Webhook.objects.filter(pk=webhook.pk).update(is_active=False),
+        lambda webhook: ServiceAccount.objects.filter(
+            pk=webhook.service_account_id
+        ).update(is_active=False),
+        lambda webhook: webhook.service_account.permissions.clear(),
+    ],
+)
+def test_get_webhooks_for_event_without_cache(
+    change, webhook, permission_manage_orders
+):
+    webhook.service_account.permissions.add(permission_manage_orders)
+    assert get_webhooks_for_event(WebhookEventType.ORDER_CREATED)
+
+    change(webhook)
+
+    assert get_webhooks_for_event(WebhookEventType.ORDER_CREATED) == []
+
+
+def test_subscribed_webhooks_cache_is_invalidated(
+    settings, webhook, permission_manage_orders, assert_num_queries, run_on_commit
+):
+    settings.WEBHOOKS_CACHE_TIMEOUT = 60
+    webhook.service_account.permissions.add(permission_manage_orders)
+    invalidate_webhooks_cache()
+    assert len(get_webhooks_for_event(WebhookEventType.ORDER_CREATED)) == 1
+    with assert_num_queries(0):
+        assert len(get_webhooks_for_event(WebhookEventType.ORDER_CREATED)) == 1
+
+    webhook.is_active = False
+    webhook.save(update_fields=["is_active"])
+    assert get_webhooks_for_event(WebhookEventType.ORDER_CREATED) == []
+
+    webhook.is_active = True
+    webhook.save(update_fields=["is_active"])
+    webhook.service_account.is_active = False
+    webhook.service_account.save(update_fields=["is_active"])
+    assert get_webhooks_for_event(WebhookEventType.ORDER_CREATED) == []
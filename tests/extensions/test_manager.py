@@ -4,8 +4,12 @@ import pytest
 from django_countries.fields import Country
 from prices import Money, TaxedMoney
 
-from saleor.core.taxes import TaxType
-from saleor.extensions.manager import ExtensionsManager, get_extensions_manager
+from saleor.core.taxes import TaxType, quantize_price
+from saleor.extensions.manager import (
+    ExtensionsManager,
+    get_extensions_manager,
+    invalidate_extensions_manager_cache,
+)
 from saleor.extensions.models import PluginConfiguration
 from tests.extensions.sample_plugins import (
     ActivePaymentGateway,
@@ -13,6 +17,7 @@ from tests.extensions.sample_plugins import (
     PluginInactive,
     PluginSample,
 )
+from tests.extensions.utils import call_every_plugin
 
 
 def test_get_extensions_manager():
@@ -23,6 +28,39 @@ def test_get_extensions_manager():
     assert len(manager.plugins) == 1
 
 
+def test_get_extensions_manager_reuses_manager():
+    plugins = ["tests.extensions.sample_plugins.PluginSample"]
+    manager = get_extensions_manager(plugins=plugins)
+    assert get_extensions_manager(plugins=plugins) is manager
+    assert get_extensions_manager(plugins=[]) is not manager
+
+
+def test_get_extensions_manager_cache_disabled(settings):
+    settings.EXTENSIONS_MANAGER_CACHE_TIMEOUT = 0
+    plugins = ["tests.extensions.sample_plugins.PluginSample"]
+    manager = get_extensions_manager(plugins=plugins)
+    assert get_extensions_manager(plugins=plugins) is not manager
+
+
+def test_save_plugin_configuration_invalidates_manager_cache(plugin_configuration):
+    plugins = ["tests.extensions.sample_plugins.PluginSample"]
+    manager = get_extensions_manager(plugins=plugins)
+    assert manager.get_plugin(PluginSample.PLUGIN_NAME).active
+
+    manager.save_plugin_configuration(PluginSample.PLUGIN_NAME, {"active": False})
+
+    new_manager = get_extensions_manager(plugins=plugins)
+    assert new_manager is not manager
+    assert not new_manager.get_plugin(PluginSample.PLUGIN_NAME).active
+
+
+def test_invalidate_extensions_manager_cache():
+    plugins = ["tests.extensions.sample_plugins.PluginSample"]
+    manager = get_extensions_manager(plugins=plugins)
+    invalidate_extensions_manager_cache()
+    assert get_extensions_manager(plugins=plugins) is not manager
+
+
 @pytest.mark.parametrize(
     "plugins, total_amount",
     [(["tests.extensions.sample_plugins.PluginSample"], "1.0"), ([], "15.0")],
@@ -103,6 +141,22 @@ def test_manager_calculates_checkout_line_total(
     assert TaxedMoney(expected_total, expected_total) == taxed_total
 
 
+@pytest.mark.parametrize(
+    "plugins, amount",
+    [(["tests.extensions.sample_plugins.PluginSample"], "1.0"), ([], "15.0")],
+)
+def test_manager_calculates_checkout_lines_totals(
+    checkout_with_item, discount_info, plugins, amount
+):
+    lines = list(checkout_with_item)
+    currency = checkout_with_item.currency
+    expected_total = Money(amount, currency)
+    taxed_totals = ExtensionsManager(plugins=plugins).calculate_checkout_lines_totals(
+        checkout_with_item, lines, [discount_info]
+    )
+    assert taxed_totals == [TaxedMoney(expected_total, expected_total)] * len(lines)
+
+
 @pytest.mark.parametrize(
     "plugins, amount",
     [(["tests.extensions.sample_plugins.PluginSample"], "1.0"), ([], "12.30")],
@@ -280,3 +334,57 @@ def test_manager_serve_list_all_payment_gateways():
     ]
     manager = ExtensionsManager(plugins=plugins)
     assert manager.list_payment_gateways(active_only=False) == expected_gateways
+
+
+def test_manager_skips_plugins_not_implementing_hook():
+    plugins = [
+        "tests.extensions.sample_plugins.PluginInactive",
+        "tests.extensions.sample_plugins.ActivePlugin",
+        "tests.extensions.sample_plugins.PluginSample",
+    ]
+    manager = ExtensionsManager(plugins=plugins)
+
+    hook_plugins = manager.get_plugins_for_hook("apply_taxes_to_product")
+
+    assert [plugin.PLUGIN_NAME for plugin in hook_plugins] == ["PluginSample"]
+    assert manager.get_plugins_for_hook("order_created") == []
+
+
+def test_manager_skips_inactive_plugins():
+    plugins = [
+        "tests.extensions.sample_plugins.ActivePaymentGateway",
+        "tests.extensions.sample_plugins.InactivePaymentGateway",
+    ]
+    manager = ExtensionsManager(plugins=plugins)
+
+    hook_plugins = manager.get_plugins_for_hook("process_payment")
+
+    assert [plugin.PLUGIN_NAME for plugin in hook_plugins] == ["braintree"]
+
+
+@pytest.mark.parametrize(
+    "plugins",
+    [
+        [
+            "tests.extensions.sample_plugins.PluginInactive",
+            "tests.extensions.sample_plugins.ActivePlugin",
+            "tests.extensions.sample_plugins.ActivePaymentGateway",
+        ],
+        [
+            "tests.extensions.sample_plugins.PluginInactive",
+            "tests.extensions.sample_plugins.ActivePlugin",
+            "tests.extensions.sample_plugins.PluginSample",
+        ],
+    ],
+)
+def test_manager_hooks_dispatch_matches_calling_every_plugin(plugins, product):
+    manager = ExtensionsManager(plugins=plugins)
+    price = Money("10.00", "USD")
+    country = Country("PL")
+    default_value = quantize_price(TaxedMoney(net=price, gross=price), price.currency)
+
+    assert manager.apply_taxes_to_product(
+        product, price, country
+    ) == call_every_plugin(
+        manager, "apply_taxes_to_product", default_value, product, price, country
+    )
@@ -0,0 +1,60 @@
+"""Micro-benchmark of the per-hook overhead of the extensions manager.
+
+Run with `pytest tests/extensions/test_manager_benchmark.py -s` to see the timings.
+Timings are only reported, they depend too much on the machine to be asserted.
+"""
+import timeit
+
+import pytest
+from django_countries.fields import Country
+from prices import Money, TaxedMoney
+
+from saleor.core.taxes import quantize_price
+from saleor.extensions.manager import ExtensionsManager
+from tests.extensions.utils import call_every_plugin
+
+NO_OP_PLUGINS = [
+    "tests.extensions.sample_plugins.PluginInactive",
+    "tests.extensions.sample_plugins.ActivePlugin",
+    "tests.extensions.sample_plugins.ActivePaymentGateway",
+    "tests.extensions.sample_plugins.InactivePaymentGateway",
+    "saleor.payment.gateways.dummy.plugin.DummyGatewayPlugin",
+    "saleor.payment.gateways.stripe.plugin.StripeGatewayPlugin",
+    "saleor.payment.gateways.razorpay.plugin.RazorpayGatewayPlugin",
+]
+
+
+@pytest.mark.parametrize(
+    "plugins",
+    [
+        NO_OP_PLUGINS[:5],
+        NO_OP_PLUGINS,
+        NO_OP_PLUGINS + ["tests.extensions.sample_plugins.PluginSample"],
+    ],
+)
+def test_benchmark_apply_taxes_to_product_dispatch(plugins, product):
+    manager = ExtensionsManager(plugins=plugins)
+    price = Money("10.00", "USD")
+    country = Country("PL")
+    default_value = quantize_price(TaxedMoney(net=price, gross=price), price.currency)
+    args = (product, price, country)
+    number = 2000
+
+    naive_time = timeit.timeit(
+        lambda: call_every_plugin(
+            manager, "apply_taxes_to_product", default_value, *args
+        ),
+        number=number,
+    )
+    manager_time = timeit.timeit(
+        lambda: manager.apply_taxes_to_product(*args), number=number
+    )
+
+    print(
+        f"\n{len(plugins)} plugins, apply_taxes_to_product: "
+        f"every plugin {naive_time / number * 1e6:.2f} us/call, "
+        f"hooks table {manager_time / number * 1e6:.2f} us/call"
+    )
+    assert manager.apply_taxes_to_product(*args) == call_every_plugin(
+        manager, "apply_taxes_to_product", default_value, *args
+    )
@@ -8,3 +8,16 @@ def get_config_value(
         if elem["name"] == field_name:
             return elem["value"]
     return None
+
+
+def call_every_plugin(manager, method_name, default_value, *args):
+    """Dispatch the hook the way the manager did before using the hooks table."""
+    value = default_value
+    for plugin in manager.plugins:
+        plugin_method = getattr(plugin, method_name, NotImplemented)
+        if plugin_method == NotImplemented:
+            continue
+        returned_value = plugin_method(*args, previous_value=value)
+        if returned_value != NotImplemented:
+            value = returned_value
+    return value
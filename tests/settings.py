@@ -56,6 +56,10 @@ EXTENSIONS_MANAGER = "saleor.extensions.manager.ExtensionsManager"
 
 PLUGINS = []
 
+# Tests change sales, their catalogues and webhooks directly in the database
+ACTIVE_DISCOUNTS_CACHE_TIMEOUT = 0
+WEBHOOKS_CACHE_TIMEOUT = 0
+
 PATTERNS_IGNORED_IN_QUERY_CAPTURES: List[Union[Pattern, SimpleLazyObject]] = [
     lazy_re_compile(r"^SET\s+")
 ]
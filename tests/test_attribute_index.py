@@ -0,0 +1,87 @@
+from saleor.product.attribute_index import (
+    clear_attribute_index_local_cache,
+    get_attribute_pks,
+    get_attribute_value_pks,
+)
+from saleor.product.models import AttributeValue
+
+
+def test_get_attribute_pks(color_attribute, size_attribute):
+    pks = get_attribute_pks(["color", "size", "unknown"])
+    assert pks == {"color": color_attribute.pk, "size": size_attribute.pk}
+
+
+def test_get_attribute_value_pks(color_attribute):
+    red = color_attribute.values.get(slug="red")
+    pks = get_attribute_value_pks(
+        [(color_attribute.pk, "red"), (color_attribute.pk, "unknown")]
+    )
+    assert pks == {(color_attribute.pk, "red"): red.pk}
+
+
+def test_get_attribute_pks_cached(color_attribute, assert_num_queries):
+    get_attribute_pks(["color"])
+    with assert_num_queries(0):
+        assert get_attribute_pks(["color"]) == {"color": color_attribute.pk}
+
+
+def test_get_attribute_pks_uses_shared_cache(
+    color_attribute, assert_num_queries
+):
+    get_attribute_pks(["color"])
+    # Simulate another process having an empty in-process cache
+    clear_attribute_index_local_cache()
+    with assert_num_queries(0):
+        assert get_attribute_pks(["color"]) == {"color": color_attribute.pk}
+
+
+def test_get_attribute_pks_fetches_only_missing_slugs(
+    color_attribute, size_attribute, assert_num_queries
+):
+    get_attribute_pks(["color"])
+    with assert_num_queries(1) as ctx:
+        get_attribute_pks(["color", "size"])
+    assert "color" not in ctx.captured_queries[0]["sql"]
+
+
+def test_attribute_value_slug_change_invalidates_index(color_attribute, run_on_commit):
+    red = color_attribute.values.get(slug="red")
+    get_attribute_value_pks([(color_attribute.pk, "red")])
+
+    red.slug = "dark-red"
+    red.save()
+
+    assert get_attribute_value_pks([(color_attribute.pk, "red")]) == {}
+    assert get_attribute_value_pks([(color_attribute.pk, "dark-red")]) == {
+        (color_attribute.pk, "dark-red"): red.pk
+    }
+
+
+def test_attribute_value_create_invalidates_index(color_attribute, run_on_commit):
+    assert get_attribute_value_pks([(color_attribute.pk, "green")]) == {}
+
+    green = AttributeValue.objects.create(
+        attribute=color_attribute, name="Green", slug="green"
+    )
+
+    assert get_attribute_value_pks([(color_attribute.pk, "green")]) == {
+        (color_attribute.pk, "green"): green.pk
+    }
+
+
+def test_attribute_delete_invalidates_index(color_attribute, run_on_commit):
+    get_attribute_pks(["color"])
+
+    color_attribute.delete()
+
+    assert get_attribute_pks(["color"]) == {}
+
+
+def test_attribute_index_invalidated_after_commit(color_attribute):
+    attribute_pk = color_attribute.pk
+    get_attribute_pks(["color"])
+
+    color_attribute.delete()
+
+    # The transaction of the test is never committed
+    assert get_attribute_pks(["color"]) == {"color": attribute_pk}
@@ -1008,3 +1008,29 @@ def test_store_user_address_create_new_address_if_not_associated(address):
 
     assert user.addresses.count() == expected_user_addresses_count
     assert user.default_billing_address_id != address.pk
+
+
+def test_checkout_prices_are_calculated_once(checkout_with_item):
+    checkout = checkout_with_item
+    line = checkout.lines.first()
+    manager_class = type(get_extensions_manager())
+    calculate_lines_totals = manager_class.calculate_checkout_lines_totals
+
+    with patch.object(
+        manager_class,
+        "calculate_checkout_lines_totals",
+        autospec=True,
+        side_effect=calculate_lines_totals,
+    ) as mocked_calculate_lines_totals:
+        total = calculations.checkout_total(checkout)
+        subtotal = calculations.checkout_subtotal(checkout)
+        line_total = calculations.checkout_line_total(line)
+        assert mocked_calculate_lines_totals.call_count == 1
+        assert subtotal == line_total
+        assert total == subtotal
+
+        line.quantity += 1
+        line.save(update_fields=["quantity"])
+        new_subtotal = calculations.checkout_subtotal(checkout)
+        assert mocked_calculate_lines_totals.call_count == 2
+        assert new_subtotal.gross > subtotal.gross
@@ -4,6 +4,7 @@ from unittest.mock import Mock, patch
 from urllib.parse import urljoin
 
 import pytest
+from django.core.cache import cache
 from django.core.management import CommandError, call_command
 from django.db.utils import DataError
 from django.templatetags.static import static
@@ -14,6 +15,7 @@ from saleor.account.models import Address, User
 from saleor.account.utils import create_superuser
 from saleor.core.storages import S3MediaStorage
 from saleor.core.templatetags.placeholder import placeholder
+from saleor.core.thumbnails import get_thumbnail_url_from_manifest, warm_thumbnails
 from saleor.core.utils import (
     Country,
     build_absolute_uri,
@@ -200,6 +202,67 @@ def test_create_thumbnails(product_with_image, settings):
             )  # noqa
 
 
+@override_settings(VERSATILEIMAGEFIELD_SETTINGS={"create_images_on_demand": False})
+def test_create_thumbnails_records_urls_in_manifest(product_with_image, settings):
+    sizeset = settings.VERSATILEIMAGEFIELD_RENDITION_KEY_SETS["products"]
+    product_image = product_with_image.images.first()
+
+    create_thumbnails(product_image.pk, ProductImage, "products")
+
+    for _, size_key in sizeset:
+        method, size = size_key.split("__")
+        url = get_thumbnail_url_from_manifest(product_image.image.name, size_key)
+        assert url == getattr(product_image.image, method)[size].url
+    product_image.image.delete_all_created_images()
+
+
+def test_create_thumbnails_command(product_with_image, collection_with_image, settings):
+    product_image = product_with_image.images.first()
+    out = io.StringIO()
+
+    call_command("create_thumbnails", "--workers=1", stdout=out)
+
+    key_sets = settings.VERSATILEIMAGEFIELD_RENDITION_KEY_SETS
+    images = [
+        (product_image.image, key_sets["products"]),
+        (collection_with_image.background_image, key_sets["background_images"]),
+    ]
+    for image, sizeset in images:
+        for _, size_key in sizeset:
+            assert get_thumbnail_url_from_manifest(image.name, size_key)
+    assert "1/1 images" in out.getvalue()
+
+
+def test_create_thumbnails_command_incremental(product_with_image):
+    call_command("create_thumbnails", "--workers=1", stdout=io.StringIO())
+    # Existing thumbnails are found in the storage when the manifest is lost
+    cache.clear()
+    out = io.StringIO()
+
+    call_command("create_thumbnails", "--workers=1", "--incremental", stdout=out)
+
+    assert "1/1 images, 0 thumbnails created" in out.getvalue()
+    product_image = product_with_image.images.first()
+    assert get_thumbnail_url_from_manifest(
+        product_image.image.name, "thumbnail__540x540"
+    )
+
+
+def test_warm_thumbnails_returns_urls_for_manifest(product_with_image, settings):
+    sizeset = settings.VERSATILEIMAGEFIELD_RENDITION_KEY_SETS["products"]
+    product_image = product_with_image.images.first()
+    image_name = product_image.image.name
+
+    result = warm_thumbnails(ProductImage, [product_image.pk], "image", "products")
+
+    # Worker processes may not share the cache, the caller records the URLs
+    assert not get_thumbnail_url_from_manifest(image_name, sizeset[0][1])
+    assert {(name, size_key) for name, size_key, _ in result.urls} == {
+        (image_name, size_key) for _, size_key in sizeset
+    }
+    product_image.image.delete_all_created_images()
+
+
 @patch("storages.backends.s3boto3.S3Boto3Storage")
 def test_storages_set_s3_bucket_domain(storage, settings):
     settings.AWS_MEDIA_BUCKET_NAME = "media-bucket"
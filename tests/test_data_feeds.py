@@ -1,39 +1,40 @@
 import csv
+import gzip
 from io import StringIO
+from datetime import timedelta
 from unittest.mock import Mock
 
-from django.utils.encoding import smart_text
+import pytest
+from django.core.files.storage import default_storage
+from django.utils import timezone
 
+from saleor.data_feeds import google_merchant
 from saleor.data_feeds.google_merchant import (
     get_feed_items,
     item_attributes,
     item_availability,
+    get_feed_checkpoint_path,
+    get_feed_part_path,
     item_google_product_category,
+    load_feed_checkpoint,
+    save_feed_checkpoint,
+    update_feed_in_parallel,
     write_feed,
 )
-from saleor.product.models import AttributeValue, Category
+from saleor.discount.models import Sale
+from saleor.product.models import Category, ProductVariant
 
 
 def test_saleor_feed_items(product, site_settings):
     valid_variant = product.variants.first()
     items = get_feed_items()
     assert len(items) == 1
-    categories = Category.objects.all()
     discounts = []
     category_paths = {}
     attributes_dict = {}
     current_site = site_settings.site
-    attribute_values_dict = {
-        smart_text(a.pk): smart_text(a) for a in AttributeValue.objects.all()
-    }
     attributes = item_attributes(
-        items[0],
-        categories,
-        category_paths,
-        current_site,
-        discounts,
-        attributes_dict,
-        attribute_values_dict,
+        items[0], category_paths, current_site, discounts, attributes_dict
     )
     assert attributes.get("mpn") == valid_variant.sku
     assert attributes.get("availability") == "in stock"
@@ -77,3 +78,147 @@ def test_write_feed(product, monkeypatch):
     ]
     for field in google_required_fields:
         assert field in header
+
+
+def _read_feed(buffer):
+    buffer.seek(0)
+    return list(csv.DictReader(buffer, dialect=csv.excel_tab))
+
+
+def test_write_feed_in_chunks(product, product_with_two_variants):
+    out_of_stock_variant = product_with_two_variants.variants.first()
+    out_of_stock_variant.stocks.all().delete()
+    buffer = StringIO()
+
+    write_feed(buffer, chunk_size=1)
+
+    rows = _read_feed(buffer)
+    assert [row["id"] for row in rows] == list(
+        ProductVariant.objects.order_by("pk").values_list("sku", flat=True)
+    )
+    availability = {row["id"]: row["availability"] for row in rows}
+    assert availability.pop(out_of_stock_variant.sku) == "out of stock"
+    assert set(availability.values()) == {"in stock"}
+
+
+def test_write_feed_brand(product, color_attribute):
+    color_attribute.slug = "brand"
+    color_attribute.save(update_fields=["slug"])
+    brand = product.attributes.get().values.get()
+    buffer = StringIO()
+
+    write_feed(buffer)
+
+    rows = _read_feed(buffer)
+    assert rows[0]["brand"] == brand.name
+
+
+def test_write_feed_sale_price_for_collection(product, collection):
+    collection.products.add(product)
+    sale = Sale.objects.create(name="Sale", value=5)
+    sale.collections.add(collection)
+    buffer = StringIO()
+
+    write_feed(buffer)
+
+    rows = _read_feed(buffer)
+    assert rows[0]["price"] == "10.00 USD"
+    assert rows[0]["sale_price"] == "5.00 USD"
+
+
+def _read_feed_file(file_path):
+    with default_storage.open(file_path, "rb") as feed_file:
+        content = gzip.decompress(feed_file.read()).decode("utf-8")
+    return _read_feed(StringIO(content))
+
+
+def test_update_feed_in_parallel(media_root, product, product_with_two_variants):
+    parts = update_feed_in_parallel("feed.csv.gz", workers=1, shards_count=2)
+
+    assert sum(part.rows for part in parts) == 3
+    rows = _read_feed_file("feed.csv.gz")
+    assert [row["id"] for row in rows] == list(
+        ProductVariant.objects.order_by("pk").values_list("sku", flat=True)
+    )
+    assert not default_storage.exists(get_feed_checkpoint_path("feed.csv.gz"))
+    assert not default_storage.exists(get_feed_part_path("feed.csv.gz", 0))
+
+
+def test_update_feed_in_parallel_resumes_from_checkpoint(
+    media_root, product, product_with_two_variants, monkeypatch
+):
+    write_feed_part = google_merchant.write_feed_part
+
+    def fail_on_last_part(file_path, index, *args):
+        if index == 1:
+            raise RuntimeError()
+        return write_feed_part(file_path, index, *args)
+
+    monkeypatch.setattr(google_merchant, "write_feed_part", fail_on_last_part)
+    with pytest.raises(RuntimeError):
+        update_feed_in_parallel("feed.csv.gz", workers=1, shards_count=2)
+
+    checkpoint = load_feed_checkpoint("feed.csv.gz")
+    assert list(checkpoint["completed"]) == ["0"]
+
+    monkeypatch.setattr(google_merchant, "write_feed_part", write_feed_part)
+    parts = update_feed_in_parallel("feed.csv.gz", workers=1, shards_count=2)
+
+    assert [part.resumed for part in parts] == [True, False]
+    assert len(_read_feed_file("feed.csv.gz")) == 3
+
+
+def _fail_on_last_part(monkeypatch):
+    write_feed_part = google_merchant.write_feed_part
+
+    def fail_on_last_part(file_path, index, *args):
+        if index == 1:
+            raise RuntimeError()
+        return write_feed_part(file_path, index, *args)
+
+    monkeypatch.setattr(google_merchant, "write_feed_part", fail_on_last_part)
+    with pytest.raises(RuntimeError):
+        update_feed_in_parallel("feed.csv.gz", workers=1, shards_count=2)
+    monkeypatch.setattr(google_merchant, "write_feed_part", write_feed_part)
+
+
+def test_update_feed_in_parallel_ignores_stale_checkpoint(
+    media_root, product, product_with_two_variants, monkeypatch
+):
+    _fail_on_last_part(monkeypatch)
+
+    parts = update_feed_in_parallel(
+        "feed.csv.gz", workers=1, shards_count=2, checkpoint_max_age=timedelta(0)
+    )
+
+    assert [part.resumed for part in parts] == [False, False]
+    assert len(_read_feed_file("feed.csv.gz")) == 3
+
+
+def test_update_feed_in_parallel_resumes_long_running_export(
+    media_root, product, product_with_two_variants, monkeypatch, settings
+):
+    settings.FEED_CHECKPOINT_MAX_AGE = 60 * 60
+    _fail_on_last_part(monkeypatch)
+    # The export started long ago, but its last shard was written recently
+    checkpoint = load_feed_checkpoint("feed.csv.gz")
+    checkpoint["created"] = (timezone.now() - timedelta(hours=5)).isoformat()
+    save_feed_checkpoint("feed.csv.gz", checkpoint)
+
+    parts = update_feed_in_parallel("feed.csv.gz", workers=1, shards_count=2)
+
+    assert [part.resumed for part in parts] == [True, False]
+    assert len(_read_feed_file("feed.csv.gz")) == 3
+
+
+def test_update_feed_in_parallel_resumes_with_new_variants(
+    media_root, product, product_with_two_variants, monkeypatch
+):
+    _fail_on_last_part(monkeypatch)
+    ProductVariant.objects.create(product=product, sku="new-variant")
+
+    parts = update_feed_in_parallel("feed.csv.gz", workers=1, shards_count=2)
+
+    assert [part.resumed for part in parts] == [True, False]
+    rows = _read_feed_file("feed.csv.gz")
+    assert "new-variant" in [row["id"] for row in rows]
@@ -2,16 +2,23 @@ from datetime import timedelta
 
 import pytest
 from django.utils import timezone
+from freezegun import freeze_time
 from prices import Money
 
 from saleor.checkout.utils import get_voucher_discount_for_checkout
 from saleor.discount import DiscountInfo, DiscountValueType, VoucherType
+from saleor.discount.cache import invalidate_active_discounts_cache
 from saleor.discount.models import NotApplicable, Sale, Voucher, VoucherCustomer
 from saleor.discount.templatetags.voucher import discount_as_negative
 from saleor.discount.utils import (
+    SaleIndex,
     add_voucher_usage_by_customer,
+    calculate_discounted_price,
+    calculate_variants_prices,
     decrease_voucher_usage,
+    fetch_cached_active_discounts,
     get_product_discount_on_sale,
+    get_sale_index,
     increase_voucher_usage,
     remove_voucher_usage_by_customer,
     validate_voucher,
@@ -164,6 +171,148 @@ def test_sale_applies_to_correct_products(product_type, category):
         get_product_discount_on_sale(sec_variant.product, set(), discount)
 
 
+def test_sale_index_get_discounts(product, collection):
+    product_sale = DiscountInfo(
+        sale=Sale(value=1),
+        product_ids={product.id},
+        category_ids={product.category_id},
+        collection_ids=set(),
+    )
+    collection_sale = DiscountInfo(
+        sale=Sale(value=2),
+        product_ids=set(),
+        category_ids=set(),
+        collection_ids={collection.id},
+    )
+    other_sale = DiscountInfo(
+        sale=Sale(value=3), product_ids={0}, category_ids={0}, collection_ids={0}
+    )
+    sale_index = SaleIndex([product_sale, collection_sale, other_sale])
+
+    assert sale_index.get_discounts(product, set()) == [product_sale]
+    assert sale_index.get_discounts(product, {collection.id}) == [
+        product_sale,
+        collection_sale,
+    ]
+
+
+def test_get_sale_index_reuses_index():
+    sale_index = SaleIndex()
+    assert get_sale_index(sale_index) is sale_index
+    assert get_sale_index(None) == []
+
+
+def test_calculate_variants_prices(product_list, collection, assert_num_queries):
+    collection.products.add(product_list[0])
+    sale = Sale(type=DiscountValueType.FIXED, value=2)
+    discounts = SaleIndex(
+        [
+            DiscountInfo(
+                sale=sale,
+                product_ids=set(),
+                category_ids=set(),
+                collection_ids={collection.id},
+            )
+        ]
+    )
+    variants = list(
+        ProductVariant.objects.filter(product__in=product_list).select_related(
+            "product"
+        )
+    )
+
+    # Collections of all the products are fetched with a single query
+    with assert_num_queries(1):
+        prices = calculate_variants_prices(variants, discounts)
+
+    for variant in variants:
+        expected_price = variant.base_price
+        if variant.product_id == product_list[0].pk:
+            expected_price -= Money(2, "USD")
+        assert prices[variant.pk] == expected_price
+
+
+def test_calculate_discounted_price_uses_prefetched_collections(
+    product, collection, assert_num_queries
+):
+    collection.products.add(product)
+    product = Product.objects.prefetch_related("collections").get(pk=product.pk)
+    discount = DiscountInfo(
+        sale=Sale(type=DiscountValueType.FIXED, value=2),
+        product_ids=set(),
+        category_ids=set(),
+        collection_ids={collection.id},
+    )
+
+    with assert_num_queries(0):
+        price = calculate_discounted_price(product, product.price, [discount])
+
+    assert price == product.price - Money(2, "USD")
+
+
+@pytest.fixture
+def active_discounts_cache(settings):
+    settings.ACTIVE_DISCOUNTS_CACHE_TIMEOUT = 60
+
+
+def test_fetch_cached_active_discounts(
+    active_discounts_cache, sale, assert_num_queries
+):
+    discounts = fetch_cached_active_discounts()
+    assert [discount.sale for discount in discounts] == [sale]
+
+    with assert_num_queries(0):
+        discounts = fetch_cached_active_discounts()
+    assert [discount.sale for discount in discounts] == [sale]
+    assert discounts[0].product_ids == set(sale.products.values_list("pk", flat=True))
+
+
+def test_cached_active_discounts_invalidated_on_sale_save(
+    active_discounts_cache, run_on_commit, sale
+):
+    fetch_cached_active_discounts()
+
+    new_sale = Sale.objects.create(name="New sale", value=10)
+
+    discounts = fetch_cached_active_discounts()
+    assert {discount.sale for discount in discounts} == {sale, new_sale}
+
+
+def test_cached_active_discounts_invalidated_on_catalogue_change(
+    active_discounts_cache, run_on_commit, sale, product
+):
+    sale.products.clear()
+    fetch_cached_active_discounts()
+
+    sale.products.add(product)
+    invalidate_active_discounts_cache()
+
+    discounts = fetch_cached_active_discounts()
+    assert discounts[0].product_ids == {product.pk}
+
+
+def test_cached_active_discounts_refreshed_when_sale_ends(
+    active_discounts_cache, run_on_commit, sale
+):
+    sale.end_date = timezone.now() + timedelta(hours=1)
+    sale.save()
+    assert [d.sale for d in fetch_cached_active_discounts()] == [sale]
+
+    with freeze_time(sale.end_date + timedelta(seconds=1)):
+        assert fetch_cached_active_discounts() == []
+
+
+def test_cached_active_discounts_refreshed_when_sale_starts(
+    active_discounts_cache, sale
+):
+    sale.start_date = timezone.now() + timedelta(hours=1)
+    sale.save()
+    assert fetch_cached_active_discounts() == []
+
+    with freeze_time(sale.start_date + timedelta(seconds=1)):
+        assert [d.sale for d in fetch_cached_active_discounts()] == [sale]
+
+
 def test_increase_voucher_usage():
     voucher = Voucher.objects.create(
         code="unique",
@@ -2,6 +2,7 @@ from unittest import mock
 
 from saleor.menu.models import MenuItem, MenuItemTranslation
 from saleor.menu.utils import (
+    get_compiled_menu_items,
     get_menu_as_json,
     get_menu_item_as_dict,
     update_menu,
@@ -12,25 +13,42 @@ from saleor.menu.utils import (
 def test_get_menu_item_as_dict(menu):
     item = MenuItem.objects.create(name="Name", menu=menu, url="http://url.com")
     result = get_menu_item_as_dict(item)
-    assert result == {"name": "Name", "url": "http://url.com", "translations": {}}
+    assert result == {
+        "id": item.pk,
+        "name": "Name",
+        "url": "http://url.com",
+        "sort_order": item.sort_order,
+        "level": 0,
+        "parent_id": None,
+        "category": None,
+        "collection": None,
+        "page": None,
+        "translations": {},
+    }
 
 
 def test_get_menu_item_as_dict_empty_url():
     item = MenuItem(name="Name")
     result = get_menu_item_as_dict(item)
-    assert result == {"name": "Name", "url": "", "translations": {}}
+    assert result["url"] == ""
+    assert result["translations"] == {}
 
 
 def test_get_menu_item_as_dict_with_translations(menu, collection):
     item = MenuItem.objects.create(name="Name", menu=menu, collection=collection)
-    MenuItemTranslation.objects.create(
+    translation = MenuItemTranslation.objects.create(
         menu_item=item, name="Polish Name", language_code="pl"
     )
     result = get_menu_item_as_dict(item)
-    assert result == {
-        "name": "Name",
-        "url": item.url or "",
-        "translations": {"pl": {"name": "Polish Name"}},
+    assert result["url"] == ""
+    assert result["collection"] == {
+        "id": collection.pk,
+        "name": collection.name,
+        "slug": collection.slug,
+        "is_published": collection.is_published,
+    }
+    assert result["translations"] == {
+        "pl": {"id": translation.pk, "name": "Polish Name"}
     }
 
 
@@ -57,6 +75,50 @@ def test_get_menu_as_json(menu):
     assert proper_data == get_menu_as_json(menu)
 
 
+def test_get_menu_as_json_any_depth(menu):
+    parent = None
+    for level in range(5):
+        parent = MenuItem.objects.create(
+            menu=menu, parent=parent, name=f"item {level}"
+        )
+
+    items_data = get_menu_as_json(menu)
+
+    for level in range(5):
+        assert len(items_data) == 1
+        assert items_data[0]["name"] == f"item {level}"
+        assert items_data[0]["level"] == level
+        items_data = items_data[0]["child_items"]
+    assert items_data == []
+
+
+def test_get_compiled_menu_items(menu, category, assert_num_queries):
+    top_item = MenuItem.objects.create(menu=menu, name="top item", category=category)
+    child_item = MenuItem.objects.create(menu=menu, parent=top_item, name="child")
+    MenuItemTranslation.objects.create(
+        menu_item=child_item, name="Polish Name", language_code="pl"
+    )
+    update_menu(menu)
+
+    with assert_num_queries(0):
+        items = get_compiled_menu_items(menu)
+        assert [item.pk for item in items] == [top_item.pk]
+        assert items[0].category.name == category.name
+        assert items[0].category.slug == category.slug
+        children = items[0].compiled_children
+        assert [item.pk for item in children] == [child_item.pk]
+        assert children[0].parent is items[0]
+        assert children[0].compiled_translations["pl"].name == "Polish Name"
+
+    # Fields not stored in the compiled menu are fetched when accessed
+    assert items[0].category.description == category.description
+
+
+def test_get_compiled_menu_items_not_compiled(menu):
+    menu.json_content = {}
+    assert get_compiled_menu_items(menu) is None
+
+
 @mock.patch("saleor.menu.utils.update_menu")
 def test_update_menus(mock_update_menu, menu):
     update_menus([menu.pk])
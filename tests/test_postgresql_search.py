@@ -4,9 +4,16 @@ import pytest
 from django.utils.text import slugify
 from prices import Money
 
-from saleor.account.models import Address
+from saleor.account.models import Address, User
+from saleor.order.models import Order
+from saleor.order.utils import match_orders_with_new_user
 from saleor.product.models import Product
-from saleor.search.backends.postgresql import search_storefront
+from saleor.product.search import update_product_search_vector
+from saleor.search.backends.postgresql import (
+    search_orders,
+    search_storefront,
+    search_users,
+)
 
 PRODUCTS = [
     ("Arabica Coffee", "The best grains in galactic"),
@@ -27,6 +34,7 @@ def named_products(category, product_type):
             category=category,
             is_published=True,
         )
+        update_product_search_vector(product)
         return product
 
     return [gen_product(name, desc) for name, desc in PRODUCTS]
@@ -57,6 +65,96 @@ def test_storefront_product_fuzzy_name_search(named_products, phrase, product_nu
     assert named_products[product_num] in results
 
 
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_update_product_search_vector(named_products):
+    product = named_products[0]
+    product.refresh_from_db()
+    assert product.search_vector
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_storefront_product_search_by_sku(product):
+    update_product_search_vector(product)
+    sku = product.variants.first().sku
+    results = execute_search(sku)
+    assert list(results) == [product]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_storefront_product_search_by_attribute_value(product):
+    update_product_search_vector(product)
+    value = product.attributes.first().values.first()
+    results = execute_search(value.name)
+    assert product in results
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_storefront_product_search_ranks_name_matches_first(named_products):
+    product = named_products[1]
+    product.description = "Roasted coffee print"
+    product.save(update_fields=["description"])
+    update_product_search_vector(product)
+    results = list(execute_search("coffee"))
+    assert results[0] == named_products[0]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_product_search_vector_is_set_on_create(product_type, category):
+    product = Product.objects.create(
+        name="Arabica Coffee",
+        slug="arabica-coffee",
+        description="The best grains in galactic",
+        price=Money(Decimal(6.6), "USD"),
+        product_type=product_type,
+        category=category,
+    )
+    product.refresh_from_db()
+    assert product.search_vector
+    assert list(execute_search("grains")) == [product]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_product_search_vector_is_set_on_bulk_create(product_type, category):
+    Product.objects.bulk_create(
+        [
+            Product(
+                name="Arabica Coffee",
+                slug="arabica-coffee",
+                price=Money(Decimal(6.6), "USD"),
+                product_type=product_type,
+                category=category,
+            )
+        ]
+    )
+    product = Product.objects.get(slug="arabica-coffee")
+    assert product.search_vector
+    assert list(execute_search("coffee")) == [product]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_product_save_keeps_full_search_vector(product):
+    sku = product.variants.first().sku
+    update_product_search_vector(product)
+    product.name = "Renamed"
+    product.save()
+    assert list(execute_search(sku)) == [product]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_storefront_product_search_combined_with_queryset(named_products):
+    qs = Product.objects.filter(is_published=True)
+    qs &= execute_search("coffee")
+    assert list(qs) == [named_products[0]]
+
+
 def unpublish_product(product):
     prod_to_unpublish = product
     prod_to_unpublish.is_published = False
@@ -82,3 +180,136 @@ def gen_address_for_user(first_name, last_name):
         postal_code="53-601",
         country="PL",
     )
+
+
+@pytest.fixture
+def customers():
+    customers = []
+    for first_name, last_name, email in USERS:
+        address = gen_address_for_user(first_name, last_name)
+        customers.append(
+            User.objects.create(
+                email=email,
+                default_shipping_address=address,
+                default_billing_address=address,
+            )
+        )
+    return customers
+
+
+@pytest.fixture
+def orders(customers):
+    orders = []
+    for pk, first_name, last_name, email in ORDERS:
+        user = User.objects.get(email=email)
+        orders.append(
+            Order.objects.create(
+                pk=pk,
+                user=user,
+                user_email=email,
+                billing_address=gen_address_for_user(first_name, last_name),
+            )
+        )
+    return orders
+
+
+@pytest.mark.parametrize(
+    "phrase,user_num",
+    [
+        ("Andreas Knop", 0),
+        ("knop", 0),
+        ("euzeb.potato@cebula.pl", 1),
+        ("cebula", 1),
+        ("johndoe", 2),
+    ],
+)
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_search_users(customers, phrase, user_num):
+    results = search_users(User.objects.all(), phrase)
+    assert list(results) == [customers[user_num]]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_search_users_by_default_shipping_address_city(customers):
+    results = search_users(User.objects.all(), "wroc")
+    assert set(results) == set(customers)
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_user_search_document_updated_on_save(customers):
+    user = customers[0]
+    user.last_name = "Nowak"
+    user.save(update_fields=["last_name"])
+    results = search_users(User.objects.all(), "nowak")
+    assert list(results) == [user]
+
+
+@pytest.mark.parametrize(
+    "phrase,order_num",
+    [
+        ("#10", 0),
+        ("#45", 1),
+        ("Andreas", 0),
+        ("ziemniak", 1),
+        ("johndoe@example.com", 2),
+    ],
+)
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_search_orders(orders, phrase, order_num):
+    results = search_orders(Order.objects.all(), phrase)
+    assert list(results) == [orders[order_num]]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_search_orders_by_token(orders):
+    order = orders[0]
+    results = search_orders(Order.objects.all(), order.token.upper())
+    assert list(results) == [order]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_order_search_document_updated_on_full_save_of_changed_order(orders):
+    order = Order.objects.get(pk=orders[0].pk)
+    order.user_email = "changed@example.com"
+    order.save()
+    results = search_orders(Order.objects.all(), "changed@example.com")
+    assert list(results) == [order]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_order_search_document_updated_on_user_change(orders, run_on_commit):
+    user = orders[0].user
+    user.last_name = "Nowak"
+    user.save(update_fields=["last_name"])
+    results = search_orders(Order.objects.all(), "nowak")
+    assert list(results) == [orders[0]]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_order_search_document_updated_on_matching_orders_with_user(
+    orders, customer_user
+):
+    order = orders[0]
+    Order.objects.filter(pk=order.pk).update(user=None, user_email=customer_user.email)
+    match_orders_with_new_user(customer_user)
+    results = search_orders(Order.objects.all(), customer_user.last_name)
+    assert list(results) == [order]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_order_search_document_not_rebuilt_on_full_save_of_unchanged_order(
+    orders, django_assert_num_queries
+):
+    order = Order.objects.get(pk=orders[0].pk)
+    # Only the order is updated, without fetching its user and billing address
+    with django_assert_num_queries(1):
+        order.save()
@@ -1,4 +1,4 @@
-from unittest.mock import patch
+import io
 
 from django.core.management import call_command
 from prices import Money
@@ -8,7 +8,12 @@ from saleor.product.tasks import (
     update_products_minimal_variant_prices_of_catalogues,
     update_products_minimal_variant_prices_task,
 )
-from saleor.product.utils.variant_prices import update_product_minimal_variant_price
+from saleor.discount.utils import fetch_active_discounts
+from saleor.product.utils.variant_prices import (
+    update_minimal_variant_prices_in_batches,
+    update_product_minimal_variant_price,
+    update_products_minimal_variant_prices,
+)
 
 
 def test_update_product_minimal_variant_price(product):
@@ -174,15 +179,66 @@ def test_product_variant_objects_bulk_create_updates_minimal_variant_price(produ
     assert product.minimal_variant_price == Money("1.00", "USD")
 
 
-@patch(
-    "saleor.product.management.commands"
-    ".update_all_products_minimal_variant_prices"
-    ".update_product_minimal_variant_price"
-)
-def test_management_commmand_update_all_products_minimal_variant_price(
-    mock_update_product_minimal_variant_price, product_list
+def test_management_commmand_update_all_products_minimal_variant_price(product_list):
+    price_override = Money("0.01", "USD")
+    for product in product_list:
+        variant = product.variants.first()
+        variant.price_override = price_override
+        variant.save()
+
+    out = io.StringIO()
+    call_command("update_all_products_minimal_variant_prices", stdout=out)
+
+    for product in product_list:
+        product.refresh_from_db()
+        assert product.minimal_variant_price == price_override
+    count = len(product_list)
+    assert f"Updated {count} of {count} products" in out.getvalue()
+
+
+def test_update_products_minimal_variant_prices_applies_discounts(product_list, sale):
+    sale.products.set(product_list[:1])
+    sale.categories.clear()
+    sale.collections.clear()
+    discounts = fetch_active_discounts()
+    products = Product.objects.filter(pk__in=[p.pk for p in product_list])
+
+    updated = update_products_minimal_variant_prices(products, discounts)
+
+    assert updated == 1
+    discounted_product = product_list[0]
+    discounted_product.refresh_from_db()
+    base_price = min(
+        variant.base_price for variant in discounted_product.variants.all()
+    )
+    expected_price = base_price - Money(sale.value, "USD")
+    assert discounted_product.minimal_variant_price == expected_price
+
+
+def test_update_minimal_variant_prices_in_batches(product_list):
+    for product in product_list:
+        variant = product.variants.first()
+        variant.price_override = Money("0.01", "USD")
+        variant.save()
+
+    batches = list(
+        update_minimal_variant_prices_in_batches(
+            [product.pk for product in product_list], discounts=[], batch_size=2
+        )
+    )
+
+    assert batches == [(2, 2), (1, 1)]
+
+
+def test_update_minimal_variant_prices_in_batches_product_without_variants(
+    product, sale
 ):
-    call_command("update_all_products_minimal_variant_prices")
-    call_args_list = mock_update_product_minimal_variant_price.call_args_list
-    for (args, kwargs), product in zip(call_args_list, product_list):
-        assert args[0] == product
+    product.variants.all().delete()
+    Product.objects.filter(pk=product.pk).update(minimal_variant_price_amount=0)
+    discounts = fetch_active_discounts()
+
+    list(update_minimal_variant_prices_in_batches([product.pk], discounts))
+
+    # The price isn't discounted, as by update_product_minimal_variant_price
+    product.refresh_from_db()
+    assert product.minimal_variant_price == product.price
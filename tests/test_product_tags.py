@@ -130,3 +130,15 @@ def test_choose_placeholder(settings):
 
     # when too big requested, choose the biggest available
     assert choose_placeholder("1500x1500") == settings.PLACEHOLDER_IMAGES[30]
+
+
+@override_settings(VERSATILEIMAGEFIELD_SETTINGS={"create_images_on_demand": True})
+def test_get_thumbnail_uses_manifest():
+    instance = Mock()
+    instance.name = "products/image.jpg"
+    instance.thumbnail = {"10x10": Mock(url="thumb.jpg")}
+    assert get_thumbnail(instance, 10, method="thumbnail") == "thumb.jpg"
+
+    # The URL is resolved from the manifest without accessing the image renditions
+    instance.thumbnail = {}
+    assert get_thumbnail(instance, 10, method="thumbnail") == "thumb.jpg"
@@ -4,15 +4,17 @@ from saleor.core.exceptions import InsufficientStock
 from saleor.warehouse.availability import (
     are_all_product_variants_in_stock,
     check_stock_quantity,
+    is_product_in_stock,
     products_with_low_stock,
 )
 from saleor.warehouse.management import (
     allocate_stock,
+    allocate_stocks,
     deallocate_stock,
     decrease_stock,
     increase_stock,
 )
-from saleor.warehouse.models import Stock
+from saleor.warehouse.models import ProductStockSummary, Stock
 
 COUNTRY_CODE = "US"
 
@@ -71,6 +73,24 @@ def test_are_all_product_variants_in_stock_lack_of_stocks(product):
     assert not are_all_product_variants_in_stock(product, COUNTRY_CODE)
 
 
+def test_are_all_product_variants_in_stock_many_warehouses(
+    product_with_two_variants, warehouses, shipping_zone
+):
+    first_variant, second_variant = product_with_two_variants.variants.all()
+    other_warehouse = warehouses[0]
+    other_warehouse.shipping_zones.add(shipping_zone)
+    Stock.objects.create(
+        product_variant=second_variant, warehouse=other_warehouse, quantity=5
+    )
+    stock = Stock.objects.get(product_variant=first_variant)
+    stock.quantity_allocated = stock.quantity
+    stock.save(update_fields=["quantity_allocated"])
+
+    assert not are_all_product_variants_in_stock(
+        product_with_two_variants, COUNTRY_CODE
+    )
+
+
 def test_products_with_low_stock_one_stock(product, settings):
     settings.LOW_STOCK_THRESHOLD = 70
     stock = Stock.objects.first()
@@ -117,3 +137,109 @@ def test_changing_stock(product, func, expected_quantity, expected_quantity_allo
     stock.refresh_from_db()
     assert stock.quantity == expected_quantity
     assert stock.quantity_allocated == expected_quantity_allocated
+
+
+def test_allocate_stocks(product_with_two_variants):
+    first_variant, second_variant = product_with_two_variants.variants.all()
+
+    allocate_stocks(
+        [(first_variant, 2), (second_variant, 3), (first_variant, 4)], COUNTRY_CODE
+    )
+
+    first_stock = Stock.objects.get(product_variant=first_variant)
+    second_stock = Stock.objects.get(product_variant=second_variant)
+    assert first_stock.quantity_allocated == 7
+    assert second_stock.quantity_allocated == 4
+    summary = ProductStockSummary.objects.get(
+        product=product_with_two_variants, warehouse__isnull=True
+    )
+    assert summary.quantity_available == 9
+
+
+def test_allocate_stocks_missing_stock(product_with_two_variants):
+    first_variant, second_variant = product_with_two_variants.variants.all()
+    Stock.objects.filter(product_variant=second_variant).delete()
+
+    with pytest.raises(Stock.DoesNotExist):
+        allocate_stocks([(first_variant, 2), (second_variant, 3)], COUNTRY_CODE)
+
+    stock = Stock.objects.get(product_variant=first_variant)
+    assert stock.quantity_allocated == 1
+
+
+def test_product_stock_summary_created_with_stock(product):
+    stock = Stock.objects.get()
+    summaries = ProductStockSummary.objects.filter(product=product)
+    warehouse_summary = summaries.get(warehouse=stock.warehouse)
+    total_summary = summaries.get(warehouse__isnull=True)
+    for summary in [warehouse_summary, total_summary]:
+        assert summary.quantity_available == stock.quantity_available
+        assert summary.stocks_count == 1
+        assert summary.available_stocks_count == 1
+
+
+@pytest.mark.parametrize(
+    "func, expected_quantity_available",
+    (
+        (increase_stock, 70),
+        (decrease_stock, 20),
+        (deallocate_stock, 70),
+        (allocate_stock, -30),
+    ),
+)
+def test_changing_stock_updates_product_stock_summary(
+    product, func, expected_quantity_available
+):
+    stock = Stock.objects.first()
+    stock.quantity = 100
+    stock.quantity_allocated = 80
+    stock.save()
+    func(stock.product_variant, COUNTRY_CODE, 50)
+    summary = ProductStockSummary.objects.get(product=product, warehouse__isnull=True)
+    assert summary.quantity_available == expected_quantity_available
+
+
+def test_is_product_in_stock(product):
+    assert is_product_in_stock(product, COUNTRY_CODE)
+
+
+def test_is_product_in_stock_stock_empty(product):
+    stock = Stock.objects.first()
+    allocate_stock(stock.product_variant, COUNTRY_CODE, stock.quantity_available)
+    assert not is_product_in_stock(product, COUNTRY_CODE)
+
+
+def test_product_stock_summary_updated_on_stocks_bulk_delete(product):
+    Stock.objects.filter(product_variant__product=product).delete()
+    summary = ProductStockSummary.objects.get(product=product, warehouse__isnull=True)
+    assert summary.stocks_count == 0
+    assert summary.quantity_available == 0
+
+
+def test_product_stock_summary_changes_match_refresh(
+    product_with_two_variants, warehouse, warehouses
+):
+    product = product_with_two_variants
+    first_variant, second_variant = product.variants.all()
+    Stock.objects.bulk_create(
+        [
+            Stock(product_variant=first_variant, warehouse=warehouses[0], quantity=3),
+            Stock(product_variant=second_variant, warehouse=warehouses[1]),
+        ]
+    )
+    stock = Stock.objects.get(product_variant=first_variant, warehouse=warehouses[0])
+    stock.allocate_stock(3)
+    Stock.objects.filter(warehouse=warehouses[1]).update(quantity=4)
+    Stock.objects.get(product_variant=second_variant, warehouse=warehouse).delete()
+    fields = [
+        "warehouse_id",
+        "quantity_available",
+        "stocks_count",
+        "available_stocks_count",
+    ]
+    summaries = ProductStockSummary.objects.filter(product=product).order_by("pk")
+    values = list(summaries.values_list(*fields))
+
+    ProductStockSummary.objects.refresh([product.pk])
+
+    assert list(summaries.values_list(*fields)) == values
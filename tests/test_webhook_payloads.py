@@ -4,10 +4,16 @@ import json
 import graphene
 import pytest
 
+from saleor.account.models import User
+from saleor.checkout.models import Checkout
 from saleor.order import OrderStatus
+from saleor.order.models import Fulfillment, Order
+from saleor.product.models import Product
 from saleor.webhook.event_types import WebhookEventType
 from saleor.webhook.payloads import (
     generate_checkout_payload,
+    generate_customer_payload,
+    generate_event_payload,
     generate_fulfillment_payload,
     generate_order_payload,
     generate_product_payload,
@@ -166,3 +172,97 @@ def test_generate_sample_checkout_payload(user_checkout_with_items):
     checkout_payload = _remove_anonymized_checkout_data(checkout_payload)
     # Compare the payloads
     assert payload == checkout_payload
+
+
+def test_generate_event_payload_order(fulfilled_order, payment_txn_captured):
+    order = Order.objects.get(pk=fulfilled_order.pk)
+
+    payload = generate_event_payload(WebhookEventType.ORDER_CREATED, str(order.pk))
+
+    assert payload == generate_order_payload(order)
+
+
+def test_generate_event_payload_order_without_relations(order):
+    order = Order.objects.get(pk=order.pk)
+
+    payload = generate_event_payload(WebhookEventType.ORDER_UPDATED, str(order.pk))
+
+    assert payload == generate_order_payload(order)
+
+
+def test_generate_event_payload_fulfillment(fulfillment):
+    fulfillment = Fulfillment.objects.get(pk=fulfillment.pk)
+
+    payload = generate_event_payload(
+        WebhookEventType.FULFILLMENT_CREATED, str(fulfillment.pk)
+    )
+
+    assert payload == generate_fulfillment_payload(fulfillment)
+
+
+def test_generate_event_payload_customer(customer_user, address_other_country):
+    customer_user.default_shipping_address = address_other_country
+    customer_user.save()
+    customer = User.objects.get(pk=customer_user.pk)
+
+    payload = generate_event_payload(
+        WebhookEventType.CUSTOMER_CREATED, str(customer.pk)
+    )
+
+    assert payload == generate_customer_payload(customer)
+
+
+def test_generate_event_payload_product(product, collection):
+    collection.products.add(product)
+    product = Product.objects.get(pk=product.pk)
+
+    payload = generate_event_payload(WebhookEventType.PRODUCT_CREATED, str(product.pk))
+
+    assert payload == generate_product_payload(product)
+
+
+def test_generate_event_payload_checkout(user_checkout_with_items, shipping_method):
+    user_checkout_with_items.shipping_method = shipping_method
+    user_checkout_with_items.save()
+    checkout = Checkout.objects.get(pk=user_checkout_with_items.pk)
+
+    payload = generate_event_payload(
+        WebhookEventType.CHECKOUT_QUANTITY_CHANGED, str(checkout.pk)
+    )
+
+    assert payload == generate_checkout_payload(checkout)
+
+
+def test_generate_event_payload_deleted_object(order):
+    order_id = str(order.pk)
+    order.delete()
+
+    assert generate_event_payload(WebhookEventType.ORDER_CREATED, order_id) is None
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_generate_order_payload_from_instance(
+    fulfilled_order, payment_txn_captured, count_queries
+):
+    generate_order_payload(Order.objects.get(pk=fulfilled_order.pk))
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_generate_order_event_payload(
+    fulfilled_order, payment_txn_captured, count_queries
+):
+    generate_event_payload(WebhookEventType.ORDER_CREATED, str(fulfilled_order.pk))
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_generate_fulfillment_payload_from_instance(fulfillment, count_queries):
+    generate_fulfillment_payload(Fulfillment.objects.get(pk=fulfillment.pk))
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_generate_fulfillment_event_payload(fulfillment, count_queries):
+    generate_event_payload(WebhookEventType.FULFILLMENT_CREATED, str(fulfillment.pk))